@@ -1,7 +1,9 @@
 # api/v1/endpoints/auth.py
 from fastapi import APIRouter, HTTPException, Depends
 from models.schemas.user import UserCreate, UserResponse, UserUpdate
-from core.firebase_auth import get_current_user
+from core.firebase_auth import (
+    get_admin_user, get_current_user, get_current_user_strict, token_cache
+)
 from services.firebase import db
 from datetime import datetime
 
@@ -10,7 +12,7 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse)
 async def register_user(
     user_data: UserCreate,
-    current_user: dict = Depends(get_current_user)  # This ensures valid Firebase token
+    current_user: dict = Depends(get_current_user_strict)  # This ensures valid, unrevoked Firebase token
 ):
     """
     Create user record in Firestore after Firebase Authentication
@@ -83,7 +85,7 @@ async def get_current_user_profile(current_user: dict = Depends(get_current_user
 @router.put("/me", response_model=UserResponse)
 async def update_user_profile(
     update_data: UserUpdate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_strict)
 ):
     """
     Update current user's profile in Firestore
@@ -113,4 +115,11 @@ async def update_user_profile(
         raise HTTPException(
             status_code=500,
             detail=f"Error updating user profile: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/token-cache/stats")
+async def get_token_cache_stats(admin_user: dict = Depends(get_admin_user)):
+    """
+    Hit/miss counters of the ID-token verification cache (admin only)
+    """
+    return token_cache.stats()
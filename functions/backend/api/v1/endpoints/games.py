@@ -1,35 +1,65 @@
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+import json
+import random
 import uuid
 from firebase_admin import firestore
 # from google.cloud.firestore_v1.base_query import FieldFilter, BaseQueryOption, Direction
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 import google.generativeai as genai
 from google.cloud.firestore import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
 from models.schemas.game import (
-    AtBatState, BaseState, CommentaryResponse, GameCreate, GameEvent, GameJoin, GameState, GameView, PitchOutcome, PlayAction,
-    PlayResult, PlayState, TeamLineup, TeamState, HitType
+    AtBatState, BaseState, CommentaryResponse, CommentaryTicket, GameCreate, GameEvent, GameJoin, GameReplay, GameState, GameView,
+    MatchmakingStatus, OpenGame, OpenGameList, PitchOutcome, PlayAction, PlayResult, PlayState, TeamLineup, TeamState, HitType
 )
 from models.schemas.user import Deck
-from models.schemas.base import GameStatus, PitchingStyle, HittingStyle
+from models.schemas.base import GameLogEventType, GameStatus, PitchingStyle, HittingStyle
 from services.audio_storage_service import AudioStorageService
-from services.text_to_speech_service import audio_commentary_service
 from services.game_service import GameService
 from services.at_bat_service import AtBatService
-from services.commentary_service import commentary_service
+from services.commentary_log import latest_entries
+from services.commentary_pipeline import commentary_pipeline
+from core.deadlines import action_deadline, deadline_timestamp
+from services.deadline_scheduler import deadline_scheduler
+from services.event_log import EVENT_LOG, entry_id, new_event, rebuild_state
 from services.base_running import BaseRunningService
 from services.firebase import db
+from services.game_events import game_events
+from services.game_store import game_store
 from services.history_service import HistoryService
 from services.lineup_manager import LineupManager
+from services.matchmaking import deck_strength, matchmaking
+from services.pagination import decode_cursor, encode_cursor
 from core.firebase_auth import get_current_user
 from core.config import settings
+from services.player_catalog import player_catalog
+from services.player_names import player_names
 from services.player_service import get_player_data
+from services.state_diff import diff_fields
 
 genai.configure(api_key=settings.GEMINI_KEY)
 
 router = APIRouter()
 
+# Commentary entries per page of the commentary log
+COMMENTARY_PAGE_SIZE = 50
+
+# Open games per page of the lobby
+OPEN_GAMES_PAGE_SIZE = 20
+
+# Seconds of silence after which the event stream sends a keepalive comment
+EVENT_KEEPALIVE_SECONDS = 15
+
+
+def sse_message(event: str, data) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
 
 @router.post("/create", response_model=GameView)
 async def create_game(
@@ -51,22 +81,11 @@ async def create_game(
         game_id = str(uuid.uuid4())
         current_time = datetime.utcnow()
 
-        # Initialize team lineup
-        team1_lineup = LineupManager.initialize_lineup(game_data.deck.dict())
-
         # Initialize bases
         initial_bases = BaseState().dict()
 
         # Initialize first team state
-        team1_state = TeamState(
-            user_id=game_data.user_id,
-            deck=game_data.deck,
-            lineup=team1_lineup,
-            score=0,
-            hits=0,
-            errors=0,
-            player_stats={}
-        ).dict()
+        team1_state = new_team_state(game_data.user_id, game_data.deck)
 
         # Create initial game state
         game_state = {
@@ -82,31 +101,28 @@ async def create_game(
             "last_action": None,
             "action_deadline": None,
             "created_at": current_time,
-            "updated_at": current_time
+            "updated_at": current_time,
+            "history_seq": 1,
+            "event_seq": 1
         }
 
-        # Store in Firestore
-        db.collection('games').document(game_id).set(game_state)
-
-        history_ref = db.collection('games').document(
-            game_id).collection('commentary_history')
-        history_ref.document().set({
-            "full_commentary": [],
-            "full_audio_url": [],
-            "created_at": current_time
-        })
-
-        # Initialize game history collection
-        history_ref = db.collection('games').document(
-            game_id).collection('history')
-        history_ref.document().set({
+        # Store in Firestore, with the game's first history entry and log event
+        game_ref = db.collection('games').document(game_id)
+        history_ref = game_ref.collection('history')
+        batch = db.batch()
+        batch.set(game_ref, game_state)
+        batch.set(history_ref.document(), {
             "event": "game_created",
+            "seq": 1,
             "timestamp": current_time,
             "player_id": game_data.user_id,
             "event_data": {
                 "creator_id": game_data.user_id
             }
         })
+        batch.set(game_ref.collection(EVENT_LOG).document(entry_id(1)),
+                  created_event(game_state, game_data.user_id))
+        await asyncio.to_thread(batch.commit)
 
         return GameView(
             game_id=game_id,
@@ -126,87 +142,269 @@ async def create_game(
         )
 
 
-@router.post("/{game_id}/join", response_model=GameView)
-async def join_game(
-    game_id: str,
-    join_data: GameJoin,
+@router.get("/open", response_model=OpenGameList)
+async def list_open_games(
+    limit: int = Query(OPEN_GAMES_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Join an existing game"""
+    """Games waiting for an opponent, newest first"""
+    try:
+        after = None
+        if cursor:
+            position = decode_cursor(cursor)
+            after = {
+                'created_at': datetime.fromisoformat(position['created_at']),
+                FieldPath.document_id(): position['game_id']
+            }
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor"
+        )
+
+    try:
+        # Served by the status + created_at index
+        query = (
+            db.collection('games')
+            .where(filter=FieldFilter('status', '==', GameStatus.WAITING.value))
+            .order_by('created_at', direction=firestore.Query.DESCENDING)
+            .order_by(FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+            .select(['team1.user_id', 'created_at'])
+        )
+        if after is not None:
+            query = query.start_after(after)
+
+        # One extra game tells us whether there is another page
+        docs = await asyncio.to_thread(lambda: list(query.limit(limit + 1).stream()))
+        games = [
+            OpenGame(
+                game_id=doc.id,
+                host_id=doc.get('team1.user_id'),
+                created_at=doc.get('created_at')
+            )
+            for doc in docs[:limit]
+        ]
+
+        next_cursor = None
+        if len(docs) > limit:
+            last = games[-1]
+            next_cursor = encode_cursor({
+                'created_at': last.created_at.isoformat(),
+                'game_id': last.game_id
+            })
+        return OpenGameList(games=games, next_cursor=next_cursor)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error listing open games: {str(e)}"
+        )
+
+
+@router.post("/matchmake", response_model=MatchmakingStatus)
+async def matchmake(
+    game_data: GameCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get paired with a player whose deck is of similar strength. Starts the
+    game right away if someone is waiting, otherwise queues; poll
+    GET /matchmake to learn the game once paired.
+    """
     try:
         # Validate user
-        if current_user['uid'] != join_data.user_id:
+        if current_user['uid'] != game_data.user_id:
             raise HTTPException(
                 status_code=403,
-                detail="Can only join game for yourself"
+                detail="Can only matchmake for yourself"
             )
 
         # Validate deck composition
-        validate_deck_composition(join_data.deck)
+        validate_deck_composition(game_data.deck)
 
-        game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
+        strength = deck_strength(player_catalog.snapshot().abilities, game_data.deck.dict())
+        opponent = matchmaking.join(game_data.user_id, game_data.deck, strength)
+        if opponent is None:
+            return MatchmakingStatus(status="waiting", deck_strength=strength)
 
-        if not game.exists:
-            raise HTTPException(
-                status_code=404,
-                detail="Game not found"
-            )
+        try:
+            # The player who waited hosts
+            game_id = await start_matched_game(
+                opponent.user_id, opponent.deck, game_data.user_id, game_data.deck)
+        except Exception:
+            matchmaking.requeue(opponent)
+            raise
+        matchmaking.complete(opponent, game_id)
 
-        game_state = game.to_dict()
+        return MatchmakingStatus(status="matched", game_id=game_id, deck_strength=strength)
 
-        if game_state["status"] != GameStatus.WAITING:
-            raise HTTPException(
-                status_code=400,
-                detail="Game is not available to join"
-            )
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=400,
+            detail=str(ve)
+        )
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error matchmaking: {str(e)}"
+        )
 
-        if game_state["team1"]["user_id"] == join_data.user_id:
+
+@router.get("/matchmake", response_model=MatchmakingStatus)
+async def get_matchmaking_status(
+    current_user: dict = Depends(get_current_user)
+):
+    """Poll a matchmaking ticket; waiting players must poll to stay queued"""
+    ticket = matchmaking.poll(current_user['uid'])
+    if ticket is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Not in the matchmaking queue"
+        )
+    return MatchmakingStatus(
+        status="matched" if ticket.game_id else "waiting",
+        game_id=ticket.game_id,
+        deck_strength=ticket.strength
+    )
+
+
+@router.delete("/matchmake", response_model=MatchmakingStatus)
+async def leave_matchmaking(
+    current_user: dict = Depends(get_current_user)
+):
+    """Leave the matchmaking queue"""
+    if not matchmaking.leave(current_user['uid']):
+        raise HTTPException(
+            status_code=404,
+            detail="Not in the matchmaking queue"
+        )
+    return MatchmakingStatus(status="left")
+
+
+async def start_matched_game(host_id: str, host_deck: Deck, guest_id: str, guest_deck: Deck) -> str:
+    """Create a game already in progress between two paired players"""
+    game_id = str(uuid.uuid4())
+    current_time = datetime.utcnow()
+    game_state = {
+        "game_id": game_id,
+        "status": GameStatus.IN_PROGRESS,
+        "inning": 1,
+        "is_top_inning": True,
+        "outs": 0,
+        "total_outs": 0,
+        "bases": BaseState().dict(),
+        "team1": new_team_state(host_id, host_deck),
+        "team2": new_team_state(guest_id, guest_deck),
+        "last_action": None,
+        "action_deadline": action_deadline("first_pitch", current_time),
+        "created_at": current_time,
+        "updated_at": current_time,
+        "history_seq": 2,
+        "event_seq": 1
+    }
+
+    # Game, both history events and the first log event in one commit
+    game_ref = db.collection('games').document(game_id)
+    history_ref = game_ref.collection('history')
+    batch = db.batch()
+    batch.set(game_ref, game_state)
+    batch.set(history_ref.document(), {
+        "event": "game_created",
+        "seq": 1,
+        "timestamp": current_time,
+        "player_id": host_id,
+        "event_data": {
+            "creator_id": host_id
+        }
+    })
+    batch.set(history_ref.document(), {
+        "event": "player_joined",
+        "seq": 2,
+        "timestamp": current_time,
+        "player_id": guest_id,
+        "event_data": {
+            "joiner_id": guest_id,
+            "matchmade": True
+        }
+    })
+    batch.set(game_ref.collection(EVENT_LOG).document(entry_id(1)),
+              created_event(game_state, host_id, {"guest_id": guest_id, "matchmade": True}))
+    await asyncio.to_thread(batch.commit)
+
+    deadline_scheduler.schedule(game_id, game_state["action_deadline"])
+    player_names.load_game(game_id, [game_state["team1"]["deck"], game_state["team2"]["deck"]])
+    return game_id
+
+
+@router.post("/{game_id}/join", response_model=GameView)
+async def join_game(
+    game_id: str,
+    join_data: GameJoin,
+    current_user: dict = Depends(get_current_user)
+):
+    """Join an existing game"""
+    try:
+        # Validate user
+        if current_user['uid'] != join_data.user_id:
             raise HTTPException(
-                status_code=400,
-                detail="Cannot join your own game"
+                status_code=403,
+                detail="Can only join game for yourself"
             )
 
-        # Initialize team lineup for second team
-        team2_lineup = LineupManager.initialize_lineup(join_data.deck.dict())
+        # Validate deck composition
+        validate_deck_composition(join_data.deck)
 
         # Initialize second team state
-        team2_state = TeamState(
-            user_id=join_data.user_id,
-            deck=join_data.deck,
-            lineup=team2_lineup,
-            score=0,
-            hits=0,
-            errors=0,
-            player_stats={}
-        ).dict()
+        team2_state = new_team_state(join_data.user_id, join_data.deck)
 
-        # Update game state
-        current_time = datetime.utcnow()
-        update_data = {
-            "team2": team2_state,
-            "status": GameStatus.IN_PROGRESS,
-            "updated_at": current_time,
-            "last_action": None,
-            "action_deadline": current_time + timedelta(seconds=5)
-        }
+        game_ref = db.collection('games').document(game_id)
 
-        # Update in Firestore
-        game_ref.update(update_data)
+        async def apply_join(game_state: dict) -> datetime:
+            if game_state["status"] != GameStatus.WAITING:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Game is not available to join"
+                )
+
+            if game_state["team1"]["user_id"] == join_data.user_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Cannot join your own game"
+                )
+
+            # Update game state
+            current_time = datetime.utcnow()
+            game_state.update({
+                "team2": team2_state,
+                "status": GameStatus.IN_PROGRESS,
+                "updated_at": current_time,
+                "last_action": None,
+                "action_deadline": action_deadline("first_pitch", current_time)
+            })
+            return current_time
+
+        def stage_join(writes, game_state: dict, current_time: datetime):
+            # Record join event in history
+            writes.add_history({
+                "event": "player_joined",
+                "timestamp": current_time,
+                "player_id": join_data.user_id,
+                "event_data": {
+                    "joiner_id": join_data.user_id
+                }
+            })
 
-        # Update game state for response
-        game_state.update(update_data)
+        # Actions on a game run one at a time; of two racing joins only one can win
+        game_state, current_time = await game_store.update(
+            game_ref, apply_join, stage_join,
+            event={"type": GameLogEventType.JOINED, "user_id": join_data.user_id}
+        )
 
-        # Record join event in history
-        history_ref = game_ref.collection('history')
-        history_ref.document().set({
-            "event": "player_joined",
-            "timestamp": current_time,
-            "player_id": join_data.user_id,
-            "event_data": {
-                "joiner_id": join_data.user_id
-            }
-        })
+        # Resolve both decks' player names once for commentary during play
+        player_names.load_game(game_id, [game_state["team1"]["deck"], team2_state["deck"]])
 
         return GameView(
             game_id=game_id,
@@ -251,6 +449,52 @@ def validate_deck_composition(deck: Deck):
         raise ValueError("Deck contains duplicate players")
 
 
+def new_team_state(user_id: str, deck: Deck) -> dict:
+    """Initial state of a team playing the given deck"""
+    return TeamState(
+        user_id=user_id,
+        deck=deck,
+        lineup=LineupManager.initialize_lineup(deck.dict()),
+        score=0,
+        hits=0,
+        errors=0,
+        player_stats={}
+    ).dict()
+
+
+def created_event(game_state: dict, user_id: str, data: Optional[dict] = None) -> dict:
+    """The first event of a new game's log, setting its whole initial state"""
+    return new_event(
+        1,
+        GameLogEventType.CREATED.value,
+        game_state["created_at"],
+        diff_fields({}, game_state),
+        user_id,
+        data
+    )
+
+
+def track_timeouts(game_state: dict, team: str, timed_out: Optional[float]):
+    """
+    Count missed deadlines in a row per team. An automatic action on a
+    timeout adds one, after checking the game is still waiting on that
+    deadline; the player's own action clears the count.
+    """
+    timeouts = game_state.get("timeouts") or {}
+    if timed_out is None:
+        if timeouts.get(team):
+            timeouts[team] = 0
+        return
+
+    if deadline_timestamp(game_state.get("action_deadline")) != timed_out:
+        raise HTTPException(
+            status_code=409,
+            detail="Game already moved past this deadline"
+        )
+    timeouts[team] = timeouts.get(team, 0) + 1
+    game_state["timeouts"] = timeouts
+
+
 @router.post("/{game_id}/pitch")
 async def make_pitch(
     game_id: str,
@@ -258,64 +502,93 @@ async def make_pitch(
     current_user: dict = Depends(get_current_user)
 ):
     """Make a pitch"""
-    try:
-        game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
-
-        if not game.exists:
-            raise HTTPException(
-                status_code=404,
-                detail="Game not found"
-            )
+    return await perform_pitch(game_id, current_user['uid'], pitch_style)
 
-        game_state = game.to_dict()
 
-        # Validate game status
-        if game_state["status"] != GameStatus.IN_PROGRESS:
-            raise HTTPException(
-                status_code=400,
-                detail="Game is not in progress"
-            )
+async def perform_pitch(
+    game_id: str,
+    user_id: str,
+    pitch_style: PitchingStyle,
+    timed_out: Optional[float] = None
+):
+    """Pitch for user_id; timed_out is the passed deadline when pitching for an idle player"""
+    try:
+        game_ref = db.collection('games').document(game_id)
 
-        # Validate it's pitcher's turn
-        current_pitching_team_id = game_state["team2"] if game_state[
-            "is_top_inning"] else game_state["team1"]
-        if current_user['uid'] != current_pitching_team_id["user_id"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Not your turn to pitch"
-            )
+        async def apply_pitch(game_state: dict) -> dict:
+            # Validate game status
+            if game_state["status"] != GameStatus.IN_PROGRESS:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Game is not in progress"
+                )
+
+            # Validate it's pitcher's turn
+            current_pitching_team_id = game_state["team2"] if game_state[
+                "is_top_inning"] else game_state["team1"]
+            if user_id != current_pitching_team_id["user_id"]:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Not your turn to pitch"
+                )
+            track_timeouts(game_state, "team2" if game_state["is_top_inning"] else "team1", timed_out)
+
+            # Create pitch action
+            current_time = datetime.utcnow()
+            action = {
+                "player_id": user_id,
+                "timestamp": current_time,
+                "action_type": "pitch",
+                "selected_style": pitch_style
+            }
 
-        # Get current pitching from lineup
-        current_pitcher = current_pitching_team_id["lineup"]["available_pitchers"][
-            current_pitching_team_id["lineup"]["current_pitcher_index"]]
+            # Update game state
+            game_state["last_action"] = action
+            game_state["action_deadline"] = action_deadline("bat", current_time)
+            game_state["updated_at"] = current_time
 
-        # Create pitch action
-        current_time = datetime.utcnow()
-        action = {
-            "player_id": current_user['uid'],
-            "timestamp": current_time,
-            "action_type": "pitch",
-            "selected_style": pitch_style
-        }
-
-        # Update game state
-        game_state["last_action"] = action
-        game_state["action_deadline"] = current_time + timedelta(seconds=100)
-        game_state["updated_at"] = current_time
+            # Get current pitching from lineup
+            return {
+                "current_time": current_time,
+                "current_pitcher": current_pitching_team_id["lineup"]["available_pitchers"][
+                    current_pitching_team_id["lineup"]["current_pitcher_index"]]
+            }
 
-        # Fetch play history
-        history_query = (
-            game_ref.collection('history')
-            .order_by('timestamp', direction=firestore.Query.DESCENDING)
-            .stream()
+        # The history entry and commentary ticket are written with the state
+        history_ref = game_ref.collection('history').document()
+        ticket_ref = commentary_pipeline.new_ticket_ref(game_ref)
+
+        def stage_pitch(writes, game_state: dict, pitch: dict):
+            current_time = pitch["current_time"]
+            writes.add_history({
+                "action_type": "pitch",
+                "timestamp": current_time.isoformat(),
+                "player_id": user_id,
+                "pitch_style": pitch_style,
+                "timed_out": timed_out is not None,
+                "inning": game_state["inning"],
+                "is_top_inning": game_state["is_top_inning"],
+                "commentary_ticket": ticket_ref.id
+            }, history_ref)
+            writes.set(ticket_ref, commentary_pipeline.ticket_document(
+                ticket_ref, game_id, "pitch", current_time))
+
+        async def reject_pitch(pitch: dict):
+            await commentary_pipeline.reject(ticket_ref, game_id, "pitch", pitch["current_time"])
+
+        # Apply to the in-memory game; the write follows in the background
+        game_state, pitch = await game_store.update(
+            game_ref, apply_pitch, stage_pitch,
+            event={
+                "type": GameLogEventType.PITCH,
+                "user_id": user_id,
+                "data": {"pitch_style": pitch_style, "timed_out": timed_out is not None}
+            },
+            rejected=reject_pitch
         )
-        play_history = [hist.to_dict() for hist in history_query]
+        current_time = pitch["current_time"]
 
-        # Fetch pitcher details
-        pitcher_name = await commentary_service.fetch_player_name(current_pitcher)
-
-        # Generate commentary
+        # Commentary context as of this pitch
         game_context = {
             "inning": game_state["inning"],
             "is_top_inning": game_state["is_top_inning"],
@@ -324,79 +597,25 @@ async def make_pitch(
                 "team2": game_state["team2"]["score"]
             },
             "outs": game_state["outs"],
-            "player_name": pitcher_name
+            "timestamp": current_time.isoformat()
         }
         action_details = {
             "pitch_style": pitch_style
         }
 
-        commentary = await commentary_service.generate_ai_commentary(
-            "pitch",
-            action_details,
-            game_context,
-            play_history
-        )
-
-        # Save state
-        game_ref.update(game_state)
-
-        # Generate audio commentary
-        audio_commentary = audio_commentary_service.generate_audio_commentary(
-            commentary)
-
-        # Upload audio to storage
-        audio_url = await AudioStorageService.upload_audio_commentary(
-            game_id,
-            audio_commentary
+        # Commentary is produced in the background against the ticket
+        commentary_pipeline.schedule(
+            game_ref, ticket_ref, history_ref, "pitch",
+            action_details, game_context, pitch["current_pitcher"]
         )
 
-        # Record pitch action in game history
-        history_ref = game_ref.collection('history').document()
-        history_ref.set({
-            "action_type": "pitch",
-            "timestamp": current_time.isoformat(),
-            "player_id": current_user['uid'],
-            "pitch_style": pitch_style,
-            "inning": game_state["inning"],
-            "is_top_inning": game_state["is_top_inning"],
-            "commentary": commentary,
-            "audio_url": audio_url
-        })
-
-        # Fetch existing commentary history
-        commentary_history_ref = game_ref.collection('commentary_history').document('main')
-        commentary_history = commentary_history_ref.get()
-        
-        if not commentary_history.exists:
-            full_commentary = []
-        else:
-            full_commentary = commentary_history.to_dict().get('full_commentary', [])
-
-        # Append new commentary
-        full_commentary.append({
-            "timestamp": current_time.isoformat(),
-            "commentary": commentary,
-            "audio_url": audio_url,
-            "action_type": "pitch",
-            "details": action_details
-        })
-
-        # Truncate commentary history if needed
-        if len(full_commentary) > 50:
-            full_commentary = full_commentary[-50:]
-
-        # Update commentary history
-        commentary_history_ref.set({
-            "full_commentary": full_commentary,
-        })
-
         return {
             "game_state": GameState(**game_state),
-            "commentary": commentary,
-            "audio_url": audio_url,
-            "full_commentary": full_commentary
+            "commentary_ticket": ticket_ref.id
         }
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -506,39 +725,41 @@ async def change_pitcher(
     """Change current pitcher"""
     try:
         game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
-
-        if not game.exists:
-            raise HTTPException(status_code=404, detail="Game not found")
-
-        game_state = game.to_dict()
 
-        # Determine which team is pitching
-        pitching_team_key = "team2" if game_state["is_top_inning"] else "team1"
-        pitching_team = game_state[pitching_team_key]
+        async def apply_pitcher_change(game_state: dict):
+            # Determine which team is pitching
+            pitching_team_key = "team2" if game_state["is_top_inning"] else "team1"
+            pitching_team = game_state[pitching_team_key]
 
-        if current_user['uid'] != pitching_team["user_id"]:
-            raise HTTPException(
-                status_code=403, detail="Not your team's turn to pitch")
+            if current_user['uid'] != pitching_team["user_id"]:
+                raise HTTPException(
+                    status_code=403, detail="Not your team's turn to pitch")
 
-        # Convert dictionary to TeamState for lineup management
-        pitching_team_lineup = TeamLineup(**pitching_team["lineup"])
+            # Convert dictionary to TeamState for lineup management
+            pitching_team_lineup = TeamLineup(**pitching_team["lineup"])
 
-        # Validate and perform pitcher change
-        success, message = LineupManager.change_pitcher(
-            pitching_team_lineup, new_pitcher_id)
+            # Validate and perform pitcher change
+            success, message = LineupManager.change_pitcher(
+                pitching_team_lineup, new_pitcher_id)
 
-        if not success:
-            raise HTTPException(status_code=400, detail=message)
+            if not success:
+                raise HTTPException(status_code=400, detail=message)
 
-        # Update game state with new lineup
-        pitching_team["lineup"] = pitching_team_lineup.dict()
-        game_state[pitching_team_key] = pitching_team
+            # Update game state with new lineup
+            pitching_team["lineup"] = pitching_team_lineup.dict()
+            game_state[pitching_team_key] = pitching_team
 
-        game_state["updated_at"] = datetime.utcnow().isoformat()
+            game_state["updated_at"] = datetime.utcnow().isoformat()
 
-        # Update in Firestore
-        game_ref.update(game_state)
+        # Apply to the in-memory game; the write follows in the background
+        await game_store.update(
+            game_ref, apply_pitcher_change,
+            event={
+                "type": GameLogEventType.PITCHER_CHANGE,
+                "user_id": current_user['uid'],
+                "data": {"new_pitcher_id": new_pitcher_id}
+            }
+        )
 
         return {
             "message": "Pitcher changed successfully",
@@ -561,67 +782,107 @@ async def make_bat(
     current_user: dict = Depends(get_current_user)
 ):
     """Make a batting attempt"""
-    try:
-        game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
+    return await perform_bat(game_id, current_user['uid'], hit_style)
 
-        if not game.exists:
-            raise HTTPException(
-                status_code=404,
-                detail="Game not found"
-            )
-
-        game_state = game.to_dict()
-
-        # Validate game status and timing
-        if game_state["status"] != GameStatus.IN_PROGRESS:
-            raise HTTPException(
-                status_code=400,
-                detail="Game is not in progress"
-            )
-
-        # Convert action_deadline to datetime if it's a string
-        action_deadline = game_state["action_deadline"]
-        if isinstance(action_deadline, str):
-            action_deadline = datetime.fromisoformat(
-                action_deadline.replace('Z', '+00:00'))
-
-        if datetime.now(action_deadline.tzinfo) > action_deadline:
-            raise HTTPException(
-                status_code=400,
-                detail="Action timeout! Took more than 5 seconds to make an action"
-            )
 
-        # Validate it's batter's turn
-        batting_team = game_state["team1"] if game_state["is_top_inning"] else game_state["team2"]
-        if current_user['uid'] != batting_team["user_id"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Not your turn to bat"
-            )
-
-        # Get current batter from lineup
-        current_batter = batting_team["lineup"]["batting_order"][batting_team["lineup"]
-                                                                 ["current_batter_index"]]
-
-        # Fetch batter details
-        batter_name = await commentary_service.fetch_player_name(current_batter)
-
-        # Process the at-bat
-        result = process_at_bat(game_state, current_batter, hit_style)
+async def perform_bat(
+    game_id: str,
+    user_id: str,
+    hit_style: HittingStyle,
+    timed_out: Optional[float] = None
+):
+    """Bat for user_id; timed_out is the passed deadline when batting for an idle player"""
+    try:
+        game_ref = db.collection('games').document(game_id)
 
-        # Update game state
-        updated_state = await GameService.update_game_state(game_state, result)
+        async def apply_bat(game_state: dict) -> dict:
+            # Validate game status and timing
+            if game_state["status"] != GameStatus.IN_PROGRESS:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Game is not in progress"
+                )
+
+            # Convert action_deadline to datetime if it's a string
+            action_deadline = game_state["action_deadline"]
+            if isinstance(action_deadline, str):
+                action_deadline = datetime.fromisoformat(
+                    action_deadline.replace('Z', '+00:00'))
+
+            if timed_out is None and datetime.now(action_deadline.tzinfo) > action_deadline:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Action timeout! The deadline to bat has passed"
+                )
+
+            # Validate it's batter's turn
+            batting_team = game_state["team1"] if game_state["is_top_inning"] else game_state["team2"]
+            if user_id != batting_team["user_id"]:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Not your turn to bat"
+                )
+            track_timeouts(game_state, "team1" if game_state["is_top_inning"] else "team2", timed_out)
+
+            # Get current batter from lineup
+            current_batter = batting_team["lineup"]["batting_order"][batting_team["lineup"]
+                                                                     ["current_batter_index"]]
+
+            # Process the at-bat
+            result = process_at_bat(game_state, current_batter, hit_style)
+
+            # Update game state
+            await GameService.update_game_state(game_state, result)
+            return {
+                "result": result,
+                "current_batter": current_batter,
+                "current_time": datetime.utcnow()
+            }
 
-        # Fetch play history
-        history_query = (
-            game_ref.collection('history')
-            .order_by('timestamp', direction=firestore.Query.DESCENDING)
-            .stream()
+        # The history entry and commentary ticket are written with the state
+        history_ref = game_ref.collection('history').document()
+        ticket_ref = commentary_pipeline.new_ticket_ref(game_ref)
+
+        def stage_bat(writes, game_state: dict, at_bat: dict):
+            current_time = at_bat["current_time"]
+            writes.add_history({
+                "action_type": "bat",
+                "timestamp": current_time.isoformat(),
+                "player_id": user_id,
+                "hit_style": hit_style,
+                "timed_out": timed_out is not None,
+                "inning": game_state["inning"],
+                "is_top_inning": game_state["is_top_inning"],
+                "play_result": at_bat["result"].dict(),
+                "commentary_ticket": ticket_ref.id
+            }, history_ref)
+            writes.set(ticket_ref, commentary_pipeline.ticket_document(
+                ticket_ref, game_id, "bat", current_time))
+
+        async def complete_bat(game_state: dict, at_bat: dict):
+            # The game history is compiled from the written plays, this one included
+            if game_state["status"] == GameStatus.COMPLETED:
+                await HistoryService.complete_game(game_id, game_state)
+
+        async def reject_bat(at_bat: dict):
+            await commentary_pipeline.reject(ticket_ref, game_id, "bat", at_bat["current_time"])
+
+        # Apply to the in-memory game; the write follows in the background
+        updated_state, at_bat = await game_store.update(
+            game_ref, apply_bat, stage_bat,
+            event={
+                "type": GameLogEventType.BAT,
+                "user_id": user_id,
+                "data": {"hit_style": hit_style, "timed_out": timed_out is not None}
+            },
+            committed=complete_bat,
+            rejected=reject_bat
         )
-        play_history = [hist.to_dict() for hist in history_query]
+        result = at_bat["result"]
+        current_batter = at_bat["current_batter"]
+        current_time = at_bat["current_time"]
 
-        # Generate commentary
+        # Commentary context as of this at-bat's outcome
         game_context = {
             "inning": updated_state["inning"],
             "is_top_inning": updated_state["is_top_inning"],
@@ -630,80 +891,23 @@ async def make_bat(
                 "team2": updated_state["team2"]["score"]
             },
             "outs": updated_state["outs"],
-            "player_name": batter_name,
+            "timestamp": current_time.isoformat()
         }
 
-        commentary = await commentary_service.generate_ai_commentary(
-            "bat",
-            result.dict(),
-            game_context,
-            play_history
+        # Commentary is produced in the background against the ticket
+        commentary_pipeline.schedule(
+            game_ref, ticket_ref, history_ref, "bat",
+            result.dict(), game_context, current_batter
         )
 
-        # Update in Firestore
-        game_ref.update(updated_state)
-
-        # Generate audio commentary
-        audio_commentary = audio_commentary_service.generate_audio_commentary(
-            commentary)
-
-        # Upload audio to storage
-        audio_url = await AudioStorageService.upload_audio_commentary(
-            game_id,
-            audio_commentary
-        )
-
-        # Record bat action in game history
-        current_time = datetime.utcnow()
-        history_ref = game_ref.collection('history').document()
-        history_ref.set({
-            "action_type": "bat",
-            "timestamp": current_time.isoformat(),
-            "player_id": current_user['uid'],
-            "hit_style": hit_style,
-            "inning": updated_state["inning"],
-            "is_top_inning": updated_state["is_top_inning"],
-            "play_result": result.dict(),
-            "commentary": commentary
-        })
-
-        # Fetch existing commentary history
-        commentary_history_ref = game_ref.collection(
-            'commentary_history').document('main')
-        commentary_history = commentary_history_ref.get()
-
-        if not commentary_history.exists:
-            # Initialize if not exists
-            full_commentary = []
-        else:
-            full_commentary = commentary_history.to_dict().get('full_commentary', [])
-
-        # Append new commentary
-        full_commentary.append({
-            "timestamp": current_time.isoformat(),
-            "commentary": commentary,
-            "audio_url": audio_url,
-            "action_type": "bat",
-            "details": result.dict()
-        })
-
-        # Truncate commentary history if needed
-        if len(full_commentary) > 50:
-            full_commentary = full_commentary[-50:]
-
-        # Update commentary history
-        commentary_history_ref.set({
-            "full_commentary": full_commentary,
-        })
-
         return {
             "game_state": updated_state,
             "result": result,
-            "commentary": commentary,
-            "audio_url": audio_url,
-            "full_commentary": full_commentary
+            "commentary_ticket": ticket_ref.id
         }
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -914,8 +1118,7 @@ async def update_game_state(game_state: dict, result: PlayResult) -> dict:
 
     # Set up next action
     game_state["last_action"] = None
-    game_state["action_deadline"] = (
-        current_time + timedelta(seconds=30)).isoformat()
+    game_state["action_deadline"] = action_deadline("pitch", current_time).isoformat()
 
     # Update bases if there was a hit
     if result.outcome != "out":
@@ -931,8 +1134,6 @@ async def update_game_state(game_state: dict, result: PlayResult) -> dict:
                 if game_state["team1"]["score"] > game_state["team2"]["score"]
                 else game_state["team2"]["user_id"]
             )
-            # Record complete game history
-            await HistoryService.complete_game(game_state["game_id"], game_state)
 
     game_state["updated_at"] = current_time.isoformat()
     return game_state
@@ -941,21 +1142,14 @@ async def update_game_state(game_state: dict, result: PlayResult) -> dict:
 @router.get("/{game_id}", response_model=GameView)
 async def get_game(
     game_id: str,
+    since: Optional[int] = Query(None, ge=0, description="history_seq from a previous response; only newer history entries are returned"),
     current_user: dict = Depends(get_current_user)
 ):
     """Get current game state and history"""
     try:
-        # Get game document
+        # Get game state, from memory while the game is active
         game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
-
-        if not game.exists:
-            raise HTTPException(
-                status_code=404,
-                detail="Game not found"
-            )
-
-        game_state = game.to_dict()
+        game_state = await game_store.get(game_ref)
 
         # Verify user is part of this game
         if (current_user['uid'] != game_state["team1"]["user_id"] and
@@ -965,16 +1159,27 @@ async def get_game(
                 detail="Not authorized to view this game"
             )
 
-        # Get game history
+        # Only a poll that wants history still waiting in the game's next
+        # write has it written first
+        await game_store.flush_for(game_id, "history_seq", after=since or 0)
+
+        # Get game history, all of it or just what's newer than `since`. The
+        # high-water mark is the newest entry actually read, so entries whose
+        # write failed or is still pending are returned by a later poll
         history = []
-        history_refs = (
-            game_ref.collection('history')
-            .order_by('timestamp')
-            .stream()
-        )
+        history_seq = since or 0
+        if since is None:
+            history_query = game_ref.collection('history').order_by('timestamp')
+        else:
+            history_query = (
+                game_ref.collection('history')
+                .where(filter=FieldFilter('seq', '>', since))
+                .order_by('seq')
+            )
 
-        for hist in history_refs:
+        for hist in history_query.stream():
             play_data = hist.to_dict()
+            history_seq = max(history_seq, play_data.get('seq', 0))
 
             # Determine if this is a game event or play action
             if 'event' in play_data:
@@ -990,7 +1195,8 @@ async def get_game(
                             timestamp=play_data.get('timestamp', ''),
                             player_id=play_data.get('player_id', ''),
                             event_data=play_data
-                        )
+                        ),
+                        "seq": play_data.get('seq')
                     })
             elif 'play_result' in play_data or 'action_type' in play_data:
                 # This is a play action
@@ -1015,23 +1221,20 @@ async def get_game(
                         result=play_data.get('play_result', {}),
                         timestamp=play_data.get('timestamp', ''),
                         play_data=play_data
-                    )
+                    ),
+                    "seq": play_data.get('seq')
                 })
 
-        # Get commentary history if it exists
-        commentary_history = []
+        # Get the latest page of the commentary log if there is one
+        commentary_history = {}
         try:
-            commentary_ref = game_ref.collection(
-                'commentary_history').document('main')
-            commentary_doc = commentary_ref.get()
-            if commentary_doc.exists:
-                commentary_data = commentary_doc.to_dict()
-                full_commentary = commentary_data.get('full_commentary', [])
-
+            full_commentary, older = latest_entries(game_ref, COMMENTARY_PAGE_SIZE)
+            if full_commentary:
                 # Convert to format with audio URLs
                 commentary_history = {
                     'text_commentaries': [entry.get('commentary') for entry in full_commentary],
-                    'audio_urls': [entry.get('audio_url') for entry in full_commentary]
+                    'audio_urls': [entry.get('audio_url') for entry in full_commentary],
+                    'next_cursor': encode_cursor({'before': older}) if older else None
                 }
 
         except Exception:
@@ -1043,7 +1246,8 @@ async def get_game(
             "game_id": game_id,
             "state": GameState(**game_state),
             "history": history,
-            "commentary_history": commentary_history
+            "commentary_history": commentary_history,
+            "history_seq": history_seq
         }
 
         return game_view
@@ -1057,63 +1261,139 @@ async def get_game(
         )
 
 
-@router.post("/{game_id}/forfeit")
-async def forfeit_game(
+@router.get("/{game_id}/events")
+async def stream_game_events(
     game_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Forfeit the current game"""
+    """
+    Live game updates as Server-Sent Events: a "snapshot" of the state,
+    then an "action" with the changed fields (dotted paths), removed fields
+    and new history entries as each action commits, and "commentary" as
+    each ticket is resolved. Should another instance have changed the game
+    first, actions that no longer apply come as "rejected", followed by a
+    new "snapshot".
+    """
+    # Subscribe before reading the state so no action falls in between
+    queue = game_events.subscribe(game_id)
     try:
-        game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
-
-        if not game.exists:
-            raise HTTPException(status_code=404, detail="Game not found")
-
-        game_state = game.to_dict()
-
-        if game_state["status"] != GameStatus.IN_PROGRESS:
-            raise HTTPException(
-                status_code=400,
-                detail="Game is not in progress"
-            )
+        game_state = await game_store.get(db.collection('games').document(game_id))
 
         # Verify user is part of this game
-        if current_user['uid'] not in [game_state["team1"]["user_id"], game_state["team2"]["user_id"]]:
+        if (current_user['uid'] != game_state["team1"]["user_id"] and
+                (not game_state.get("team2") or current_user['uid'] != game_state["team2"]["user_id"])):
             raise HTTPException(
                 status_code=403,
-                detail="Not authorized to forfeit this game"
+                detail="Not authorized to view this game"
             )
+    except HTTPException as he:
+        game_events.unsubscribe(game_id, queue)
+        raise he
+    except Exception as e:
+        game_events.unsubscribe(game_id, queue)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error opening game events: {str(e)}"
+        )
 
-        # Record which team forfeited
-        forfeiting_team = "team1" if current_user['uid'] == game_state["team1"]["user_id"] else "team2"
-        winning_team = "team2" if forfeiting_team == "team1" else "team1"
+    async def stream():
+        try:
+            yield sse_message("snapshot", {"state": GameState(**game_state)})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    # Closed: fell behind or shutting down; reconnect for a snapshot
+                    break
+                if event["type"] == "snapshot":
+                    yield sse_message("snapshot", {"state": GameState(**event["state"])})
+                    continue
+                yield sse_message(event["type"], event)
+        finally:
+            game_events.unsubscribe(game_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        current_time = datetime.utcnow()
 
-        # Record forfeit in history
-        history_ref = game_ref.collection('history').document()
-        history_ref.set({
-            "event": "forfeit",
-            "timestamp": current_time.isoformat(),
-            "forfeiting_team": forfeiting_team,
-            "forfeiting_user_id": current_user['uid']
-        })
+@router.post("/{game_id}/forfeit")
+async def forfeit_game(
+    game_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Forfeit the current game"""
+    return await perform_forfeit(game_id, current_user['uid'])
 
-        # Update game state
-        game_state.update({
-            "status": GameStatus.COMPLETED,
-            "winner": game_state[winning_team]["user_id"],
-            "forfeit_info": {
-                "forfeiting_team": forfeiting_team,
-                "forfeiting_user_id": current_user['uid'],
-                "timestamp": current_time.isoformat()
-            },
-            "updated_at": current_time.isoformat()
-        })
 
-        # Save state
-        game_ref.update(game_state)
+async def perform_forfeit(
+    game_id: str,
+    user_id: str,
+    timed_out: Optional[float] = None
+):
+    """Forfeit for user_id; timed_out is the passed deadline when forfeiting an idle player"""
+    try:
+        game_ref = db.collection('games').document(game_id)
+
+        async def apply_forfeit(game_state: dict) -> dict:
+            if game_state["status"] != GameStatus.IN_PROGRESS:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Game is not in progress"
+                )
+
+            # Verify user is part of this game
+            if user_id not in [game_state["team1"]["user_id"], game_state["team2"]["user_id"]]:
+                raise HTTPException(
+                    status_code=403,
+                    detail="Not authorized to forfeit this game"
+                )
+
+            # Record which team forfeited
+            forfeiting_team = "team1" if user_id == game_state["team1"]["user_id"] else "team2"
+            winning_team = "team2" if forfeiting_team == "team1" else "team1"
+            track_timeouts(game_state, forfeiting_team, timed_out)
+
+            current_time = datetime.utcnow()
+
+            # Update game state
+            game_state.update({
+                "status": GameStatus.COMPLETED,
+                "winner": game_state[winning_team]["user_id"],
+                "forfeit_info": {
+                    "forfeiting_team": forfeiting_team,
+                    "forfeiting_user_id": user_id,
+                    "timed_out": timed_out is not None,
+                    "timestamp": current_time.isoformat()
+                },
+                "updated_at": current_time.isoformat()
+            })
+            return game_state["forfeit_info"]
+
+        def stage_forfeit(writes, game_state: dict, forfeit_info: dict):
+            # Record forfeit in history
+            writes.add_history({
+                "event": "forfeit",
+                "timestamp": forfeit_info["timestamp"],
+                "forfeiting_team": forfeit_info["forfeiting_team"],
+                "forfeiting_user_id": forfeit_info["forfeiting_user_id"],
+                "timed_out": forfeit_info["timed_out"]
+            })
+
+        # Apply to the in-memory game; state and history are written together
+        game_state, forfeit_info = await game_store.update(
+            game_ref, apply_forfeit, stage_forfeit,
+            event={
+                "type": GameLogEventType.FORFEIT,
+                "user_id": user_id,
+                "data": {"timed_out": timed_out is not None}
+            }
+        )
 
         # Optional: Clean up audio commentaries for this game
         try:
@@ -1123,6 +1403,8 @@ async def forfeit_game(
 
         return game_state
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1130,6 +1412,41 @@ async def forfeit_game(
         )
 
 
+async def handle_action_timeout(game_id: str, deadline: float):
+    """
+    Deadline scheduler callback: pitch or bat with a random style for the
+    player who let the deadline pass, or forfeit for them once they have
+    missed MAX_CONSECUTIVE_TIMEOUTS deadlines in a row.
+    """
+    game_state = await game_store.get(db.collection('games').document(game_id))
+    if (game_state["status"] != GameStatus.IN_PROGRESS or
+            deadline_timestamp(game_state.get("action_deadline")) != deadline):
+        return
+    # Other instances may have fired for the same deadline; one acts on it
+    if not await asyncio.to_thread(deadline_scheduler.claim, game_id, deadline):
+        return
+
+    # After a pitch the batter is up, otherwise the pitcher
+    last_action = game_state.get("last_action") or {}
+    batting = last_action.get("action_type") == "pitch"
+    batting_team = "team1" if game_state["is_top_inning"] else "team2"
+    pitching_team = "team2" if game_state["is_top_inning"] else "team1"
+    team = batting_team if batting else pitching_team
+    user_id = game_state[team]["user_id"]
+    missed = (game_state.get("timeouts") or {}).get(team, 0) + 1
+
+    try:
+        if missed >= settings.MAX_CONSECUTIVE_TIMEOUTS:
+            await perform_forfeit(game_id, user_id, timed_out=deadline)
+        elif batting:
+            await perform_bat(game_id, user_id, random.choice(list(HittingStyle)), timed_out=deadline)
+        else:
+            await perform_pitch(game_id, user_id, random.choice(list(PitchingStyle)), timed_out=deadline)
+    except HTTPException as he:
+        # Someone acted between the check and the automatic action
+        print(f"Skipped timeout action for game {game_id}: {he.detail}")
+
+
 @router.get("/{game_id}/history")
 async def get_game_history(
     game_id: str,
@@ -1168,33 +1485,80 @@ async def get_game_history(
         )
 
 
+@router.get("/{game_id}/replay", response_model=GameReplay)
+async def replay_game(
+    game_id: str,
+    seq: Optional[int] = Query(
+        None, ge=0, description="Event to rebuild the game as of; the latest when omitted"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Rebuild the game state as of one event of its log"""
+    try:
+        game_ref = db.collection('games').document(game_id)
+        game_state = await game_store.get(game_ref)
+
+        # Verify user is part of this game
+        if (current_user['uid'] != game_state["team1"]["user_id"] and
+                (not game_state.get("team2") or current_user['uid'] != game_state["team2"]["user_id"])):
+            raise HTTPException(
+                status_code=403,
+                detail="Not authorized to view this game"
+            )
+
+        # The events asked for may still be waiting in the game's next write
+        await game_store.flush_for(game_id, "event_seq", through=seq)
+
+        # Nearest snapshot plus the events after it
+        state, last_seq = await asyncio.to_thread(rebuild_state, game_ref, seq)
+        if not state or (seq is not None and last_seq != seq):
+            raise HTTPException(
+                status_code=404,
+                detail="Event not found"
+            )
+
+        event = await asyncio.to_thread(
+            game_ref.collection(EVENT_LOG).document(entry_id(last_seq)).get)
+
+        return GameReplay(
+            game_id=game_id,
+            seq=last_seq,
+            state=GameState(**state),
+            event=event.to_dict() if event.exists else None
+        )
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error replaying game: {str(e)}"
+        )
+
+
 @router.get("/{game_id}/commentary", response_model=CommentaryResponse)
 async def get_game_commentary(
     game_id: str,
+    limit: int = Query(COMMENTARY_PAGE_SIZE, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page, for older commentary"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get game commentary based on game history"""
+    """Get game commentary, newest page first; each page is in play order"""
     try:
+        before = decode_cursor(cursor).get('before') if cursor else None
+
         # Verify game exists and user is authorized
         game_ref = db.collection('games').document(game_id)
-        game = game_ref.get()
-
-        if not game.exists:
-            raise HTTPException(status_code=404, detail="Game not found")
-
-        game_state = game.to_dict()
+        game_state = await game_store.get(game_ref)
 
         # Verify user authorization
         if (current_user['uid'] != game_state["team1"]["user_id"] and
                 (not game_state["team2"] or current_user['uid'] != game_state["team2"]["user_id"])):
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        # Fetch commentary history
-        commentary_history_ref = game_ref.collection(
-            'commentary_history').document('main')
-        commentary_history = commentary_history_ref.get()
+        # Fetch one page of the commentary log
+        full_commentary, older = latest_entries(game_ref, limit, before)
 
-        if not commentary_history.exists:
+        if not full_commentary:
             return CommentaryResponse(
                 game_id=game_id,
                 status=game_state["status"],
@@ -1205,8 +1569,6 @@ async def get_game_commentary(
                 play_data=None
             )
 
-        full_commentary = commentary_history.to_dict().get('full_commentary', [])
-
         # Extract non-None audio URLs
         audio_urls = [
             entry.get('audio_url') or '' 
@@ -1220,11 +1582,56 @@ async def get_game_commentary(
             audio_commentaries=audio_urls,
             latest_commentary=full_commentary[-1].get('commentary', '') if full_commentary else "No commentary available.",
             latest_audio_commentary=full_commentary[-1].get('audio_url') or None if full_commentary else None,
-            play_data=full_commentary[-1] if full_commentary else None
+            play_data=full_commentary[-1] if full_commentary else None,
+            next_cursor=encode_cursor({'before': older}) if older else None
         )
 
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=400,
+            detail=str(ve)
+        )
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error generating commentary: {str(e)}"
         )
+
+
+@router.get("/{game_id}/commentary/{ticket_id}", response_model=CommentaryTicket)
+async def get_commentary_ticket(
+    game_id: str,
+    ticket_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Poll the commentary for a pitch or bat by the ticket it returned"""
+    try:
+        game_ref = db.collection('games').document(game_id)
+        game_state = await game_store.get(game_ref)
+
+        # Verify user authorization
+        if (current_user['uid'] != game_state["team1"]["user_id"] and
+                (not game_state["team2"] or current_user['uid'] != game_state["team2"]["user_id"])):
+            raise HTTPException(status_code=403, detail="Not authorized")
+
+        # A ticket still waiting in the game's next write is served from memory
+        ticket_ref = game_ref.collection('commentary_tickets').document(ticket_id)
+        unwritten = game_store.unwritten(game_id, ticket_ref)
+        if unwritten is not None:
+            return CommentaryTicket(**unwritten)
+
+        ticket = await asyncio.to_thread(ticket_ref.get)
+        if not ticket.exists:
+            raise HTTPException(status_code=404, detail="Commentary ticket not found")
+
+        return CommentaryTicket(**ticket.to_dict())
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving commentary: {str(e)}"
+        )
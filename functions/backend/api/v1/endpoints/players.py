@@ -1,31 +1,166 @@
-from fastapi import APIRouter, HTTPException, Query, status
+import bisect
+import itertools
+import math
+import re
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from typing import List, Optional
-from models.schemas.player import PlayerCard, PlayerList
-from services.firebase import db
+from typing import Dict, List, Optional, Tuple
 from google.cloud.firestore import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+from core.http_cache import (
+    apply_cache_headers, cache_headers, etag_matches, not_modified, version_etag
+)
+from models.schemas.player import (
+    PlayerBatchRequest, PlayerBatchResponse, PlayerCard, PlayerList,
+    PlayerSearchHit, PlayerSearchResponse
+)
+from services.firebase import db
+from services.pagination import decode_cursor, encode_cursor
+from services.player_catalog import METADATA_DOC_IDS, CatalogSnapshot, player_catalog
+from services.player_index import INDEX_FIELDS, LIST_FIELDS, popcount
+from services.player_matrix import bitmap_to_mask, mask_to_bitmap
+from services.player_payloads import choose_encoding
+from services.player_projection import (
+    parse_fields, project, project_players, projected_list_model
+)
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. basic_info.name,basic_info.team"
+
+# min_<ability> / max_<ability> range filters, e.g. min_contact=80
+RANGE_PARAM = re.compile(r'^(min|max)_(\w+)$')
+
+# Most disjunctions Firestore allows in one query
+MAX_QUERY_DISJUNCTIONS = 30
 
 router = APIRouter()
 
 
+@router.get("/search", response_model=PlayerSearchResponse)
+async def search_players(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Player name or name prefix"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Search players by name, ranked best match first"""
+    try:
+        snapshot = player_catalog.snapshot()
+        etag = version_etag(request, snapshot.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        results = []
+        for position, score in snapshot.search.search(q, limit):
+            player_data = snapshot.players[snapshot.player_ids[position]]
+            results.append(PlayerSearchHit(
+                player_id=player_data['player_id'],
+                name=player_data['basic_info']['name'],
+                team=player_data['basic_info']['team'],
+                primary_position=player_data['basic_info']['primary_position'],
+                score=score
+            ))
+
+        apply_cache_headers(response, etag)
+        return PlayerSearchResponse(query=q, results=results)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching players: {str(e)}"
+        )
+
+
+@router.post("/batch", response_model=PlayerBatchResponse)
+async def get_players_batch(
+    batch: PlayerBatchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get many players in one call, in request order, reporting unknown IDs"""
+    try:
+        projection = parse_fields(fields) if fields else None
+        # Drop duplicates but keep the first-seen order
+        player_ids = list(dict.fromkeys(str(player_id) for player_id in batch.player_ids))
+
+        try:
+            snapshot = player_catalog.snapshot()
+            found = {
+                player_id: snapshot.players[player_id]
+                for player_id in player_ids if player_id in snapshot.players
+            }
+        except Exception as e:
+            # Catalog unavailable, resolve everything in one batched read
+            print(f"Player catalog unavailable, batch reading Firestore: {e}")
+            refs = [db.collection('players').document(player_id) for player_id in player_ids]
+            field_paths = list(projection) if projection else None
+            found = {}
+            for doc in db.get_all(refs, field_paths=field_paths):
+                if doc.exists and doc.id not in METADATA_DOC_IDS:
+                    player_data = doc.to_dict()
+                    # Ensure player_id is string
+                    player_data['player_id'] = str(player_data['player_id'])
+                    found[doc.id] = player_data
+
+        players = [found[player_id] for player_id in player_ids if player_id in found]
+        missing = [player_id for player_id in player_ids if player_id not in found]
+        if projection:
+            return JSONResponse({
+                "players": project_players(players, projection),
+                "missing": missing
+            })
+        return PlayerBatchResponse(players=players, missing=missing)
+
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving players: {str(e)}"
+        )
+
+
 @router.get("/{player_id}", response_model=PlayerCard)
-async def get_player(player_id: str):
+async def get_player(
+    player_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get a specific player by ID"""
     try:
-        doc_ref = db.collection('players').document(str(player_id))
-        doc = doc_ref.get()
+        projection = parse_fields(fields) if fields else None
+        snapshot = player_catalog.snapshot()
+        etag = version_etag(request, snapshot.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        player_data = snapshot.get(player_id)
 
-        if not doc.exists:
+        if player_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Player with ID {player_id} not found"
             )
 
-        player_data = doc.to_dict()
-        # Ensure player_id is string in response
-        player_data['player_id'] = str(player_data['player_id'])
+        if projection:
+            return JSONResponse(
+                project_players([player_data], projection)[0],
+                headers=cache_headers(etag)
+            )
+
+        apply_cache_headers(response, etag)
         return player_data
 
+    except HTTPException as he:
+        raise he
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -35,43 +170,77 @@ async def get_player(player_id: str):
 
 @router.get("/", response_model=PlayerList)
 async def get_players(
+    request: Request,
+    response: Response,
     role: Optional[str] = Query(None, description="Filter by role"),
     team: Optional[str] = Query(None, description="Filter by team"),
     position: Optional[str] = Query(None, description="Filter by position"),
+    bats: Optional[str] = Query(None, description="Filter by batting hand"),
+    throws: Optional[str] = Query(None, description="Filter by throwing hand"),
+    pitching_style: Optional[str] = Query(None, description="Filter by pitching style"),
+    hitting_style: Optional[str] = Query(None, description="Filter by hitting style"),
+    facets: bool = Query(False, description="Include per-value counts of the matching players"),
+    sort: Optional[str] = Query(None, description="Ability to sort by, prefix with '-' for descending"),
+    top_k: Optional[int] = Query(None, ge=1, le=1454, description="Only rank the best k players by sort"),
     limit: int = Query(10, ge=1, le=1454),
-    offset: int = Query(0, ge=0)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    offset: int = Query(0, ge=0, deprecated=True),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
-    """Get players with filters"""
+    """
+    Get players with filters, one page at a time.
+    Each filter accepts comma-separated values, matching any of them.
+    Abilities can be bounded with min_<ability>/max_<ability>, e.g. min_contact=80.
+    """
     try:
-        query = db.collection('players')
-
-        # Don't query the metadata document
-        query = query.where(filter=FieldFilter('player_id', '!=', 'metadata'))
-
-        # Apply filters if provided
-        if role:
-            query = query.where(filter=FieldFilter('role_info.primary_role', '==', role))
-        if team:
-            query = query.where(filter=FieldFilter('basic_info.team', '==', team))
-        if position:
-            query = query.where(filter=FieldFilter('basic_info.primary_position', '==', position))
+        cursor_position = decode_cursor(cursor) if cursor else {}
+        projection = parse_fields(fields) if fields else None
+        ranges = parse_ranges(request.query_params)
+        if top_k and not sort:
+            raise ValueError("top_k requires sort")
+        filters = parse_filters({
+            'role': role,
+            'team': team,
+            'position': position,
+            'bats': bats,
+            'throws': throws,
+            'pitching_style': pitching_style,
+            'hitting_style': hitting_style,
+        })
 
-        # Execute query
-        docs = query.stream()
+        try:
+            snapshot = player_catalog.snapshot()
+        except Exception as e:
+            # Ability ranges and sorting need the catalog's ability matrix
+            if ranges or sort:
+                raise
+            # Catalog unavailable, page through Firestore directly
+            print(f"Player catalog unavailable, querying Firestore: {e}")
+            page = query_players_page(filters, limit, cursor_position.get('after'), projection)
+            if projection:
+                return JSONResponse(jsonable_encoder(page))
+            return page
 
-        # Convert to list and ensure player_id is string
-        players = []
-        for doc in docs:
-            player_data = doc.to_dict()
-            player_data['player_id'] = str(player_data['player_id'])
-            players.append(player_data)
+        etag = version_etag(request, snapshot.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        # Apply pagination
-        total = len(players)
-        paginated_players = players[offset:offset + limit]
+        page = catalog_players_page(
+            snapshot, filters, limit, cursor_position, offset, facets, ranges, sort, top_k,
+            projection
+        )
+        if projection:
+            # Projected pages don't fit response_model, so serialize them here
+            return JSONResponse(jsonable_encoder(page), headers=cache_headers(etag))
 
-        return PlayerList(players=paginated_players, total=total)
+        apply_cache_headers(response, etag)
+        return page
 
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -79,21 +248,191 @@ async def get_players(
         )
 
 
+def parse_filters(raw_filters: Dict[str, Optional[str]]) -> Dict[str, List[str]]:
+    """Split comma-separated filter values, dropping filters that were not given"""
+    filters = {}
+    for name, raw in raw_filters.items():
+        if not raw:
+            continue
+        values = [value.strip() for value in raw.split(',') if value.strip()]
+        if values:
+            filters[name] = values
+    return filters
+
+
+def parse_ranges(params) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """Collect min_<ability>/max_<ability> query parameters into (min, max) ranges"""
+    ranges = {}
+    for key, raw in params.items():
+        match = RANGE_PARAM.match(key)
+        if not match:
+            continue
+        bound, ability = match.groups()
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"{key} must be a number")
+        low, high = ranges.get(ability, (None, None))
+        ranges[ability] = (value, high) if bound == 'min' else (low, value)
+    return ranges
+
+
+def catalog_players_page(
+    snapshot: CatalogSnapshot,
+    filters: Dict[str, List[str]],
+    limit: int,
+    cursor_position: Optional[Dict] = None,
+    offset: int = 0,
+    include_facets: bool = False,
+    ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    sort: Optional[str] = None,
+    top_k: Optional[int] = None,
+    projection: Optional[Tuple[str, ...]] = None
+) -> PlayerList:
+    """Resolve filters on the bitmap index and ability matrix, then read one page"""
+    cursor_position = cursor_position or {}
+    list_model = projected_list_model(projection) if projection else PlayerList
+    # The deprecated offset only applies to the first page
+    if cursor_position:
+        offset = 0
+    index = snapshot.index
+    bitmap = index.match(filters)
+    if ranges:
+        mask = snapshot.abilities.mask(ranges, bitmap_to_mask(bitmap, index.size))
+        bitmap = mask_to_bitmap(mask)
+    total = popcount(bitmap)
+    facets = index.facets(bitmap) if include_facets else None
+
+    if sort:
+        # Ranked pages are addressed by rank, which only holds for the same sort
+        if cursor_position and cursor_position.get('sort') != sort:
+            raise ValueError("Cursor does not match sort")
+        if top_k:
+            total = min(total, top_k)
+        start = int(cursor_position.get('rank', offset))
+        end = min(start + limit, total)
+        rows = snapshot.abilities.rank(bitmap_to_mask(bitmap, index.size), sort, end)
+        players = [snapshot.players[snapshot.player_ids[i]] for i in rows[start:end]]
+        next_cursor = encode_cursor({'rank': end, 'sort': sort}) if end < total else None
+        if projection:
+            players = [project(player, projection) for player in players]
+        return list_model(players=players, total=total, next_cursor=next_cursor, facets=facets)
+
+    after = cursor_position.get('after')
+    start = bisect.bisect_right(snapshot.player_ids, after) if after is not None else 0
+
+    # One extra match tells us whether there is a next page
+    rows = list(itertools.islice(
+        index.positions(bitmap, start), offset, offset + limit + 1
+    ))
+    players = [snapshot.players[snapshot.player_ids[i]] for i in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor({'after': players[-1]['player_id']})
+
+    if projection:
+        players = [project(player, projection) for player in players]
+    return list_model(players=players, total=total, next_cursor=next_cursor, facets=facets)
+
+
+def check_query_filters(filters: Dict[str, List[str]]):
+    """Reject filter combinations a single Firestore query cannot express"""
+    list_filters = [name for name in filters if name in LIST_FIELDS]
+    if len(list_filters) > 1:
+        raise ValueError(
+            f"Filtering by {' and '.join(list_filters)} together is unavailable "
+            "right now, filter by one of them"
+        )
+    # Firestore expands in/array-contains-any filters into at most 30 disjunctions
+    disjunctions = math.prod(len(values) for values in filters.values())
+    if disjunctions > MAX_QUERY_DISJUNCTIONS:
+        raise ValueError(
+            f"Too many filter values combined ({disjunctions}, at most "
+            f"{MAX_QUERY_DISJUNCTIONS}) while the player catalog is unavailable"
+        )
+
+
+def query_players_page(
+    filters: Dict[str, List[str]],
+    limit: int,
+    after: Optional[str] = None,
+    projection: Optional[Tuple[str, ...]] = None
+) -> PlayerList:
+    """Read one page from Firestore with limit/start_after applied in the query"""
+    check_query_filters(filters)
+    query = db.collection('players')
+    if not filters:
+        # The metadata documents have none of the filtered fields, so only
+        # the unfiltered query has to leave them out
+        query = query.where(filter=FieldFilter(
+            FieldPath.document_id(), 'not-in',
+            [db.collection('players').document(doc_id) for doc_id in sorted(METADATA_DOC_IDS)]
+        ))
+    for name, values in filters.items():
+        field_path = INDEX_FIELDS[name]
+        if name in LIST_FIELDS:
+            query = query.where(filter=FieldFilter(field_path, 'array_contains_any', values))
+        elif len(values) > 1:
+            query = query.where(filter=FieldFilter(field_path, 'in', values))
+        else:
+            query = query.where(filter=FieldFilter(field_path, '==', values[0]))
+
+    # Count without reading documents: aggregation for filtered queries,
+    # the precomputed total from players/metadata otherwise
+    if filters:
+        total = query.count().get()[0][0].value
+    else:
+        metadata = db.collection('players').document('metadata').get()
+        total = metadata.to_dict().get('total_players', 0) if metadata.exists else 0
+
+    page_query = query.order_by(FieldPath.document_id()).limit(limit + 1)
+    if after is not None:
+        page_query = page_query.start_after({FieldPath.document_id(): str(after)})
+    if projection:
+        # Only transfer the projected fields
+        page_query = page_query.select(list(projection))
+
+    docs = list(page_query.stream())
+
+    players = []
+    for doc in docs[:limit]:
+        player_data = doc.to_dict()
+        # Ensure player_id is string
+        player_data['player_id'] = str(player_data['player_id'])
+        players.append(player_data)
+
+    next_cursor = None
+    if len(docs) > limit:
+        next_cursor = encode_cursor({'after': docs[limit - 1].id})
+
+    if projection:
+        return projected_list_model(projection)(
+            players=[project(player, projection) for player in players],
+            total=total,
+            next_cursor=next_cursor
+        )
+    return PlayerList(players=players, total=total, next_cursor=next_cursor)
+
+
 @router.get("/{player_id}/headshot")
-async def get_player_headshot(player_id: str):
+async def get_player_headshot(player_id: str, request: Request):
     """Get player's headshot URL"""
     try:
-        # Get player document to verify existence
-        doc_ref = db.collection('players').document(str(player_id))
-        doc = doc_ref.get()
+        snapshot = player_catalog.snapshot()
+        etag = version_etag(request, snapshot.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        # Verify player existence
+        player_data = snapshot.get(player_id)
 
-        if not doc.exists:
+        if player_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Player with ID {player_id} not found"
             )
 
-        player_data = doc.to_dict()
         headshot_url = player_data.get('basic_info', {}).get('headshot_url')
 
         if not headshot_url:
@@ -106,8 +445,10 @@ async def get_player_headshot(player_id: str):
         return JSONResponse({
             "url": headshot_url,
             "player_id": str(player_id)
-        })
+        }, headers=cache_headers(etag))
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -117,32 +458,50 @@ async def get_player_headshot(player_id: str):
 
 @router.get("/list/deck-selection", response_model=List[PlayerCard])
 async def get_players_for_deck(
-    position: Optional[str] = Query(None, description="Filter by position")
+    request: Request,
+    position: Optional[str] = Query(None, description="Filter by position"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get players suitable for deck selection"""
     try:
-        if position:
-            query = (
-                db.collection('players')
-                .where(filter=FieldFilter("basic_info.primary_position", "==", position))
+        snapshot = player_catalog.snapshot()
+
+        if fields:
+            # Projections are served fresh rather than from the prepared payloads
+            projection = parse_fields(fields)
+            etag = version_etag(request, snapshot.version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return JSONResponse(
+                project_players(snapshot.deck_selection_players(position), projection),
+                headers=cache_headers(etag)
             )
-        else:
-            query = db.collection('players')
 
-        # Get all documents
-        docs = query.stream()
-        players = []
+        # Each encoding is a separate representation with its own strong ETag
+        encoding = choose_encoding(request.headers.get('accept-encoding'))
+        etag = version_etag(request, snapshot.version)
+        if etag is not None and encoding != 'identity':
+            etag = f'{etag[:-1]}-{encoding}"'
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        # Process documents synchronously since Firebase Admin doesn't support async iteration
-        for doc in docs:
-            player_data = doc.to_dict()
-            if player_data and 'player_id' in player_data and player_data['player_id'] != 'metadata':
-                # Ensure player_id is string
-                player_data['player_id'] = str(player_data['player_id'])
-                players.append(player_data)
+        # Pre-serialized and pre-compressed per catalog version
+        payload = snapshot.deck_selection_payload(position)
 
-        return players
+        headers = {**cache_headers(etag), 'Vary': 'Accept-Encoding'}
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(
+            content=payload.body(encoding),
+            media_type='application/json',
+            headers=headers
+        )
 
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
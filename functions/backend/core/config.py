@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     FIREBASE_STORAGE_BUCKET: str = os.getenv("FIREBASE_STORAGE_BUCKET", "")
     GOOGLE_APPLICATION_CREDENTIALS: str = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
     GEMINI_KEY: str = os.getenv("GEMINI_KEY", "")
+    # Audience for local ID-token verification (defaults to the Firebase app's project)
+    FIREBASE_PROJECT_ID: str = os.getenv("FIREBASE_PROJECT_ID", "")
 
     # CORS settings
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -25,4 +27,44 @@ class Settings(BaseSettings):
 
     DEVELOPMENT_MODE: bool = True
 
+    # Player catalog cache: seconds between data_version checks
+    PLAYER_CATALOG_REFRESH_SECONDS: int = 60
+    # Cache-Control max-age for /players responses (revalidated with ETags)
+    PLAYER_CACHE_MAX_AGE: int = 300
+
+    # Verified ID-token cache: entry bound, and the longest a cached token
+    # is trusted before being verified again (caps revocation latency)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_MAX_TTL: int = 300
+
+    # Most recent plays given to the commentary model as context
+    COMMENTARY_HISTORY_LIMIT: int = 5
+
+    # Active games in memory: seconds a change may wait before it is written,
+    # and seconds without activity before a game is dropped from memory
+    GAME_FLUSH_INTERVAL: float = 1.0
+    GAME_IDLE_SECONDS: int = 600
+    # Attempts at a precondition-checked game flush before keeping it for later,
+    # and the longest wait before retrying a flush that failed (it doubles)
+    GAME_WRITE_MAX_ATTEMPTS: int = 5
+    GAME_FLUSH_MAX_BACKOFF: float = 30.0
+    # Events between full snapshots of a game's state in its event log
+    GAME_SNAPSHOT_INTERVAL: int = 50
+
+    # Action deadlines: resolution of the deadline timer wheel, and missed
+    # deadlines in a row after which a player forfeits instead of being
+    # given an automatic pitch or bat
+    DEADLINE_TICK_SECONDS: float = 1.0
+    MAX_CONSECUTIVE_TIMEOUTS: int = 3
+    # Seconds a player has for each action before it is made for them: the
+    # first pitch of a game, each later pitch, and each bat after a pitch
+    FIRST_PITCH_DEADLINE_SECONDS: int = 60
+    PITCH_DEADLINE_SECONDS: int = 30
+    BAT_DEADLINE_SECONDS: int = 100
+
+    # Matchmaking: width of the deck-strength buckets players are paired
+    # within (0 pairs anyone), and seconds a ticket lives without a poll
+    MATCHMAKING_BUCKET_WIDTH: float = 10.0
+    MATCHMAKING_TICKET_TTL: int = 60
+
 settings = Settings()
\ No newline at end of file
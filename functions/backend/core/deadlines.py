@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from core.config import settings
+
+
+def deadline_timestamp(deadline: Any) -> Optional[float]:
+    """An action_deadline (datetime or ISO string, naive meaning UTC) as epoch seconds"""
+    if deadline is None:
+        return None
+    if isinstance(deadline, str):
+        deadline = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline.timestamp()
+
+
+def action_deadline(action: str, now: datetime) -> datetime:
+    """When the player due to make action ("first_pitch", "pitch" or "bat") must have made it"""
+    seconds = {
+        "first_pitch": settings.FIRST_PITCH_DEADLINE_SECONDS,
+        "pitch": settings.PITCH_DEADLINE_SECONDS,
+        "bat": settings.BAT_DEADLINE_SECONDS
+    }[action]
+    return now + timedelta(seconds=seconds)
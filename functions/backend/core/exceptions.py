@@ -12,4 +12,11 @@ class DatabaseException(HTTPException):
         super().__init__(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error during {operation}: {detail}"
-        )
\ No newline at end of file
+        )
+
+class GameNotFoundException(HTTPException):
+    def __init__(self, game_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Game {game_id} not found"
+        )
@@ -1,20 +1,73 @@
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from firebase_admin import auth
+from core.config import settings
+from core.key_store import KeyStore, TokenVerifier
+from core.token_cache import TokenCache
 from models.schemas.user import UserRole
 from typing import Optional
 import firebase_admin
 
 security = HTTPBearer()
 
+# Verified claims by token hash, so repeat requests skip signature checks
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_SIZE, settings.TOKEN_CACHE_MAX_TTL)
+
+# Google's signing certificates, refreshed in the background once started
+key_store = KeyStore()
+# Local verifier, set up by configure_verifier; firebase_admin is used until then
+token_verifier: Optional[TokenVerifier] = None
+
+def configure_verifier(key_set=None, project_id: Optional[str] = None) -> Optional[TokenVerifier]:
+    """
+    Verify ID tokens locally against key_set (Google's key store by default).
+    Tests and benchmarks can pass a LocalKeySet to run without network access.
+    """
+    global token_verifier
+    if not project_id:
+        project_id = settings.FIREBASE_PROJECT_ID
+    if not project_id:
+        try:
+            project_id = firebase_admin.get_app().project_id
+        except Exception:
+            project_id = None
+
+    if project_id:
+        token_verifier = TokenVerifier(project_id, key_set or key_store)
+    else:
+        print("No Firebase project ID configured, verifying tokens with firebase_admin")
+        token_verifier = None
+    return token_verifier
+
+def start_token_verification():
+    """Startup hook: verify locally and keep the signing certificates fresh"""
+    verifier = configure_verifier()
+    if verifier is not None and verifier.key_set is key_store:
+        key_store.start()
+
+async def stop_token_verification():
+    await key_store.stop()
+
+def verify_id_token(token: str) -> dict:
+    if token_verifier is not None:
+        return token_verifier.verify(token)
+    return auth.verify_id_token(token)
+
+def extract_token(credentials: HTTPAuthorizationCredentials) -> str:
+    token = credentials.credentials
+    # Remove 'Bearer ' prefix if present
+    if token.startswith('Bearer '):
+        token = token.split(' ')[1]
+    return token
+
 async def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     try:
-        token = credentials.credentials
-        # Remove 'Bearer ' prefix if present
-        if token.startswith('Bearer '):
-            token = token.split(' ')[1]
+        token = extract_token(credentials)
 
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = token_cache.get(token)
+        if decoded_token is None:
+            decoded_token = verify_id_token(token)
+            token_cache.put(token, decoded_token)
         return decoded_token
     except Exception as e:
         raise HTTPException(
@@ -22,6 +75,20 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Security(secu
             detail=f"Invalid authentication credentials: {str(e)}"
         )
 
+async def verify_token_strict(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+    """
+    Verify without the cache and check revocation with Firebase, for routes
+    that must not accept a token revoked within the cache TTL
+    """
+    try:
+        token = extract_token(credentials)
+        return auth.verify_id_token(token, check_revoked=True)
+    except Exception as e:
+        raise HTTPException(
+            status_code=401,
+            detail=f"Invalid authentication credentials: {str(e)}"
+        )
+
 async def get_current_user(token: dict = Depends(verify_token)):
     try:
         return token
@@ -31,7 +98,10 @@ async def get_current_user(token: dict = Depends(verify_token)):
             detail=f"Could not validate credentials: {str(e)}"
         )
 
-async def get_admin_user(token: dict = Depends(get_current_user)):
+async def get_current_user_strict(token: dict = Depends(verify_token_strict)):
+    return token
+
+async def get_admin_user(token: dict = Depends(get_current_user_strict)):
     try:
         # Check if user has admin custom claim
         if not token.get('admin', False):
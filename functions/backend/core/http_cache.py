@@ -0,0 +1,48 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+from core.config import settings
+
+
+def version_etag(request: Request, version: Optional[str]) -> Optional[str]:
+    """
+    Strong ETag for a response that depends only on a data version and the
+    request path and query. Returns None when there is no version to key on.
+    """
+    if version is None:
+        return None
+    query = '&'.join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha256(f"{version}|{request.url.path}|{query}".encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    if etag is None:
+        return False
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses weak comparison
+    candidates = [tag.strip() for tag in header.split(',')]
+    return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates)
+
+
+def cache_headers(etag: Optional[str]) -> dict:
+    """ETag and Cache-Control headers for cacheable responses"""
+    headers = {'Cache-Control': f"public, max-age={settings.PLAYER_CACHE_MAX_AGE}"}
+    if etag is not None:
+        headers['ETag'] = etag
+    return headers
+
+
+def apply_cache_headers(response: Response, etag: Optional[str]):
+    """Set ETag and Cache-Control on the response FastAPI will send"""
+    response.headers.update(cache_headers(etag))
+
+
+def not_modified(etag: Optional[str]) -> Response:
+    """Empty 304 response for a matching conditional request"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt
+
+# Google's x509 certificates for Firebase Auth ID tokens, keyed by kid
+FIREBASE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+FIREBASE_ISSUER = "https://securetoken.google.com/"
+
+MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class KeyStore:
+    """
+    Google's Firebase ID-token signing certificates, fetched at startup and
+    refreshed in the background ahead of their Cache-Control expiry so no
+    request waits on a certificate download.
+    """
+
+    def __init__(
+        self,
+        url: str = FIREBASE_CERTS_URL,
+        refresh_margin: int = 300,
+        retry_seconds: int = 30
+    ):
+        self.url = url
+        self.refresh_margin = refresh_margin
+        self.retry_seconds = retry_seconds
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def fetch(self) -> Tuple[Dict[str, str], int]:
+        """Download the current certificates and their max-age in seconds"""
+        response = httpx.get(self.url, timeout=10.0)
+        response.raise_for_status()
+        match = MAX_AGE.search(response.headers.get('cache-control', ''))
+        max_age = int(match.group(1)) if match else 3600
+        return response.json(), max_age
+
+    def refresh(self) -> int:
+        """Replace the certificates, returning seconds until they expire"""
+        certs, max_age = self.fetch()
+        with self._lock:
+            self._certs = certs
+            self._expires_at = time.time() + max_age
+        return max_age
+
+    def certs(self) -> Dict[str, str]:
+        """Current certificates, fetched inline only if the background refresh fell behind"""
+        if not self._certs or time.time() >= self._expires_at:
+            self.refresh()
+        return self._certs
+
+    async def _run(self):
+        while True:
+            try:
+                max_age = await asyncio.to_thread(self.refresh)
+                delay = max(max_age - self.refresh_margin, self.retry_seconds)
+            except Exception as e:
+                print(f"Error refreshing signing certificates: {e}")
+                delay = self.retry_seconds
+            await asyncio.sleep(delay)
+
+    def start(self):
+        """Prefetch and keep refreshing in the background (call from the event loop)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class LocalKeySet:
+    """
+    In-process RSA key set that mints and verifies Firebase-shaped ID tokens
+    without network access, for tests and load benchmarks.
+    """
+
+    def __init__(self):
+        self.kid = uuid.uuid4().hex
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self._signer = crypt.RSASigner.from_string(private_pem, key_id=self.kid)
+        self._certs = {self.kid: public_pem.decode('utf-8')}
+
+    def certs(self) -> Dict[str, str]:
+        return self._certs
+
+    def mint(self, uid: str, project_id: str, expires_in: int = 3600, **claims) -> str:
+        """Sign an ID token for uid that TokenVerifier accepts for project_id"""
+        now = int(time.time())
+        payload = {
+            "iss": f"{FIREBASE_ISSUER}{project_id}",
+            "aud": project_id,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + expires_in,
+            "sub": uid,
+            "user_id": uid,
+            **claims
+        }
+        return jwt.encode(self._signer, payload).decode('utf-8')
+
+
+class TokenVerifier:
+    """Verifies Firebase ID tokens locally against a key store or local key set"""
+
+    def __init__(self, project_id: str, key_set):
+        self.project_id = project_id
+        self.key_set = key_set
+
+    def verify(self, token: str) -> Dict:
+        """Check signature, audience, issuer and subject, as firebase_admin does"""
+        claims = jwt.decode(
+            token,
+            certs=self.key_set.certs(),
+            audience=self.project_id,
+            clock_skew_in_seconds=10
+        )
+        if claims.get('iss') != f"{FIREBASE_ISSUER}{self.project_id}":
+            raise ValueError("ID token has incorrect issuer")
+        subject = claims.get('sub')
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise ValueError("ID token has invalid subject")
+        claims['uid'] = subject
+        return claims
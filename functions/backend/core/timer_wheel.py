@@ -0,0 +1,60 @@
+import math
+from typing import Dict, Hashable, List, Tuple
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel: one deadline per key, O(1) to set, expired in
+    tick-sized steps by advance().
+
+    Setting a key's deadline replaces the previous one; the old slot entry
+    is left behind and skipped when its tick comes up, so nothing is ever
+    searched or removed eagerly.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, start: float = 0.0):
+        self._tick = tick
+        self._slots: List[List[Tuple[int, Hashable, float]]] = [[] for _ in range(slots)]
+        # Last tick that has been expired
+        self._current = int(start // tick)
+        self._deadlines: Dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, when: float):
+        """Expire key at when (epoch seconds), replacing any earlier deadline"""
+        self._deadlines[key] = when
+        # Anything already due goes off at the next tick
+        tick = max(math.ceil(when / self._tick), self._current + 1)
+        self._slots[tick % len(self._slots)].append((tick, key, when))
+
+    def cancel(self, key: Hashable):
+        self._deadlines.pop(key, None)
+
+    def advance(self, now: float) -> List[Tuple[Hashable, float]]:
+        """Expire everything due by now; returns (key, deadline) pairs, earliest first"""
+        target = int(now // self._tick)
+        if target <= self._current:
+            return []
+
+        expired = []
+        # After a long gap one turn of the wheel visits every slot
+        for step in range(1, min(target - self._current, len(self._slots)) + 1):
+            slot = self._slots[(self._current + step) % len(self._slots)]
+            pending = []
+            for entry in slot:
+                tick, key, when = entry
+                if tick > target:
+                    pending.append(entry)
+                elif self._deadlines.get(key) == when:
+                    del self._deadlines[key]
+                    expired.append((key, when))
+            slot[:] = pending
+
+        self._current = target
+        expired.sort(key=lambda item: item[1])
+        return expired
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified ID-token claims.
+
+    Entries are keyed by a SHA-256 of the token, so raw tokens are never held
+    in memory, and expire at the token's exp claim or after max_ttl seconds,
+    whichever comes first. max_ttl bounds how long a revoked token can keep
+    being accepted by routes that use the cache.
+    """
+
+    def __init__(self, max_size: int, max_ttl: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Cached claims for a token, or None if unknown or expired"""
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: Dict):
+        """Remember verified claims until the token expires"""
+        now = self._clock()
+        expires_at = now + self.max_ttl
+        if 'exp' in claims:
+            expires_at = min(expires_at, float(claims['exp']))
+        if expires_at <= now or self.max_size <= 0:
+            return
+
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "max_ttl": self.max_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
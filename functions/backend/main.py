@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
+from core.firebase_auth import start_token_verification, stop_token_verification
+from services.commentary_pipeline import commentary_pipeline
+from services.deadline_scheduler import deadline_scheduler
+from services.game_events import game_events
+from services.game_store import game_store
 from api.v1.endpoints import auth, players, games, users
 
 app = FastAPI(
@@ -20,6 +25,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    start_token_verification()
+    game_store.start()
+    # Time out idle players, including in games left running before a restart
+    await deadline_scheduler.start(games.handle_action_timeout)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_token_verification()
+    # End live event streams so open connections don't hold up shutdown
+    game_events.close()
+    await deadline_scheduler.stop()
+    # Let in-flight commentary finish so tickets don't stay pending
+    await commentary_pipeline.drain()
+    # Write out the active games held in memory
+    await game_store.stop()
+
+
 # Include routers
 app.include_router(
     players.router,
@@ -28,3 +28,17 @@ class GameStatus(str, Enum):
     WAITING = "waiting"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
+
+class CommentaryStatus(str, Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+class GameLogEventType(str, Enum):
+    CREATED = "created"
+    JOINED = "joined"
+    PITCH = "pitch"
+    BAT = "bat"
+    PITCHER_CHANGE = "pitcher_change"
+    FORFEIT = "forfeit"
+    UPDATE = "update"
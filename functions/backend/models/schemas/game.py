@@ -1,8 +1,8 @@
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from datetime import datetime
-from .base import GameStatus, PitchingStyle, HittingStyle
+from .base import CommentaryStatus, GameLogEventType, GameStatus, PitchingStyle, HittingStyle
 from .user import Deck
 
 class BaseRunner(BaseModel):
@@ -102,6 +102,8 @@ class GameState(BaseModel):
     action_deadline: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    history_seq: int = 0  # seq of the latest history entry
+    event_seq: int = 0  # seq of the latest event log entry
 
 class GameHistory(BaseModel):
     inning: int
@@ -147,11 +149,46 @@ class PlayAction(BaseModel):
 class HistoryEntry(BaseModel):
     entry_type: Literal["event", "play"]
     data: Union[GameEvent, PlayAction]
+    seq: Optional[int] = None  # None for entries from before history was numbered
 
 class GameView(BaseModel):
     game_id: str
     state: GameState
     history: List[HistoryEntry]
+    commentary_history: Optional[Dict] = None  # Latest page of the commentary log
+    history_seq: int = 0  # High-water mark: pass back as `since` for newer entries only
+
+class GameLogEvent(BaseModel):
+    """One entry of a game's event log; folding the log in seq order yields the state"""
+    seq: int
+    type: GameLogEventType
+    at: datetime
+    user_id: Optional[str] = None
+    data: Dict = Field(default_factory=dict)  # Action inputs, e.g. pitch_style
+    changes: Dict[str, Any] = Field(default_factory=dict)  # Dotted field paths set
+    removed: List[str] = Field(default_factory=list)  # Dotted field paths deleted
+
+class GameReplay(BaseModel):
+    """A game's state rebuilt from its event log as of one event"""
+    game_id: str
+    seq: int
+    state: GameState
+    event: Optional[GameLogEvent] = None  # The event that produced the state
+
+class OpenGame(BaseModel):
+    """A game waiting for an opponent"""
+    game_id: str
+    host_id: str
+    created_at: datetime
+
+class OpenGameList(BaseModel):
+    games: List[OpenGame]
+    next_cursor: Optional[str] = None  # Older open games, if any
+
+class MatchmakingStatus(BaseModel):
+    status: Literal["waiting", "matched", "left"]
+    game_id: Optional[str] = None  # Set once matched
+    deck_strength: Optional[float] = None
 
 class CommentaryResponse(BaseModel):
     game_id: str
@@ -161,6 +198,18 @@ class CommentaryResponse(BaseModel):
     latest_commentary: str
     latest_audio_commentary: Optional[str] = None
     play_data: Optional[Dict] = None
+    next_cursor: Optional[str] = None  # Older commentary, if any
+
+class CommentaryTicket(BaseModel):
+    """Commentary for one pitch or bat, produced after the action returns"""
+    ticket_id: str
+    game_id: str
+    action_type: str
+    status: CommentaryStatus
+    commentary: Optional[str] = None
+    audio_url: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
 
 
 class AtBatState(BaseModel):
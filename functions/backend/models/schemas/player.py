@@ -46,4 +46,24 @@ class PlayerCard(BaseModel):
 
 class PlayerList(BaseModel):
     players: List[PlayerCard]
-    total: int
\ No newline at end of file
+    total: int
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
+    facets: Optional[Dict[str, Dict[str, int]]] = None  # field -> value -> count
+
+class PlayerBatchRequest(BaseModel):
+    player_ids: List[str] = Field(..., min_items=1, max_items=100)
+
+class PlayerBatchResponse(BaseModel):
+    players: List[PlayerCard]  # In request order, duplicates removed
+    missing: List[str] = []  # Requested IDs with no player
+
+class PlayerSearchHit(BaseModel):
+    player_id: str
+    name: str
+    team: str
+    primary_position: Position
+    score: float
+
+class PlayerSearchResponse(BaseModel):
+    query: str
+    results: List[PlayerSearchHit]
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import uuid
 from datetime import datetime, timedelta
@@ -65,12 +66,13 @@ class AudioStorageService:
             # Generate unique filename
             filename = f"commentaries/{game_id}/{uuid.uuid4()}.mp3"
 
-            # Upload file to Firebase Storage
+            # Upload file to Firebase Storage, off the event loop
             blob = bucket.blob(filename)
-            blob.upload_from_string(audio_bytes, content_type="audio/mp3")
+            await asyncio.to_thread(
+                blob.upload_from_string, audio_bytes, content_type="audio/mp3")
 
             # Make the file publicly accessible
-            blob.make_public()
+            await asyncio.to_thread(blob.make_public)
 
             return blob.public_url
 
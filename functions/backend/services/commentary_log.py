@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional, Tuple
+from firebase_admin import firestore
+
+# Append-only subcollection of commentary entries, one document per action
+COMMENTARY_LOG = 'commentary_log'
+
+
+def log_entry_ref(game_ref):
+    """Reference for a new commentary log entry; appending is a single write, no read"""
+    return game_ref.collection(COMMENTARY_LOG).document()
+
+
+def latest_entries(
+    game_ref,
+    limit: int,
+    before: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    The newest commentary entries, returned oldest first, optionally only
+    those older than the `before` timestamp. Also returns the timestamp to
+    pass as `before` for the previous page, or None at the start of the game.
+    """
+    query = (
+        game_ref.collection(COMMENTARY_LOG)
+        .order_by('timestamp', direction=firestore.Query.DESCENDING)
+    )
+    if before is not None:
+        query = query.start_after({'timestamp': before})
+
+    # One extra entry tells us whether there is an older page
+    docs = list(query.limit(limit + 1).stream())
+    entries = [doc.to_dict() for doc in docs[:limit]]
+    entries.reverse()
+
+    older = entries[0]['timestamp'] if len(docs) > limit else None
+    if not entries and before is None:
+        # Games from before the log kept a rolling list in commentary_history/main
+        legacy = game_ref.collection('commentary_history').document('main').get()
+        if legacy.exists:
+            entries = legacy.to_dict().get('full_commentary', [])[-limit:]
+    return entries, older
@@ -0,0 +1,205 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from firebase_admin import firestore
+from core.config import settings
+from models.schemas.base import CommentaryStatus
+from services.audio_storage_service import AudioStorageService
+from services.commentary_log import log_entry_ref
+from services.commentary_service import commentary_service
+from services.firebase import db
+from services.game_events import game_events
+from services.game_store import game_store
+from services.text_to_speech_service import audio_commentary_service
+
+
+def read_play_history(game_ref, limit: int = settings.COMMENTARY_HISTORY_LIMIT) -> List[Dict]:
+    """The most recent game history entries, newest first"""
+    history_query = (
+        game_ref.collection('history')
+        .order_by('timestamp', direction=firestore.Query.DESCENDING)
+        .limit(limit)
+        .stream()
+    )
+    return [hist.to_dict() for hist in history_query]
+
+
+async def synthesize_commentary_audio(game_id: str, commentary: str) -> Optional[str]:
+    """Text-to-speech for the commentary, uploaded to storage; returns the audio URL"""
+    audio_commentary = await asyncio.to_thread(
+        audio_commentary_service.generate_audio_commentary, commentary)
+    return await AudioStorageService.upload_audio_commentary(game_id, audio_commentary)
+
+
+class CommentaryPipeline:
+    """
+    Produces commentary text and audio for pitches and bats in the background.
+
+    Actions commit their game state together with a pending ticket and
+    return; the pipeline then generates the commentary, synthesizes and
+    uploads the audio, appends to the game's commentary log and resolves
+    the ticket in one batch.
+    Generation for a game can overlap, but results are delivered in
+    submission order so the commentary log stays in play order.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        # Most recent job per game, so deliveries are chained in order
+        self._tails: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def new_ticket_ref(game_ref):
+        """Reference for a new commentary ticket of the game"""
+        return game_ref.collection('commentary_tickets').document()
+
+    @staticmethod
+    def ticket_document(ticket_ref, game_id: str, action_type: str, created_at: datetime) -> Dict:
+        """Initial, pending ticket document; written by the action's batch"""
+        return {
+            "ticket_id": ticket_ref.id,
+            "game_id": game_id,
+            "action_type": action_type,
+            "status": CommentaryStatus.PENDING,
+            "commentary": None,
+            "audio_url": None,
+            "created_at": created_at,
+            "completed_at": None
+        }
+
+    def schedule(
+        self,
+        game_ref,
+        ticket_ref,
+        history_ref,
+        action_type: str,
+        action_details: Dict,
+        game_context: Dict,
+        player_id: str
+    ) -> asyncio.Task:
+        """Start producing commentary for an action whose ticket has been written"""
+        game_id = game_ref.id
+        previous = self._tails.get(game_id)
+        task = asyncio.create_task(self._run(
+            game_ref, ticket_ref, history_ref, action_type,
+            action_details, game_context, player_id, previous
+        ))
+        self._tasks.add(task)
+        self._tails[game_id] = task
+        task.add_done_callback(lambda done: self._finished(game_id, done))
+        return task
+
+    def _finished(self, game_id: str, task: asyncio.Task):
+        self._tasks.discard(task)
+        if self._tails.get(game_id) is task:
+            del self._tails[game_id]
+
+    async def _run(
+        self,
+        game_ref,
+        ticket_ref,
+        history_ref,
+        action_type: str,
+        action_details: Dict,
+        game_context: Dict,
+        player_id: str,
+        previous: Optional[asyncio.Task]
+    ):
+        try:
+            play_history, player_name = await asyncio.gather(
+                asyncio.to_thread(read_play_history, game_ref),
+                commentary_service.fetch_player_name(player_id, game_ref.id)
+            )
+            commentary = await commentary_service.generate_ai_commentary(
+                action_type,
+                action_details,
+                {**game_context, "player_name": player_name},
+                play_history
+            )
+            audio_url = await synthesize_commentary_audio(game_ref.id, commentary)
+        except Exception as e:
+            print(f"Error generating commentary for ticket {ticket_ref.id}: {e}")
+            await self._wait(previous)
+            await self._fail(game_ref, ticket_ref, datetime.utcnow())
+            return
+
+        # Deliver only after the game's earlier actions have been delivered
+        await self._wait(previous)
+        completed_at = datetime.utcnow()
+        try:
+            # The history entry and ticket are written with the game's next flush
+            await game_store.flush(game_ref.id)
+
+            # History entry, commentary log and ticket land together in one commit
+            batch = db.batch()
+            batch.update(history_ref, {
+                "commentary": commentary,
+                "audio_url": audio_url
+            })
+            batch.set(log_entry_ref(game_ref), {
+                "timestamp": game_context["timestamp"],
+                "commentary": commentary,
+                "audio_url": audio_url,
+                "action_type": action_type,
+                "details": action_details,
+                "ticket_id": ticket_ref.id
+            })
+            batch.update(ticket_ref, {
+                "status": CommentaryStatus.READY,
+                "commentary": commentary,
+                "audio_url": audio_url,
+                "completed_at": completed_at
+            })
+            await asyncio.to_thread(batch.commit)
+            game_events.publish(game_ref.id, {
+                "type": "commentary",
+                "ticket_id": ticket_ref.id,
+                "action_type": action_type,
+                "commentary": commentary,
+                "audio_url": audio_url
+            })
+        except Exception as e:
+            print(f"Error delivering commentary for ticket {ticket_ref.id}: {e}")
+            await self._fail(game_ref, ticket_ref, completed_at)
+
+    @staticmethod
+    async def _fail(game_ref, ticket_ref, completed_at: datetime):
+        """Mark the ticket failed so polls stop waiting on it"""
+        try:
+            # The ticket is written with the game's next flush
+            await game_store.flush(game_ref.id)
+            await asyncio.to_thread(ticket_ref.update, {
+                "status": CommentaryStatus.FAILED,
+                "completed_at": completed_at
+            })
+        except Exception as e:
+            print(f"Error marking commentary ticket {ticket_ref.id} failed: {e}")
+
+    async def reject(self, ticket_ref, game_id: str, action_type: str, created_at: datetime):
+        """
+        Fail the ticket of an action that was dropped before it was written,
+        so polls get an answer instead of a missing ticket
+        """
+        document = self.ticket_document(ticket_ref, game_id, action_type, created_at)
+        document.update({
+            "status": CommentaryStatus.FAILED,
+            "completed_at": datetime.utcnow()
+        })
+        try:
+            await asyncio.to_thread(ticket_ref.set, document)
+        except Exception as e:
+            print(f"Error failing commentary ticket {ticket_ref.id}: {e}")
+
+    @staticmethod
+    async def _wait(task: Optional[asyncio.Task]):
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def drain(self, timeout: float = 30.0):
+        """Wait for in-flight commentary, e.g. on shutdown"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+
+# Initialize the pipeline
+commentary_pipeline = CommentaryPipeline()
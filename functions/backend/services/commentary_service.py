@@ -1,8 +1,8 @@
 from typing import Dict, Optional, List
 import random
-import httpx
 import google.generativeai as genai
 from core.config import settings
+from services.player_names import UNKNOWN_PLAYER, player_names
 
 class CommentaryService:
     def __init__(self):
@@ -17,15 +17,12 @@ class CommentaryService:
         else:
             self.model = None
 
-    async def fetch_player_name(self, player_id: str) -> str:
-        """Fetch player name from API"""
+    async def fetch_player_name(self, player_id: str, game_id: Optional[str] = None) -> str:
+        """Fetch player name in-process, from the game's deck names or the player catalog"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{settings.BASE_API_URL}{settings.API_V1_STR}/players/{player_id}")
-                player_data = response.json()
-                return player_data['basic_info']['name']
+            return await player_names.resolve(player_id, game_id)
         except Exception:
-            return "Unknown Player"
+            return UNKNOWN_PLAYER
 
     def generate_template_commentary(
         self,
@@ -98,7 +95,8 @@ class CommentaryService:
                 )
 
             prompt = self.create_prompt(action_type, action_details, game_context, play_history)
-            response = self.model.generate_content(prompt)
+            # Async call so other requests and side work proceed meanwhile
+            response = await self.model.generate_content_async(prompt)
             return response.text
 
         except Exception as e:
@@ -119,7 +117,8 @@ class CommentaryService:
         history_context = ""
         if play_history:
             history_context = "Recent Game History:\n"
-            for play in play_history:  # Last 3 plays
+            # Most recent plays only, so the prompt stays the same size all game
+            for play in play_history[:settings.COMMENTARY_HISTORY_LIMIT]:
                 if 'commentary' in play:
                     history_context += f"- {play['commentary']}\n"
 
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, Set
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore import FieldFilter
+from core.config import settings
+from core.deadlines import deadline_timestamp
+from core.timer_wheel import TimerWheel
+from models.schemas.base import GameStatus
+from services.firebase import db
+
+# Subcollection of a game with one document per deadline acted on
+DEADLINE_CLAIMS = 'deadline_claims'
+
+
+class DeadlineScheduler:
+    """
+    Tracks the action deadline of every active game in one timer wheel.
+
+    GameStore reports each game's new deadline as actions apply; a single
+    ticker expires the wheel every DEADLINE_TICK_SECONDS and runs the timeout
+    handler for each game whose deadline passed. The handler is given the
+    deadline it fired for and must ignore games that have moved on since.
+
+    Every instance recovers every game in progress, so with more than one
+    instance several fire for the same deadline; the handler acts only
+    after winning claim() for it.
+    """
+
+    def __init__(self, tick: float = settings.DEADLINE_TICK_SECONDS):
+        self._tick = tick
+        self._wheel = TimerWheel(tick=tick, start=time.time())
+        self._handler: Optional[Callable[[str, float], Awaitable[None]]] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, game_id: str, deadline: Any):
+        """Set the game's deadline; None clears it"""
+        when = deadline_timestamp(deadline)
+        if when is None:
+            self._wheel.cancel(game_id)
+        else:
+            self._wheel.schedule(game_id, when)
+
+    @staticmethod
+    def claim(game_id: str, deadline: float) -> bool:
+        """
+        Claim a passed deadline for this instance. The claim document is
+        created only if absent, so exactly one caller gets True.
+        """
+        claim_ref = (
+            db.collection('games').document(game_id)
+            .collection(DEADLINE_CLAIMS).document(str(round(deadline * 1000)))
+        )
+        try:
+            claim_ref.create({
+                "deadline": deadline,
+                "claimed_at": datetime.now(timezone.utc)
+            })
+        except AlreadyExists:
+            return False
+        return True
+
+    def recover(self) -> int:
+        """Schedule the deadlines of the games in progress in Firestore"""
+        games = (
+            db.collection('games')
+            .where(filter=FieldFilter('status', '==', GameStatus.IN_PROGRESS.value))
+            .select(['action_deadline'])
+            .stream()
+        )
+        count = 0
+        for game in games:
+            self.schedule(game.id, game.to_dict().get('action_deadline'))
+            count += 1
+        return count
+
+    async def start(self, handler: Callable[[str, float], Awaitable[None]]):
+        """Recover pending deadlines, then start the ticker"""
+        self._handler = handler
+        recovered = await asyncio.to_thread(self.recover)
+        print(f"Deadline scheduler tracking {recovered} games in progress")
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._tick)
+            for game_id, deadline in self._wheel.advance(time.time()):
+                task = asyncio.create_task(self._fire(game_id, deadline))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _fire(self, game_id: str, deadline: float):
+        try:
+            await self._handler(game_id, deadline)
+        except Exception as e:
+            print(f"Error handling action timeout for game {game_id}: {e}")
+
+    async def stop(self):
+        """Stop the ticker and let running timeout handlers finish"""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        if self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+
+# Initialize the scheduler
+deadline_scheduler = DeadlineScheduler()
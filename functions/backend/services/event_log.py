@@ -0,0 +1,104 @@
+import copy
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from firebase_admin import firestore
+from google.cloud.firestore import DELETE_FIELD, FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+
+# Subcollections of a game: one document per event, and periodic full states
+EVENT_LOG = 'events'
+SNAPSHOTS = 'snapshots'
+
+
+def entry_id(seq: int) -> str:
+    """Zero-padded so documents sort by seq"""
+    return f"{seq:010d}"
+
+
+def new_event(
+    seq: int,
+    event_type: str,
+    at: datetime,
+    changes: Dict[str, Any],
+    user_id: Optional[str] = None,
+    data: Optional[Dict] = None
+) -> Dict:
+    """
+    A log event from a diff_fields() payload: the fields it sets, by dotted
+    path, and the fields it deletes
+    """
+    return {
+        "seq": seq,
+        "type": event_type,
+        "at": at,
+        "user_id": user_id,
+        "data": data or {},
+        "changes": {path: value for path, value in changes.items() if value is not DELETE_FIELD},
+        "removed": [path for path, value in changes.items() if value is DELETE_FIELD]
+    }
+
+
+def snapshot_document(seq: int, state: Dict) -> Dict:
+    """The full state as of event seq"""
+    return {"seq": seq, "state": state}
+
+
+def apply_event(state: Dict, event: Dict) -> Dict:
+    """Apply one event to state in place and return it"""
+    for path in event.get("removed", []):
+        parts = FieldPath.from_api_repr(path).parts
+        parent = state
+        for part in parts[:-1]:
+            parent = parent.get(part)
+            if not isinstance(parent, dict):
+                break
+        else:
+            parent.pop(parts[-1], None)
+
+    for path, value in event.get("changes", {}).items():
+        parts = FieldPath.from_api_repr(path).parts
+        parent = state
+        for part in parts[:-1]:
+            if not isinstance(parent.get(part), dict):
+                parent[part] = {}
+            parent = parent[part]
+        # Copied so later events never write into the event itself
+        parent[parts[-1]] = copy.deepcopy(value)
+    return state
+
+
+def fold(state: Dict, events: Iterable[Dict]) -> Dict:
+    """The state after applying events, in order, to a copy of state"""
+    state = copy.deepcopy(state)
+    for event in events:
+        apply_event(state, event)
+    return state
+
+
+def rebuild_state(game_ref, seq: Optional[int] = None) -> Tuple[Dict, int]:
+    """
+    The game's state as of event seq (the latest when None): the nearest
+    snapshot at or before it, plus the events since. Returns the state and
+    the seq of the last event applied; an empty state if there is no log.
+    """
+    snapshots = game_ref.collection(SNAPSHOTS)
+    if seq is not None:
+        snapshots = snapshots.where(filter=FieldFilter('seq', '<=', seq))
+    nearest = next(iter(
+        snapshots.order_by('seq', direction=firestore.Query.DESCENDING).limit(1).stream()
+    ), None)
+    base_seq, state = 0, {}
+    if nearest is not None:
+        snapshot = nearest.to_dict()
+        base_seq, state = snapshot["seq"], snapshot["state"]
+
+    events = game_ref.collection(EVENT_LOG).where(filter=FieldFilter('seq', '>', base_seq))
+    if seq is not None:
+        events = events.where(filter=FieldFilter('seq', '<=', seq))
+
+    last_seq = base_seq
+    for doc in events.order_by('seq').stream():
+        event = doc.to_dict()
+        apply_event(state, event)
+        last_seq = event["seq"]
+    return state, last_seq
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+
+class GameEventBus:
+    """
+    In-process fan-out of game events to live subscribers (the /events stream).
+
+    Each subscriber gets its own bounded queue. A subscriber that falls
+    max_queue events behind is dropped: its queue is cleared and closed, and
+    the client reconnects for a fresh snapshot instead of holding up the game.
+    A None in the queue means the stream is closed.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._max_queue = max_queue
+
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self._max_queue)
+        self._subscribers.setdefault(game_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(game_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[game_id]
+
+    def has_subscribers(self, game_id: str) -> bool:
+        """Lets publishers skip building events nobody will receive"""
+        return game_id in self._subscribers
+
+    def publish(self, game_id: str, event: Dict):
+        for queue in list(self._subscribers.get(game_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.unsubscribe(game_id, queue)
+                self._close(queue)
+
+    def close(self, game_id: Optional[str] = None):
+        """End the streams of one game, or of all games, e.g. on shutdown"""
+        game_ids = [game_id] if game_id is not None else list(self._subscribers)
+        for gid in game_ids:
+            for queue in self._subscribers.pop(gid, ()):
+                self._close(queue)
+
+    @staticmethod
+    def _close(queue: asyncio.Queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+
+# Initialize the event bus
+game_events = GameEventBus()
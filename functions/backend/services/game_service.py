@@ -1,10 +1,10 @@
 from typing import Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
 from models.schemas.game import BaseState, HitType, PlayResult, PlayState
 from models.schemas.base import GameStatus, HittingStyle
 from services.base_running import BaseRunningService
-from services.history_service import HistoryService
+from core.deadlines import action_deadline
 from services.player_service import get_player_data
 
 class GameService:
@@ -99,8 +99,6 @@ class GameService:
                         if game_state["team1"]["score"] > game_state["team2"]["score"]
                         else game_state["team2"]["user_id"]
                     )
-                    # Record complete game history
-                    await HistoryService.complete_game(game_state["game_id"], game_state)
 
         # Update bases if there was a hit
         if result.outcome != "out":
@@ -108,8 +106,7 @@ class GameService:
 
         # Set up next action
         game_state["last_action"] = None
-        game_state["action_deadline"] = (
-            current_time + timedelta(seconds=30)).isoformat()
+        game_state["action_deadline"] = action_deadline("pitch", current_time).isoformat()
 
         # Update batting order
         batting_team["lineup"]["current_batter_index"] = (
@@ -0,0 +1,536 @@
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from google.api_core.exceptions import FailedPrecondition
+from google.cloud.firestore import DELETE_FIELD
+from google.cloud.firestore_v1.field_path import FieldPath
+from core.config import settings
+from core.exceptions import GameNotFoundException
+from models.schemas.base import GameLogEventType, GameStatus
+from services.deadline_scheduler import deadline_scheduler
+from services.event_log import EVENT_LOG, SNAPSHOTS, apply_event, entry_id, new_event, snapshot_document
+from services.firebase import db
+from services.game_events import game_events
+from services.state_diff import diff_fields
+
+logger = logging.getLogger(__name__)
+
+# Counters an action advances rather than sets; renumbered when it is rebased
+SEQ_FIELDS = ('history_seq', 'event_seq')
+
+# Stands for a field a state doesn't have
+_MISSING = object()
+
+
+def _as_stored(value: Any) -> Any:
+    """
+    A copy of value as Firestore would hand it back: enums as their values
+    and naive datetimes as UTC, so memory reads match document reads.
+    """
+    if isinstance(value, dict):
+        return {key: _as_stored(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_as_stored(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _field(state: Dict, path: str) -> Any:
+    """The value at a dotted field path of state, _MISSING if there is none"""
+    value = state
+    for part in FieldPath.from_api_repr(path).parts:
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _action_event(log_event: Dict, history: List[Dict]) -> Dict:
+    """An action as pushed to live subscribers: its log event and new history"""
+    return {
+        "type": "action",
+        "seq": log_event["seq"],
+        "changes": log_event["changes"],
+        "removed": log_event["removed"],
+        "history": history
+    }
+
+
+class _StagedWrites:
+    """Records an action's other writes (history, tickets) for the next flush"""
+
+    def __init__(self, game_ref, ops: List[Tuple], game_state: Dict):
+        self._game_ref = game_ref
+        self._ops = ops
+        self._game_state = game_state
+        self.history: List[Dict] = []
+
+    def add_history(self, entry: Dict, ref=None):
+        """
+        Stage a game history entry, a new document unless ref is given. The
+        entry is numbered with the game's next history_seq.
+        """
+        self._game_state["history_seq"] = self._game_state.get("history_seq", 0) + 1
+        entry["seq"] = self._game_state["history_seq"]
+        if ref is None:
+            ref = self._game_ref.collection('history').document()
+        self.set(ref, entry)
+        self.history.append(entry)
+        return ref
+
+    def set(self, ref, data: Dict, merge: bool = False):
+        self._ops.append(('set', ref, data, merge))
+
+    def update(self, ref, data: Dict):
+        self._ops.append(('update', ref, data, None))
+
+
+class _PendingAction:
+    """
+    An action applied in memory and not yet written, kept as the outcome it
+    had: the fields it changed, what they held before, and its writes.
+    """
+
+    def __init__(self, event: Dict, outcome: Any, committed, rejected):
+        self.event = event
+        self.outcome = outcome
+        self.committed = committed
+        self.rejected = rejected
+        # Changed fields by dotted path, and their earlier values; seq counters aside
+        self.changes: Dict[str, Any] = {}
+        self.before: Dict[str, Any] = {}
+        # Its own writes (history, tickets), and its event log entry and snapshot
+        self.ops: List[Tuple] = []
+        self.log_ops: List[Tuple] = []
+        self.log_event: Optional[Dict] = None
+        self.history: List[Dict] = []
+        # The game's state once applied
+        self.state: Dict = {}
+
+    def record(self, before: Dict, changes: Dict):
+        self.changes = {path: value for path, value in changes.items() if path not in SEQ_FIELDS}
+        self.before = {path: _field(before, path) for path in self.changes}
+
+    @property
+    def after(self) -> Dict[str, Any]:
+        return {path: _MISSING if value is DELETE_FIELD else value
+                for path, value in self.changes.items()}
+
+
+class _ActiveGame:
+    """A game held in memory, next to what was last persisted of it"""
+
+    def __init__(self, game_ref, state: Dict, update_time):
+        self.ref = game_ref
+        self.state = state
+        self.persisted = state
+        self.update_time = update_time
+        # Actions applied since the last write, in order
+        self.pending: List[_PendingAction] = []
+        # Serializes actions on the game
+        self.lock = asyncio.Lock()
+        # Serializes flushes, which don't hold up actions
+        self.flushing = asyncio.Lock()
+        self.flush_task: Optional[asyncio.Task] = None
+        # Flushes failed in a row, for the retry backoff
+        self.failures = 0
+        self.last_access = time.monotonic()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.pending) or self.state is not self.persisted
+
+
+class GameStore:
+    """
+    Active games held in process memory, keyed by game_id.
+
+    Actions run against the in-memory state under a per-game lock, so they
+    need no document read. Their changes are written behind: the first change
+    after a flush schedules the next one within GAME_FLUSH_INTERVAL seconds,
+    and everything that happened meanwhile goes out as one batch holding the
+    changed fields (see diff_fields) and the actions' staged writes. A flush
+    that fails is retried, backing off up to GAME_FLUSH_MAX_BACKOFF seconds.
+    Completed games are evicted once flushed, idle ones after
+    GAME_IDLE_SECONDS; a miss reloads the game from Firestore.
+
+    Every action that changes the state is also appended to the game's event
+    log as a numbered event holding those changes (see services.event_log),
+    with a full snapshot every GAME_SNAPSHOT_INTERVAL events, in the same
+    batch as the document; the document is the log's latest projection.
+
+    Flushes are precondition-checked against the document's last update
+    time, so a change made elsewhere (another instance acting on the same
+    game) is never written over. The game is instead rebased: reloaded from
+    Firestore, with the outcomes of the actions still waiting to be written
+    applied again on top, in order and renumbered. An action is only kept
+    while the fields it changed still hold what it saw; otherwise it is
+    rejected: live subscribers get a "rejected" event and its rejected
+    callback runs. Subscribers then get a "snapshot" of the rebased state.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = settings.GAME_FLUSH_INTERVAL,
+        idle_seconds: float = settings.GAME_IDLE_SECONDS
+    ):
+        self._games: Dict[str, _ActiveGame] = {}
+        self._flush_interval = flush_interval
+        self._idle_seconds = idle_seconds
+        self._sweeper: Optional[asyncio.Task] = None
+        self._callbacks: Set[asyncio.Task] = set()
+
+    async def _load(self, game_ref) -> _ActiveGame:
+        game = self._games.get(game_ref.id)
+        if game is None:
+            snapshot = await asyncio.to_thread(game_ref.get)
+            if not snapshot.exists:
+                raise GameNotFoundException(game_ref.id)
+            # A concurrent miss may have loaded it first; keep that one
+            game = self._games.setdefault(
+                game_ref.id, _ActiveGame(game_ref, snapshot.to_dict(), snapshot.update_time))
+        game.last_access = time.monotonic()
+        return game
+
+    async def get(self, game_ref) -> Dict:
+        """
+        A copy of the game's current state. Games not in memory are read
+        from Firestore, and kept unless already completed.
+        """
+        game = self._games.get(game_ref.id)
+        if game is None:
+            snapshot = await asyncio.to_thread(game_ref.get)
+            if not snapshot.exists:
+                raise GameNotFoundException(game_ref.id)
+            game_state = snapshot.to_dict()
+            if game_state.get("status") == GameStatus.COMPLETED:
+                return game_state
+            game = self._games.setdefault(
+                game_ref.id, _ActiveGame(game_ref, game_state, snapshot.update_time))
+        game.last_access = time.monotonic()
+        return copy.deepcopy(game.state)
+
+    async def update(
+        self,
+        game_ref,
+        apply: Callable[[Dict], Awaitable[Any]],
+        stage: Optional[Callable[[Any, Dict, Any], None]] = None,
+        event: Optional[Dict] = None,
+        committed: Optional[Callable[[Dict, Any], Awaitable[None]]] = None,
+        rejected: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Tuple[Dict, Any]:
+        """
+        Run one action against the game.
+
+        apply(game_state) validates and mutates a copy of the state; if it
+        raises (HTTPExceptions for validation failures) nothing changes.
+        stage(writes, game_state, outcome) can then add the action's other
+        writes with writes.set()/writes.update(), and history entries with
+        writes.add_history(); they are flushed in the same batch as the state
+        change. event describes the action for the event log ("type",
+        "user_id" and "data" keys; an UPDATE otherwise). Live subscribers get
+        the changed fields and history entries right away.
+
+        apply runs once: should the write conflict, its outcome is applied
+        again, not apply itself. committed(state, outcome) runs in the
+        background once the action is written, with the state it produced;
+        rejected(outcome) if it is dropped instead (see the class docstring).
+
+        Returns the new state and whatever apply returned.
+        """
+        game = await self._load(game_ref)
+        async with game.lock:
+            if self._games.get(game_ref.id) is not game:
+                # Evicted while we waited; start over from a fresh load
+                return await self.update(game_ref, apply, stage, event, committed, rejected)
+
+            game_state = copy.deepcopy(game.state)
+            outcome = await apply(game_state)
+            action = _PendingAction(event or {}, outcome, committed, rejected)
+            writes = _StagedWrites(game_ref, action.ops, game_state)
+            if stage is not None:
+                stage(writes, game_state, outcome)
+            action.history = writes.history
+
+            new_state = _as_stored(game_state)
+            changes = diff_fields(game.state, new_state)
+            if not changes and not action.ops:
+                # Nothing to write
+                self._callback(committed, new_state, outcome)
+                return game_state, outcome
+            if changes:
+                action.record(game.state, changes)
+                action.log_event = self._log(
+                    game_ref, action.log_ops, game.state, new_state, changes, action.event)
+                if game_events.has_subscribers(game_ref.id):
+                    game_events.publish(game_ref.id, _action_event(action.log_event, action.history))
+            if (new_state.get("action_deadline") != game.state.get("action_deadline")
+                    or new_state.get("status") != game.state.get("status")):
+                self._schedule_deadline(game_ref.id, new_state)
+            # Replaced, never mutated, so a flush in progress sees a stable state
+            action.state = game.state = new_state
+            game.pending.append(action)
+
+            if game.flush_task is None:
+                game.flush_task = asyncio.create_task(self._flush_later(game))
+            return game_state, outcome
+
+    @staticmethod
+    def _schedule_deadline(game_id: str, state: Dict):
+        deadline_scheduler.schedule(
+            game_id,
+            state.get("action_deadline")
+            if state.get("status") == GameStatus.IN_PROGRESS else None
+        )
+
+    def _log(self, game_ref, ops: List[Tuple], before: Dict, after: Dict,
+             changes: Dict, event: Dict) -> Dict:
+        """Stage the next event of the game's log, and a snapshot when one is due"""
+        if "event_seq" not in before:
+            # Games from before the log start it with a snapshot of their state
+            ops.append(('set', game_ref.collection(SNAPSHOTS).document(entry_id(0)),
+                        snapshot_document(0, before), False))
+        seq = before.get("event_seq", 0) + 1
+        after["event_seq"] = changes["event_seq"] = seq
+
+        log_event = new_event(
+            seq,
+            _as_stored(event.get("type", GameLogEventType.UPDATE)),
+            datetime.now(timezone.utc),
+            changes,
+            event.get("user_id"),
+            _as_stored(event.get("data"))
+        )
+        ops.append(('set', game_ref.collection(EVENT_LOG).document(entry_id(seq)), log_event, False))
+        if seq % settings.GAME_SNAPSHOT_INTERVAL == 0:
+            ops.append(('set', game_ref.collection(SNAPSHOTS).document(entry_id(seq)),
+                        snapshot_document(seq, after), False))
+        return log_event
+
+    def _replay(self, game_ref, state: Dict, action: _PendingAction) -> Dict:
+        """Apply a pending action's outcome to state, renumbering its history and event"""
+        # As an event: the fields it sets, and those it removes
+        new_state = apply_event(copy.deepcopy(state), new_event(0, "", None, action.changes))
+        for entry in action.history:
+            new_state["history_seq"] = new_state.get("history_seq", 0) + 1
+            entry["seq"] = new_state["history_seq"]
+
+        action.log_ops = []
+        action.log_event = self._log(
+            game_ref, action.log_ops, state, new_state, diff_fields(state, new_state), action.event)
+        action.state = new_state
+        return new_state
+
+    def unwritten(self, game_id: str, ref) -> Optional[Dict]:
+        """A document an action set that is still waiting in the game's next write"""
+        game = self._games.get(game_id)
+        if game is None:
+            return None
+        for action in reversed(game.pending):
+            for op, staged_ref, data, merge in reversed(action.ops):
+                if op == 'set' and not merge and staged_ref.path == ref.path:
+                    return copy.deepcopy(data)
+        return None
+
+    async def flush_for(self, game_id: str, counter: str, after: int = 0,
+                        through: Optional[int] = None) -> bool:
+        """
+        Write the game now if a read needs it: if any of its counter's seqs
+        ("history_seq" or "event_seq") after `after`, up to `through` (no
+        limit when None), are still unwritten. Returns whether the game is
+        written that far.
+        """
+        game = self._games.get(game_id)
+        if game is None:
+            return True
+        written = game.persisted.get(counter, 0)
+        wanted = game.state.get(counter, 0) if through is None else min(through, game.state.get(counter, 0))
+        if max(after, written) >= wanted:
+            return True
+        return await self._flush(game)
+
+    async def flush(self, game_id: str) -> bool:
+        """Write the game's pending changes now, e.g. before writing next to them"""
+        game = self._games.get(game_id)
+        if game is None:
+            return True
+        return await self._flush(game)
+
+    async def _flush_later(self, game: _ActiveGame, delay: Optional[float] = None):
+        await asyncio.sleep(self._flush_interval if delay is None else delay)
+        # Changes from here on schedule the next flush
+        game.flush_task = None
+        if await self._flush(game) and game.state.get("status") == GameStatus.COMPLETED:
+            await self._evict(game)
+
+    async def _flush(self, game: _ActiveGame) -> bool:
+        """Persist the game's changes; returns whether it was clean afterwards"""
+        async with game.flushing:
+            for _ in range(settings.GAME_WRITE_MAX_ATTEMPTS):
+                if not game.dirty:
+                    game.failures = 0
+                    return True
+                state = game.state
+                pending = list(game.pending)
+
+                batch = db.batch()
+                updates = diff_fields(game.persisted, state)
+                if updates:
+                    option = db.write_option(last_update_time=game.update_time)
+                    batch.update(game.ref, updates, option=option)
+                for action in pending:
+                    for op, ref, data, merge in action.ops + action.log_ops:
+                        if op == 'set':
+                            batch.set(ref, data, merge=merge)
+                        else:
+                            batch.update(ref, data)
+
+                try:
+                    results = await asyncio.to_thread(batch.commit)
+                except FailedPrecondition:
+                    # Changed elsewhere: apply the pending outcomes to the stored game
+                    if not await self._rebase(game):
+                        return False
+                    continue
+                except Exception:
+                    logger.exception("Error flushing game %s", game.ref.id)
+                    break
+
+                if updates:
+                    game.update_time = results[0].update_time
+                game.persisted = state
+                game.failures = 0
+                del game.pending[:len(pending)]
+                for action in pending:
+                    self._callback(action.committed, action.state, action.outcome)
+                return not game.dirty
+
+            # Keep the pending actions, and try again later
+            self._retry_later(game)
+            return False
+
+    def _retry_later(self, game: _ActiveGame):
+        game.failures += 1
+        if game.flush_task is None and self._games.get(game.ref.id) is game:
+            delay = min(self._flush_interval * 2 ** game.failures, settings.GAME_FLUSH_MAX_BACKOFF)
+            logger.warning("Writing game %s failed %d times in a row, retrying in %.1fs",
+                           game.ref.id, game.failures, delay)
+            game.flush_task = asyncio.create_task(self._flush_later(game, delay))
+
+    async def _rebase(self, game: _ActiveGame) -> bool:
+        """
+        Reload the game after a conflicting write and apply the outcomes of
+        its pending actions again on top; returns whether there is still a
+        game to write.
+        """
+        async with game.lock:
+            snapshot = await asyncio.to_thread(game.ref.get)
+            if not snapshot.exists:
+                logger.warning("Game %s was deleted, dropping %d pending actions",
+                               game.ref.id, len(game.pending))
+                if self._games.get(game.ref.id) is game:
+                    del self._games[game.ref.id]
+                dropped, game.pending, game.persisted = game.pending, [], game.state
+                for action in dropped:
+                    self._reject(game, action, "The game was deleted")
+                game_events.close(game.ref.id)
+                return False
+
+            stored = snapshot.to_dict()
+            state, pending = stored, []
+            for action in game.pending:
+                current = {path: _field(state, path) for path in action.changes}
+                if not pending and action.changes and current == action.after:
+                    # Written by an earlier commit whose reply was lost
+                    self._callback(action.committed, action.state, action.outcome)
+                elif current == action.before:
+                    state = self._replay(game.ref, state, action)
+                    pending.append(action)
+                else:
+                    self._reject(game, action, "The game changed before this action was saved")
+            logger.warning("Game %s changed outside this process, kept %d of %d pending actions",
+                           game.ref.id, len(pending), len(game.pending))
+
+            game.persisted, game.update_time = stored, snapshot.update_time
+            game.state, game.pending = state, pending
+            self._schedule_deadline(game.ref.id, state)
+            # Subscribers saw the discarded state
+            game_events.publish(game.ref.id, {"type": "snapshot", "state": state})
+            return True
+
+    def _reject(self, game: _ActiveGame, action: _PendingAction, reason: str):
+        """Report an action that was applied in memory but will never be written"""
+        event_type = _as_stored(action.event.get("type", GameLogEventType.UPDATE))
+        logger.warning("Rejected a %s action on game %s: %s", event_type, game.ref.id, reason)
+        game_events.publish(game.ref.id, {
+            "type": "rejected",
+            "seq": action.log_event["seq"] if action.log_event else None,
+            "event_type": event_type,
+            "user_id": action.event.get("user_id"),
+            "reason": reason
+        })
+        self._callback(action.rejected, action.outcome)
+
+    def _callback(self, callback: Optional[Callable[..., Awaitable[None]]], *args):
+        if callback is not None:
+            task = asyncio.create_task(self._run_callback(callback, *args))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+
+    @staticmethod
+    async def _run_callback(callback: Callable[..., Awaitable[None]], *args):
+        try:
+            await callback(*args)
+        except Exception:
+            logger.exception("Error in game action callback %s", getattr(callback, "__name__", callback))
+
+    async def _evict(self, game: _ActiveGame):
+        # Flush outside the game lock, which a conflicting flush needs to rebase
+        if await self._flush(game):
+            async with game.lock:
+                if not game.dirty and self._games.get(game.ref.id) is game:
+                    del self._games[game.ref.id]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._idle_seconds / 4)
+            cutoff = time.monotonic() - self._idle_seconds
+            for game in list(self._games.values()):
+                if game.last_access < cutoff:
+                    await self._evict(game)
+
+    def start(self):
+        """Start evicting idle games in the background"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the sweeper and flush every held game, e.g. on shutdown, then
+        wait for the callbacks of the actions written
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for game in list(self._games.values()):
+            if game.flush_task is not None:
+                game.flush_task.cancel()
+                game.flush_task = None
+            await self._flush(game)
+            # No retries once shutting down
+            if game.flush_task is not None:
+                game.flush_task.cancel()
+                game.flush_task = None
+        if self._callbacks:
+            await asyncio.wait(set(self._callbacks))
+
+
+# Initialize the store
+game_store = GameStore()
@@ -0,0 +1,165 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from core.config import settings
+from services.player_matrix import AbilityMatrix
+
+PITCHING_ABILITIES = ['control', 'velocity', 'stamina', 'effectiveness']
+BATTING_ABILITIES = ['contact', 'power', 'discipline', 'speed']
+
+
+def deck_strength(abilities: AbilityMatrix, deck: Dict[str, List[str]]) -> float:
+    """
+    A deck's overall rating on the 0-100 ability scale: its pitchers'
+    pitching abilities and everyone else's batting abilities, averaged.
+    NaN when none of the players are in the catalog.
+    """
+    pitching = abilities.mean(deck.get('pitchers', []), PITCHING_ABILITIES)
+    others = [player_id for position, player_ids in deck.items()
+              if position != 'pitchers' for player_id in player_ids]
+    batting = abilities.mean(others, BATTING_ABILITIES)
+    parts = [value for value in (pitching, batting) if not math.isnan(value)]
+    return sum(parts) / len(parts) if parts else float('nan')
+
+
+class MatchTicket:
+    """A player waiting for an opponent; game_id is set once they are paired"""
+
+    def __init__(self, user_id: str, deck: Any, strength: float, bucket: int, now: float):
+        self.user_id = user_id
+        self.deck = deck
+        self.strength = strength
+        self.bucket = bucket
+        self.seen_at = now
+        self.game_id: Optional[str] = None
+
+
+class MatchmakingQueue:
+    """
+    In-memory FIFO matchmaking, bucketed by deck strength.
+
+    Each bucket is an insertion-ordered dict of waiting tickets, so joining,
+    leaving and taking the longest-waiting player are O(1). A player is
+    paired with whoever has waited longest in their own bucket, else in a
+    neighbouring one, and otherwise waits to be picked. A bucket width of
+    0 puts everyone in one queue.
+
+    Waiting players keep their ticket alive by polling; one not seen for
+    ttl seconds is dropped when the queue reaches it. Paired players'
+    tickets are held until polled, or for ttl seconds.
+    """
+
+    def __init__(
+        self,
+        bucket_width: float = settings.MATCHMAKING_BUCKET_WIDTH,
+        ttl: float = settings.MATCHMAKING_TICKET_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._bucket_width = bucket_width
+        self._ttl = ttl
+        self._clock = clock
+        self._buckets: Dict[int, "OrderedDict[str, MatchTicket]"] = {}
+        self._waiting: Dict[str, MatchTicket] = {}
+        # Paired tickets in pairing order, until their player polls
+        self._paired: "OrderedDict[str, MatchTicket]" = OrderedDict()
+
+    def bucket_of(self, strength: float) -> int:
+        if self._bucket_width <= 0 or math.isnan(strength):
+            return 0
+        return int(strength // self._bucket_width)
+
+    def join(self, user_id: str, deck: Any, strength: float) -> Optional[MatchTicket]:
+        """
+        Pair user_id with a waiting player and return that player's ticket;
+        or, with nobody to pair with, queue user_id and return None.
+        """
+        now = self._clock()
+        ticket = self._waiting.get(user_id)
+        if ticket is not None and now - ticket.seen_at < self._ttl:
+            # Already waiting
+            ticket.seen_at = now
+            return None
+        self.leave(user_id)
+
+        bucket = self.bucket_of(strength)
+        for candidate in (bucket, bucket - 1, bucket + 1):
+            opponent = self._take(candidate, now)
+            if opponent is not None:
+                return opponent
+
+        ticket = MatchTicket(user_id, deck, strength, bucket, now)
+        self._waiting[user_id] = ticket
+        self._buckets.setdefault(bucket, OrderedDict())[user_id] = ticket
+        return None
+
+    def _take(self, bucket: int, now: float) -> Optional[MatchTicket]:
+        """Remove and return the longest-waiting live ticket of a bucket"""
+        queue = self._buckets.get(bucket)
+        while queue:
+            user_id, ticket = queue.popitem(last=False)
+            del self._waiting[user_id]
+            if now - ticket.seen_at < self._ttl:
+                break
+        else:
+            ticket = None
+        if queue is not None and not queue:
+            del self._buckets[bucket]
+        return ticket
+
+    def requeue(self, ticket: MatchTicket):
+        """Put a ticket taken by join() back at the front, e.g. when starting the game failed"""
+        self._waiting[ticket.user_id] = ticket
+        queue = self._buckets.setdefault(ticket.bucket, OrderedDict())
+        queue[ticket.user_id] = ticket
+        queue.move_to_end(ticket.user_id, last=False)
+
+    def complete(self, ticket: MatchTicket, game_id: str):
+        """Record the game a ticket taken by join() was paired into"""
+        ticket.game_id = game_id
+        ticket.seen_at = self._clock()
+        self._paired.pop(ticket.user_id, None)
+        self._paired[ticket.user_id] = ticket
+        # Forget pairings nobody came back for
+        while self._paired:
+            oldest = next(iter(self._paired.values()))
+            if ticket.seen_at - oldest.seen_at < self._ttl:
+                break
+            self._paired.popitem(last=False)
+
+    def poll(self, user_id: str) -> Optional[MatchTicket]:
+        """
+        The player's ticket: paired ones (with game_id) are handed over once,
+        waiting ones are kept alive. None when the player isn't queued.
+        """
+        ticket = self._paired.pop(user_id, None)
+        if ticket is not None:
+            return ticket
+        ticket = self._waiting.get(user_id)
+        if ticket is not None:
+            now = self._clock()
+            if now - ticket.seen_at >= self._ttl:
+                self.leave(user_id)
+                return None
+            ticket.seen_at = now
+        return ticket
+
+    def leave(self, user_id: str) -> bool:
+        """Take the player out of the queue; returns whether they were in it"""
+        self._paired.pop(user_id, None)
+        ticket = self._waiting.pop(user_id, None)
+        if ticket is None:
+            return False
+        queue = self._buckets.get(ticket.bucket)
+        if queue is not None:
+            queue.pop(user_id, None)
+            if not queue:
+                del self._buckets[ticket.bucket]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+
+# Initialize the queue
+matchmaking = MatchmakingQueue()
@@ -0,0 +1,21 @@
+import base64
+import json
+from typing import Dict
+
+
+def encode_cursor(position: Dict) -> str:
+    """Encode a query position as an opaque, URL-safe cursor token"""
+    raw = json.dumps(position, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Dict:
+    """Decode a cursor token produced by encode_cursor"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
@@ -0,0 +1,168 @@
+import threading
+import time
+from functools import cached_property
+from typing import Dict, List, Optional
+from core.config import settings
+from services.firebase import db
+from services.player_index import PlayerIndex
+from services.player_matrix import AbilityMatrix
+from services.player_payloads import PreparedPayload, serialize_players
+from services.player_search import PlayerSearchIndex
+
+# Documents in the players collection that are not player cards
+METADATA_DOC_IDS = {'metadata', 'role_metadata'}
+
+
+class CatalogSnapshot:
+    """
+    Read-only view of the whole player catalog at a single data_version.
+    Player dicts are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, version: Optional[str], players: Dict[str, Dict]):
+        self.version = version
+        self.players = players
+        # Same order Firestore returns documents in (document ID ascending)
+        self.player_ids: List[str] = sorted(players)
+        self._deck_payloads: Dict[Optional[str], PreparedPayload] = {}
+        self._payload_lock = threading.Lock()
+
+    def get(self, player_id: str) -> Optional[Dict]:
+        return self.players.get(str(player_id))
+
+    def ordered(self) -> List[Dict]:
+        """All players in catalog order"""
+        return [self.players[player_id] for player_id in self.player_ids]
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @cached_property
+    def index(self) -> PlayerIndex:
+        """Bitmap index over this snapshot, built on first use"""
+        return PlayerIndex(self.player_ids, self.players)
+
+    @cached_property
+    def abilities(self) -> AbilityMatrix:
+        """Columnar ability matrix over this snapshot, built on first use"""
+        return AbilityMatrix(self.player_ids, self.players)
+
+    @cached_property
+    def search(self) -> PlayerSearchIndex:
+        """Name search index over this snapshot, built on first use"""
+        return PlayerSearchIndex(self.player_ids, self.players)
+
+    def deck_selection_players(self, position: Optional[str] = None) -> List[Dict]:
+        """Players eligible for one position, or every player when position is None"""
+        if position is None:
+            return self.ordered()
+        bitmap = self.index.posting('position', position)
+        return [self.players[self.player_ids[i]] for i in self.index.positions(bitmap)]
+
+    def deck_selection_payload(self, position: Optional[str] = None) -> PreparedPayload:
+        """
+        Serialized deck-selection list for one position, or every player when
+        position is None. Built once per snapshot for each known position.
+        """
+        payload = self._deck_payloads.get(position)
+        if payload is not None:
+            return payload
+
+        players = self.deck_selection_players(position)
+        payload = serialize_players(players)
+
+        # Only cache positions that exist, so arbitrary query values cannot grow the cache
+        if position is None or players:
+            with self._payload_lock:
+                payload = self._deck_payloads.setdefault(position, payload)
+        return payload
+
+
+class PlayerCatalog:
+    """
+    In-process cache of the players collection.
+
+    The catalog is loaded once and kept until the `data_version` of the
+    `players/metadata` document changes. The version is re-checked at most
+    once every PLAYER_CATALOG_REFRESH_SECONDS, so steady-state reads never
+    touch Firestore.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and time.monotonic() - self._checked_at < self.refresh_seconds
+        )
+
+    @staticmethod
+    def _fetch_version() -> Optional[str]:
+        """Read the current data_version from players/metadata"""
+        doc = db.collection('players').document('metadata').get()
+        if not doc.exists:
+            return None
+        version = doc.to_dict().get('data_version')
+        return str(version) if version is not None else None
+
+    @staticmethod
+    def _load(version: Optional[str]) -> CatalogSnapshot:
+        """Stream the players collection into a new snapshot"""
+        players = {}
+        for doc in db.collection('players').stream():
+            if doc.id in METADATA_DOC_IDS:
+                continue
+            player_data = doc.to_dict()
+            if not player_data or 'player_id' not in player_data:
+                continue
+            # Ensure player_id is string
+            player_data['player_id'] = str(player_data['player_id'])
+            players[player_data['player_id']] = player_data
+        return CatalogSnapshot(version, players)
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Get the current catalog, reloading it if the data version changed"""
+        if self._is_fresh():
+            return self._snapshot
+
+        with self._lock:
+            if self._is_fresh():
+                return self._snapshot
+
+            try:
+                version = self._fetch_version()
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                # Keep serving the last good catalog if metadata is unreachable
+                print(f"Error checking player catalog version: {e}")
+                self._checked_at = time.monotonic()
+                return self._snapshot
+
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._load(version)
+                print(
+                    f"Player catalog loaded: {len(self._snapshot)} players "
+                    f"(data_version={version})"
+                )
+
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def get(self, player_id: str) -> Optional[Dict]:
+        """Get a single player by ID, or None if unknown"""
+        return self.snapshot().get(player_id)
+
+    def invalidate(self):
+        """Force the next read to reload the catalog"""
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
+
+
+# Initialize the catalog
+player_catalog = PlayerCatalog(settings.PLAYER_CATALOG_REFRESH_SECONDS)
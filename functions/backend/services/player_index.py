@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Filterable fields, mapped to their document fields
+INDEX_FIELDS = {
+    'role': 'role_info.primary_role',
+    'team': 'basic_info.team',
+    'position': 'basic_info.primary_position',
+    'bats': 'basic_info.bats',
+    'throws': 'basic_info.throws',
+    'pitching_style': 'role_info.pitching_styles',
+    'hitting_style': 'role_info.hitting_styles',
+}
+
+LIST_FIELDS = {'pitching_style', 'hitting_style'}
+
+
+def get_field(player: Dict, field_path: str):
+    """Resolve a dotted field path against a player document"""
+    value = player
+    for key in field_path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def popcount(bitmap: int) -> int:
+    """Number of players in a bitmap"""
+    return bin(bitmap).count('1')
+
+
+class PlayerIndex:
+    """
+    Inverted index over the player catalog.
+
+    Every (field, value) pair has a posting list stored as a bitmap, where
+    bit N is set when the player at catalog position N has that value.
+    Filters are resolved with bitwise OR within a field and AND across
+    fields, and facet counts are popcounts of the intersected bitmaps.
+    """
+
+    def __init__(self, player_ids: List[str], players: Dict[str, Dict]):
+        self.size = len(player_ids)
+        self.all = (1 << self.size) - 1
+        self.postings: Dict[str, Dict[str, int]] = {field: {} for field in INDEX_FIELDS}
+
+        for position, player_id in enumerate(player_ids):
+            bit = 1 << position
+            for field, path in INDEX_FIELDS.items():
+                values = get_field(players[player_id], path)
+                # List fields post the player under every value
+                if not isinstance(values, list):
+                    values = [values]
+                postings = self.postings[field]
+                for value in values:
+                    if value is None:
+                        continue
+                    postings[value] = postings.get(value, 0) | bit
+
+    def posting(self, field: str, value: str) -> int:
+        """Bitmap of players with the given value, 0 if there are none"""
+        if field not in self.postings:
+            raise ValueError(f"Unknown filter field: {field}")
+        return self.postings[field].get(value, 0)
+
+    def match(self, filters: Dict[str, Iterable[str]]) -> int:
+        """Bitmap of players matching any of the values of every field"""
+        bitmap = self.all
+        for field, values in filters.items():
+            field_bitmap = 0
+            for value in values:
+                field_bitmap |= self.posting(field, value)
+            bitmap &= field_bitmap
+            if not bitmap:
+                break
+        return bitmap
+
+    @staticmethod
+    def positions(bitmap: int, start: int = 0) -> Iterator[int]:
+        """Catalog positions set in the bitmap, in ascending order from start"""
+        bitmap >>= start
+        while bitmap:
+            lowest = bitmap & -bitmap
+            yield start + lowest.bit_length() - 1
+            bitmap ^= lowest
+
+    def facets(
+        self,
+        bitmap: int,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """Count matching players per value of each field"""
+        counts = {}
+        for field in fields or INDEX_FIELDS:
+            field_counts = {}
+            for value, posting in self.postings[field].items():
+                count = popcount(bitmap & posting)
+                if count:
+                    field_counts[value] = count
+            counts[field] = field_counts
+        return counts
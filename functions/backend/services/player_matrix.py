@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# One matrix column per ability, mapped to its document field
+ABILITY_COLUMNS = {
+    'contact': 'batting_abilities.contact',
+    'power': 'batting_abilities.power',
+    'discipline': 'batting_abilities.discipline',
+    'speed': 'batting_abilities.speed',
+    'control': 'pitching_abilities.control',
+    'velocity': 'pitching_abilities.velocity',
+    'stamina': 'pitching_abilities.stamina',
+    'effectiveness': 'pitching_abilities.effectiveness',
+    'defense': 'fielding_abilities.defense',
+    'range': 'fielding_abilities.range',
+    'reliability': 'fielding_abilities.reliability',
+}
+
+
+def bitmap_to_mask(bitmap: int, size: int) -> np.ndarray:
+    """Convert a PlayerIndex bitmap to a boolean row mask"""
+    raw = np.frombuffer(bitmap.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, count=size, bitorder='little').astype(bool)
+
+
+def mask_to_bitmap(mask: np.ndarray) -> int:
+    """Convert a boolean row mask back to a PlayerIndex bitmap"""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class AbilityMatrix:
+    """
+    Columnar copy of every player's abilities: a float32 matrix with one row
+    per catalog position and one column per ability. Range filters are
+    vectorized masks and sorting uses argpartition, so no card is touched.
+    """
+
+    def __init__(self, player_ids: List[str], players: Dict[str, Dict]):
+        self.columns = list(ABILITY_COLUMNS)
+        self.values = np.full((len(player_ids), len(self.columns)), np.nan, dtype=np.float32)
+        self.rows = {player_id: row for row, player_id in enumerate(player_ids)}
+
+        for row, player_id in enumerate(player_ids):
+            player = players[player_id]
+            for col, path in enumerate(ABILITY_COLUMNS.values()):
+                group, ability = path.split('.')
+                value = player.get(group, {}).get(ability)
+                if value is not None:
+                    self.values[row, col] = value
+
+    def column(self, ability: str) -> np.ndarray:
+        """All players' values for one ability"""
+        if ability not in ABILITY_COLUMNS:
+            raise ValueError(f"Unknown ability: {ability}")
+        return self.values[:, self.columns.index(ability)]
+
+    def mean(self, player_ids: List[str], abilities: List[str]) -> float:
+        """Average of the given abilities over the given players, ignoring gaps"""
+        rows = [self.rows[player_id] for player_id in player_ids if player_id in self.rows]
+        if not rows:
+            return float('nan')
+        columns = [self.columns.index(ability) for ability in abilities]
+        block = self.values[np.ix_(rows, columns)]
+        if np.isnan(block).all():
+            return float('nan')
+        return float(np.nanmean(block))
+
+    def mask(
+        self,
+        ranges: Dict[str, Tuple[Optional[float], Optional[float]]],
+        base: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Rows whose abilities fall within every inclusive (min, max) range"""
+        mask = np.ones(len(self.values), dtype=bool) if base is None else base.copy()
+        for ability, (low, high) in ranges.items():
+            column = self.column(ability)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return mask
+
+    def rank(self, mask: np.ndarray, sort: str, k: int) -> np.ndarray:
+        """
+        Rows of the top k masked players ordered by `sort`, an ability name
+        prefixed with '-' for descending order. Ties are broken by catalog
+        position, so consecutive pages of the same ranking never overlap.
+        """
+        descending = sort.startswith('-')
+        keys = self.column(sort.lstrip('+-'))
+
+        rows = np.flatnonzero(mask)
+        keys = -keys[rows] if descending else keys[rows]
+        if k <= 0 or not len(rows):
+            return rows[:0]
+
+        if k < len(rows):
+            # Everything up to and including the kth key, ties included
+            kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+            candidates = np.flatnonzero(keys <= kth)
+        else:
+            candidates = np.arange(len(rows))
+
+        order = candidates[np.lexsort((rows[candidates], keys[candidates]))]
+        return rows[order[:k]]
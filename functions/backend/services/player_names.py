@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from services.player_catalog import player_catalog
+
+UNKNOWN_PLAYER = "Unknown Player"
+
+# Deck fields holding player IDs
+DECK_FIELDS = ['catchers', 'pitchers', 'infielders', 'outfielders', 'hitters']
+
+
+class PlayerNameResolver:
+    """
+    Player names for commentary, read in-process from the player catalog.
+
+    Each game's deck players (17 per team) are resolved once when the game
+    is joined and kept per game, so lookups during play are dict reads.
+    Only the most recent max_games games are kept.
+    """
+
+    def __init__(self, max_games: int = 512):
+        self.max_games = max_games
+        self._games: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _catalog_name(player_id: str) -> Optional[str]:
+        try:
+            player_data = player_catalog.get(player_id)
+        except Exception as e:
+            print(f"Player catalog unavailable for name lookup: {e}")
+            return None
+        if player_data is None:
+            return None
+        return player_data.get('basic_info', {}).get('name')
+
+    def load_game(self, game_id: str, decks: Iterable[Dict]):
+        """Resolve and keep the names of every player in the game's decks"""
+        names = {}
+        for deck in decks:
+            for field in DECK_FIELDS:
+                for player_id in deck.get(field, []):
+                    name = self._catalog_name(str(player_id))
+                    if name:
+                        names[str(player_id)] = name
+
+        with self._lock:
+            self._games[game_id] = names
+            self._games.move_to_end(game_id)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+
+    def forget(self, game_id: str):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    async def resolve(self, player_id: str, game_id: Optional[str] = None) -> str:
+        """Player name, from the game's deck cache or the catalog, else 'Unknown Player'"""
+        player_id = str(player_id)
+        if game_id is not None:
+            with self._lock:
+                name = self._games.get(game_id, {}).get(player_id)
+            if name:
+                return name
+
+        # The catalog may need to check its version against Firestore
+        name = await asyncio.to_thread(self._catalog_name, player_id)
+        if name and game_id is not None:
+            with self._lock:
+                if game_id in self._games:
+                    self._games[game_id][player_id] = name
+        return name or UNKNOWN_PLAYER
+
+
+# Initialize the resolver
+player_names = PlayerNameResolver()
@@ -0,0 +1,66 @@
+import gzip
+import json
+from typing import Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+from models.schemas.player import PlayerCard
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+# Preference order when the client accepts several encodings
+SUPPORTED_ENCODINGS = ['br', 'gzip', 'identity'] if brotli else ['gzip', 'identity']
+
+
+class PreparedPayload:
+    """A JSON response body serialized once and stored in every supported encoding"""
+
+    def __init__(self, body: bytes):
+        self.bodies: Dict[str, bytes] = {'identity': body}
+        self.bodies['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli:
+            # Quality 11 is ~50x slower for a ~15% smaller full-catalog body
+            self.bodies['br'] = brotli.compress(body, quality=9)
+
+    def body(self, encoding: str) -> bytes:
+        return self.bodies[encoding]
+
+
+def serialize_players(players: List[Dict]) -> PreparedPayload:
+    """Validate and serialize players exactly as response_model=List[PlayerCard] would"""
+    content = jsonable_encoder([PlayerCard(**player) for player in players])
+    body = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(',', ':')
+    ).encode('utf-8')
+    return PreparedPayload(body)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> str:
+    """Pick the preferred supported encoding allowed by an Accept-Encoding header"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.lower()] = quality
+
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding == 'identity':
+            return encoding
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0:
+            return encoding
+    return 'identity'
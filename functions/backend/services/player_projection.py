@@ -0,0 +1,91 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple, Type
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, create_model
+from models.schemas.player import PlayerCard, PlayerList
+
+
+def parse_fields(raw: str) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated `fields=` value of PlayerCard field paths, such
+    as "basic_info.name,basic_info.team,role_info". player_id is always
+    included. Returns a sorted, de-duplicated tuple usable as a cache key.
+    """
+    paths = {'player_id'}
+    for path in raw.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        parts = path.split('.')
+        if len(parts) > 2:
+            raise ValueError(f"Unknown field: {path}")
+        top = PlayerCard.model_fields.get(parts[0])
+        if top is None:
+            raise ValueError(f"Unknown field: {path}")
+        if len(parts) == 2:
+            nested = top.annotation
+            if not (isinstance(nested, type) and issubclass(nested, BaseModel)) \
+                    or parts[1] not in nested.model_fields:
+                raise ValueError(f"Unknown field: {path}")
+        paths.add(path)
+
+    # A whole block makes its individual sub-fields redundant
+    return tuple(sorted(
+        path for path in paths
+        if '.' not in path or path.split('.')[0] not in paths
+    ))
+
+
+@lru_cache(maxsize=128)
+def projected_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """PlayerCard model restricted to the given field paths, generated once per projection"""
+    nested: Dict[str, List[str]] = {}
+    for path in fields:
+        top, _, sub = path.partition('.')
+        nested.setdefault(top, [])
+        if sub:
+            nested[top].append(sub)
+
+    definitions = {}
+    for top, subs in nested.items():
+        info = PlayerCard.model_fields[top]
+        if not subs:
+            definitions[top] = (info.annotation, info)
+            continue
+        block = info.annotation
+        sub_model = create_model(
+            f"{block.__name__}Projection",
+            **{sub: (block.model_fields[sub].annotation, block.model_fields[sub]) for sub in subs}
+        )
+        definitions[top] = (sub_model, ...)
+
+    return create_model('PlayerCardProjection', **definitions)
+
+
+@lru_cache(maxsize=128)
+def projected_list_model(fields: Tuple[str, ...]) -> Type[PlayerList]:
+    """PlayerList whose players use the projected PlayerCard model"""
+    return create_model(
+        'PlayerListProjection',
+        __base__=PlayerList,
+        players=(List[projected_model(fields)], ...)
+    )
+
+
+def project(player: Dict, fields: Tuple[str, ...]) -> Dict:
+    """Copy only the projected field paths out of a player document"""
+    projected = {}
+    for path in fields:
+        top, _, sub = path.partition('.')
+        if not sub:
+            projected[top] = player.get(top)
+        else:
+            projected.setdefault(top, {})[sub] = (player.get(top) or {}).get(sub)
+    return projected
+
+
+def project_players(players: List[Dict], fields: Tuple[str, ...]) -> List[Dict]:
+    """Validate and encode players through the projected response model"""
+    model = projected_model(fields)
+    return [jsonable_encoder(model(**project(player, fields))) for player in players]
+
@@ -0,0 +1,105 @@
+import bisect
+import heapq
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize name the same way as the player card builder
+    (normalize_name in Custom Player Stats Data/player_data_format.py):
+    1. Removing special characters (*, #)
+    2. Converting accented characters to non-accented
+    3. Converting to lowercase
+    4. Stripping whitespace
+    """
+    # Remove special indicators
+    name = name.replace('*', '').replace('#', '')
+
+    # Normalize Unicode characters (convert accented to non-accented)
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+
+    # Convert to lowercase and strip whitespace
+    return name.lower().strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded so word starts count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    Name index over the player catalog for search and autocomplete.
+
+    Candidates come from a sorted word list (prefix lookups via bisect) and
+    a trigram posting list (fuzzy matches). They are ranked by match tier
+    (exact name, name prefix, word prefix, fuzzy), then trigram similarity.
+    """
+
+    def __init__(self, player_ids: List[str], players: Dict[str, Dict]):
+        self.names: List[str] = []
+        self.name_trigrams: List[Set[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+        words: List[Tuple[str, int]] = []
+
+        for position, player_id in enumerate(player_ids):
+            name = normalize_name(players[player_id].get('basic_info', {}).get('name', ''))
+            grams = trigrams(name)
+            self.names.append(name)
+            self.name_trigrams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+            words.extend((word, position) for word in name.split())
+
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_positions = [position for _, position in words]
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Positions of players with any name word starting with prefix"""
+        start = bisect.bisect_left(self.words, prefix)
+        end = bisect.bisect_left(self.words, prefix + '\uffff')
+        return set(self.word_positions[start:end])
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Top matches as (catalog position, score) pairs, best first"""
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        query_words = query.split()
+        # Every query word must prefix some word of the name
+        prefix_hits = self._prefix_matches(query_words[0])
+        for word in query_words[1:]:
+            prefix_hits &= self._prefix_matches(word)
+
+        query_grams = trigrams(query)
+        shared = Counter()
+        if len(query) >= 3:
+            for gram in query_grams:
+                for position in self.postings.get(gram, ()):
+                    shared[position] += 1
+        # Fuzzy matches must share at least half of the query's trigrams
+        threshold = len(query_grams) / 2
+        candidates = prefix_hits | {p for p, count in shared.items() if count >= threshold}
+
+        def score(position: int) -> float:
+            name = self.names[position]
+            if name == query:
+                tier = 3
+            elif name.startswith(query):
+                tier = 2
+            elif position in prefix_hits:
+                tier = 1
+            else:
+                tier = 0
+            common = len(query_grams & self.name_trigrams[position])
+            similarity = common / (len(query_grams) + len(self.name_trigrams[position]) - common)
+            return tier + similarity
+
+        scored = ((score(position), -position) for position in candidates)
+        return [(-neg_position, round(value, 4)) for value, neg_position in heapq.nlargest(limit, scored)]
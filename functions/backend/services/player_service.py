@@ -1,13 +1,12 @@
 from typing import Dict
-from services.firebase import db
+from services.player_catalog import player_catalog
 
 async def get_player_data(player_id: str) -> Dict:
-    """Get player data from Firestore"""
+    """Get player data from the in-process player catalog"""
     try:
-        doc_ref = db.collection('players').document(str(player_id))
-        doc = doc_ref.get()
-        if not doc.exists:
+        player_data = player_catalog.get(player_id)
+        if player_data is None:
             raise ValueError(f"Player {player_id} not found")
-        return doc.to_dict()
+        return player_data
     except Exception as e:
-        raise Exception(f"Error getting player data: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Error getting player data: {str(e)}")
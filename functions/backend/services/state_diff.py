@@ -0,0 +1,37 @@
+from typing import Any, Dict, Tuple
+from google.cloud.firestore import DELETE_FIELD
+from google.cloud.firestore_v1.field_path import FieldPath
+
+
+def diff_fields(before: Dict, after: Dict) -> Dict[str, Any]:
+    """
+    Changes between two versions of a document as an update() payload of
+    dotted field paths, e.g. {"team1.score": 2, "bases.first": "123"}.
+
+    Maps are compared key by key; any other value, lists included, is
+    replaced whole when it differs, as is a map that becomes empty. Keys
+    missing from after are deleted.
+    Path segments that aren't simple identifiers are backtick-quoted.
+    """
+    updates: Dict[str, Any] = {}
+    _diff(before, after, (), updates)
+    return updates
+
+
+def _diff(before: Dict, after: Dict, path: Tuple[str, ...], updates: Dict[str, Any]):
+    for key, value in after.items():
+        field = path + (str(key),)
+        if key not in before:
+            updates[FieldPath(*field).to_api_repr()] = value
+            continue
+        old = before[key]
+        if isinstance(old, dict) and isinstance(value, dict) and value:
+            _diff(old, value, field, updates)
+        elif old != value or isinstance(old, bool) != isinstance(value, bool):
+            # True == 1 in Python, but Firestore stores them differently
+            updates[FieldPath(*field).to_api_repr()] = value
+
+    for key in before:
+        if key not in after:
+            updates[FieldPath(*(path + (str(key),))).to_api_repr()] = DELETE_FIELD
+
@@ -0,0 +1,26 @@
+import os
+import sys
+import types
+import pytest
+from core.config import settings
+from fake_firestore import FakeFirestore
+
+# services.firebase connects on import. Without credentials the unit tests
+# still import it, getting an in-memory database instead; tests against the
+# live project (test_players, test_auth) need real credentials either way.
+if 'services.firebase' not in sys.modules and not os.path.isfile(settings.FIREBASE_CREDENTIALS_PATH):
+    firebase = types.ModuleType('services.firebase')
+    firebase.db = FakeFirestore()
+    firebase.bucket = None
+    sys.modules['services.firebase'] = firebase
+
+    # The text-to-speech client needs credentials to be built; tests that
+    # produce commentary replace the audio step
+    text_to_speech = types.ModuleType('services.text_to_speech_service')
+    text_to_speech.audio_commentary_service = None
+    sys.modules.setdefault('services.text_to_speech_service', text_to_speech)
+
+
+@pytest.fixture
+def fake_db():
+    return FakeFirestore()
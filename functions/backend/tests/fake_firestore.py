@@ -0,0 +1,379 @@
+"""
+In-memory stand-in for the parts of the Firestore client the backend uses:
+document and collection references, queries (where, order_by, limit,
+start_after, select, count), write batches with update-time preconditions,
+create() and get_all(). Values are stored as Firestore would hand them back
+(str enums as strings, naive datetimes as UTC).
+"""
+import copy
+import itertools
+from datetime import datetime, timezone
+from enum import Enum
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, InvalidArgument, NotFound
+from google.cloud.firestore import DELETE_FIELD
+from google.cloud.firestore_v1.field_path import FieldPath
+
+DOCUMENT_ID = FieldPath.document_id()
+
+
+def _stored(value):
+    if isinstance(value, dict):
+        return {key: _stored(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_stored(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return copy.deepcopy(value)
+
+
+def _get(data, field_path):
+    value = data
+    for part in FieldPath.from_api_repr(field_path).parts:
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(field_path)
+        value = value[part]
+    return value
+
+
+def _apply_updates(data, updates):
+    for path, value in updates.items():
+        parts = FieldPath.from_api_repr(path).parts
+        parent = data
+        for part in parts[:-1]:
+            if not isinstance(parent.get(part), dict):
+                parent[part] = {}
+            parent = parent[part]
+        if value is DELETE_FIELD:
+            parent.pop(parts[-1], None)
+        else:
+            parent[parts[-1]] = _stored(value)
+
+
+def _merge(target, data):
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        elif value is DELETE_FIELD:
+            target.pop(key, None)
+        else:
+            target[key] = _stored(value)
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data, update_time):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.update_time = update_time
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+    def get(self, field_path):
+        return _get(self._data, field_path)
+
+
+class FakeWriteOption:
+    def __init__(self, last_update_time):
+        self.last_update_time = last_update_time
+
+
+class FakeDocumentReference:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    @property
+    def parent(self):
+        return FakeCollectionReference(self._db, self.path.rsplit('/', 1)[0])
+
+    def collection(self, name):
+        return FakeCollectionReference(self._db, f"{self.path}/{name}")
+
+    def get(self, field_paths=None):
+        data, update_time = self._db.documents.get(self.path, (None, None))
+        self._db.reads += 1
+        return FakeSnapshot(self, copy.deepcopy(data), update_time)
+
+    def set(self, data, merge=False):
+        batch = self._db.batch()
+        batch.set(self, data, merge=merge)
+        return batch.commit()[0]
+
+    def update(self, data, option=None):
+        batch = self._db.batch()
+        batch.update(self, data, option=option)
+        return batch.commit()[0]
+
+    def create(self, data):
+        batch = self._db.batch()
+        batch.create(self, data)
+        return batch.commit()[0]
+
+    def delete(self):
+        self._db.documents.pop(self.path, None)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class FakeAggregation:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeCountQuery:
+    def __init__(self, query):
+        self._query = query
+
+    def get(self):
+        return [[FakeAggregation(len(self._query._matches()))]]
+
+
+class FakeQuery:
+    def __init__(self, db, path, filters=(), orders=(), limit=None, after=None, fields=None):
+        self._db = db
+        self._path = path
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._after = after
+        self._fields = fields
+
+    def _copy(self, **changes):
+        state = dict(filters=self._filters, orders=self._orders, limit=self._limit,
+                     after=self._after, fields=self._fields)
+        state.update(changes)
+        return FakeQuery(self._db, self._path, **state)
+
+    def where(self, filter):
+        return self._copy(filters=self._filters + (
+            (filter.field_path, filter.op_string, filter.value),))
+
+    def order_by(self, field_path, direction='ASCENDING'):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, values):
+        return self._copy(after=values)
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    def count(self):
+        return FakeCountQuery(self)
+
+    @staticmethod
+    def _value(doc_id, data, field_path):
+        if field_path == DOCUMENT_ID:
+            return doc_id
+        return _get(data, field_path)
+
+    @staticmethod
+    def _compare(value, op, target):
+        if isinstance(target, FakeDocumentReference):
+            target = target.id
+        if isinstance(target, list):
+            target = [t.id if isinstance(t, FakeDocumentReference) else t for t in target]
+        if op == '==':
+            return value == target
+        if op == '!=':
+            return value != target
+        if op == '<':
+            return value < target
+        if op == '<=':
+            return value <= target
+        if op == '>':
+            return value > target
+        if op == '>=':
+            return value >= target
+        if op == 'in':
+            return value in target
+        if op == 'not-in':
+            return value not in target
+        if op == 'array_contains':
+            return isinstance(value, list) and target in value
+        if op == 'array_contains_any':
+            return isinstance(value, list) and any(item in value for item in target)
+        raise ValueError(f"Unsupported operator {op}")
+
+    def _validate(self):
+        ops = [op for _, op, _ in self._filters]
+        if ops.count('array_contains_any') + ops.count('array_contains') > 1:
+            raise InvalidArgument("Only one array-contains or array-contains-any filter is allowed")
+        if 'not-in' in ops and ({'in', 'array_contains_any', '!='} & set(ops) or ops.count('not-in') > 1):
+            raise InvalidArgument("not-in cannot be combined with in, array-contains-any or !=")
+
+    def _matches(self):
+        self._validate()
+        prefix = self._path + '/'
+        rows = []
+        for path, (data, update_time) in self._db.documents.items():
+            if not path.startswith(prefix) or '/' in path[len(prefix):]:
+                continue
+            doc_id = path[len(prefix):]
+            try:
+                if not all(self._compare(self._value(doc_id, data, field), op, target)
+                           for field, op, target in self._filters):
+                    continue
+                keys = [self._value(doc_id, data, field) for field, _ in self._orders]
+            except KeyError:
+                # Documents without a filtered or ordered field are left out
+                continue
+            rows.append((keys, doc_id, path, data, update_time))
+
+        rows.sort(key=lambda row: row[1])
+        for position in reversed(range(len(self._orders))):
+            descending = self._orders[position][1] == 'DESCENDING'
+            rows.sort(key=lambda row: row[0][position], reverse=descending)
+
+        if self._after is not None:
+            after = [self._after.get(field) for field, _ in self._orders]
+            rows = [row for row in rows if self._is_after(row[0], after)]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return rows
+
+    def _is_after(self, keys, after):
+        for (field, direction), key, bound in zip(self._orders, keys, after):
+            if key == bound:
+                continue
+            return key < bound if direction == 'DESCENDING' else key > bound
+        return False
+
+    def stream(self):
+        rows = self._matches()
+        self._db.reads += max(len(rows), 1)
+        for _, _, path, data, update_time in rows:
+            data = copy.deepcopy(data)
+            if self._fields is not None:
+                projected = {}
+                for field in self._fields:
+                    try:
+                        _apply_updates(projected, {field: _get(data, field)})
+                    except KeyError:
+                        pass
+                data = projected
+            yield FakeSnapshot(FakeDocumentReference(self._db, path), data, update_time)
+
+    def get(self):
+        return list(self.stream())
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, db, path):
+        super().__init__(db, path)
+        self.id = path.rsplit('/', 1)[-1]
+
+    def document(self, document_id=None):
+        if document_id is None:
+            document_id = f"auto{next(self._db.ids):08d}"
+        return FakeDocumentReference(self._db, f"{self._path}/{document_id}")
+
+
+class FakeWriteResult:
+    def __init__(self, update_time):
+        self.update_time = update_time
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref, data, merge=False):
+        self._writes.append(('set', ref, data, merge))
+
+    def update(self, ref, data, option=None):
+        self._writes.append(('update', ref, data, option))
+
+    def create(self, ref, data):
+        self._writes.append(('create', ref, data, None))
+
+    def commit(self):
+        db = self._db
+        if db.fail_commits:
+            raise db.fail_commits.pop(0)
+        # Every precondition is checked before anything is written
+        for op, ref, _, option in self._writes:
+            current = db.documents.get(ref.path)
+            if op == 'update':
+                if current is None:
+                    raise NotFound(f"No document to update: {ref.path}")
+                if option is not None and current[1] != option.last_update_time:
+                    raise FailedPrecondition(f"{ref.path} changed since {option.last_update_time}")
+            if op == 'create' and current is not None:
+                raise AlreadyExists(f"Document already exists: {ref.path}")
+
+        update_time = next(db.clock)
+        results = []
+        for op, ref, data, merge in self._writes:
+            if op == 'update':
+                stored = copy.deepcopy(db.documents[ref.path][0])
+                _apply_updates(stored, data)
+            elif op == 'set' and merge and ref.path in db.documents:
+                stored = copy.deepcopy(db.documents[ref.path][0])
+                _merge(stored, data)
+            else:
+                stored = _stored(data)
+            db.documents[ref.path] = (stored, update_time)
+            results.append(FakeWriteResult(update_time))
+        db.commits.append([(op, ref.path) for op, ref, _, _ in self._writes])
+        return results
+
+
+class FakeFirestore:
+    """
+    An empty database. `documents` maps paths to (data, update_time),
+    `commits` lists every committed write, and exceptions queued on
+    `fail_commits` are raised by the next commits instead of writing.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.commits = []
+        self.fail_commits = []
+        self.reads = 0
+        self.clock = itertools.count(1)
+        self.ids = itertools.count(1)
+
+    def collection(self, name):
+        return FakeCollectionReference(self, name)
+
+    def document(self, path):
+        return FakeDocumentReference(self, path)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def write_option(self, last_update_time):
+        return FakeWriteOption(last_update_time)
+
+    def get_all(self, refs, field_paths=None):
+        for ref in refs:
+            snapshot = ref.get()
+            if snapshot.exists and field_paths is not None:
+                projected = {}
+                for field in field_paths:
+                    try:
+                        _apply_updates(projected, {field: snapshot.get(field)})
+                    except KeyError:
+                        pass
+                snapshot = FakeSnapshot(ref, projected, snapshot.update_time)
+            yield snapshot
+
+    def put(self, path, data):
+        """Store a document directly, as another writer would"""
+        self.document(path).set(data)
@@ -0,0 +1,39 @@
+def make_card(player_id, team="NYY", position="Pitcher", contact=50.0,
+              pitching_styles=("Fastballs",), hitting_styles=None):
+    """A player document that validates as a PlayerCard"""
+    return {
+        "player_id": str(player_id),
+        "basic_info": {
+            "name": f"Player {player_id}",
+            "team": team,
+            "primary_position": position,
+            "bats": "Right",
+            "throws": "Right",
+            "age": 28,
+            "height": "6' 2\"",
+            "weight": 210,
+            "headshot_url": f"https://img.mlb.com/{player_id}.png"
+        },
+        "batting_abilities": {"contact": contact, "power": 50.0, "discipline": 50.0, "speed": 50.0},
+        "pitching_abilities": {"control": 50.0, "velocity": 50.0, "stamina": 50.0, "effectiveness": 50.0},
+        "fielding_abilities": {"defense": 50.0, "range": 50.0, "reliability": 50.0},
+        "role_info": {
+            "primary_role": position,
+            "secondary_roles": [],
+            "pitching_styles": list(pitching_styles) if pitching_styles else None,
+            "hitting_styles": list(hitting_styles) if hitting_styles else None
+        }
+    }
+
+
+def make_cards(count, **kwargs):
+    """count cards keyed by ID, with IDs 100, 101, ... sorting in order"""
+    return {str(player_id): make_card(player_id, **kwargs) for player_id in range(100, 100 + count)}
+
+
+def seed_players(db, players, version="v1"):
+    """Store players in a fake database next to the two metadata documents"""
+    for player_id, player in players.items():
+        db.put(f"players/{player_id}", player)
+    db.put("players/metadata", {"data_version": version, "total_players": len(players)})
+    db.put("players/role_metadata", {"role_distribution": {"Pitcher": len(players)}})
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+from core.config import settings
+from core.timer_wheel import TimerWheel
+from core.deadlines import action_deadline, deadline_timestamp
+
+START = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def test_each_action_has_its_configured_deadline():
+    assert action_deadline("first_pitch", START) == START + timedelta(seconds=settings.FIRST_PITCH_DEADLINE_SECONDS)
+    assert action_deadline("pitch", START) == START + timedelta(seconds=settings.PITCH_DEADLINE_SECONDS)
+    assert action_deadline("bat", START) == START + timedelta(seconds=settings.BAT_DEADLINE_SECONDS)
+
+
+def test_first_pitch_is_not_made_for_the_pitcher_before_its_deadline():
+    start = deadline_timestamp(START)
+    deadline = deadline_timestamp(action_deadline("first_pitch", START))
+    wheel = TimerWheel(tick=1.0, start=start)
+    wheel.schedule("g1", deadline)
+    assert wheel.advance(start + 5) == []
+    assert wheel.advance(deadline - 1) == []
+    assert wheel.advance(deadline) == [("g1", deadline)]
@@ -0,0 +1,56 @@
+from services.commentary_log import latest_entries, log_entry_ref
+
+GAME = "games/g1"
+
+
+def add_entries(db, count):
+    game_ref = db.document(GAME)
+    for n in range(1, count + 1):
+        log_entry_ref(game_ref).set({"timestamp": f"2024-01-01T00:00:{n:02d}", "commentary": f"play {n}"})
+    return game_ref
+
+
+def commentary(entries):
+    return [entry["commentary"] for entry in entries]
+
+
+def test_pages_walk_back_to_the_start_of_the_game(fake_db):
+    game_ref = add_entries(fake_db, 5)
+
+    entries, older = latest_entries(game_ref, 2)
+    assert commentary(entries) == ["play 4", "play 5"]
+    assert older == "2024-01-01T00:00:04"
+
+    entries, older = latest_entries(game_ref, 2, older)
+    assert commentary(entries) == ["play 2", "play 3"]
+
+    entries, older = latest_entries(game_ref, 2, older)
+    assert commentary(entries) == ["play 1"]
+    assert older is None
+
+
+def test_a_full_last_page_has_no_older_cursor(fake_db):
+    game_ref = add_entries(fake_db, 2)
+    entries, older = latest_entries(game_ref, 2)
+    assert commentary(entries) == ["play 1", "play 2"]
+    assert older is None
+
+
+def test_games_before_the_log_read_the_legacy_list(fake_db):
+    game_ref = fake_db.document(GAME)
+    fake_db.put(f"{GAME}/commentary_history/main", {
+        "full_commentary": [{"commentary": f"old {n}"} for n in range(1, 5)]
+    })
+
+    entries, older = latest_entries(game_ref, 3)
+    assert commentary(entries) == ["old 2", "old 3", "old 4"]
+    assert older is None
+    # The legacy list has no pages
+    assert latest_entries(game_ref, 3, "2024-01-01T00:00:00") == ([], None)
+
+
+def test_the_log_wins_over_the_legacy_list(fake_db):
+    game_ref = add_entries(fake_db, 1)
+    fake_db.put(f"{GAME}/commentary_history/main", {"full_commentary": [{"commentary": "old"}]})
+    entries, _ = latest_entries(game_ref, 3)
+    assert commentary(entries) == ["play 1"]
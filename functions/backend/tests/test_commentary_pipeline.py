@@ -0,0 +1,165 @@
+import asyncio
+from datetime import datetime
+import pytest
+from models.schemas.base import CommentaryStatus
+from services import commentary_pipeline as pipeline_module
+from services import game_store as game_store_module
+from services.commentary_log import COMMENTARY_LOG
+from services.commentary_pipeline import CommentaryPipeline
+from services.game_events import GameEventBus
+from services.game_store import GameStore
+
+GAME = "games/g1"
+CONTEXT = {"inning": 1, "is_top_inning": True, "score": {"team1": 0, "team2": 0},
+           "outs": 0, "timestamp": "2024-01-01T00:00:00"}
+
+
+class StubCommentary:
+    """Commentary that names the action, failing for actions listed in fail"""
+
+    def __init__(self):
+        self.fail = set()
+        self.delays = {}
+
+    async def fetch_player_name(self, player_id, game_id=None):
+        return f"Player {player_id}"
+
+    async def generate_ai_commentary(self, action_type, action_details, game_context, play_history):
+        await asyncio.sleep(self.delays.get(action_details["n"], 0))
+        if action_details["n"] in self.fail:
+            raise RuntimeError("model unavailable")
+        return f"{action_type} {action_details['n']}"
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    fake_db.put(GAME, {"status": "in_progress", "history_seq": 0, "event_seq": 0, "plays": 0})
+    monkeypatch.setattr(game_store_module, "db", fake_db)
+    monkeypatch.setattr(pipeline_module, "db", fake_db)
+    return fake_db
+
+
+@pytest.fixture
+def events(monkeypatch):
+    bus = GameEventBus()
+    monkeypatch.setattr(game_store_module, "game_events", bus)
+    monkeypatch.setattr(pipeline_module, "game_events", bus)
+    return bus
+
+
+@pytest.fixture
+def commentary(monkeypatch):
+    stub = StubCommentary()
+    monkeypatch.setattr(pipeline_module, "commentary_service", stub)
+
+    async def synthesize(game_id, text):
+        return f"https://audio/{text.replace(' ', '-')}.mp3"
+    monkeypatch.setattr(pipeline_module, "synthesize_commentary_audio", synthesize)
+    return stub
+
+
+@pytest.fixture
+def store(monkeypatch, db, events):
+    store = GameStore(flush_interval=60)
+    monkeypatch.setattr(pipeline_module, "game_store", store)
+    return store
+
+
+async def play(store, pipeline, db, n):
+    """A pitch whose history entry and pending ticket wait in the game's next write"""
+    game_ref = db.document(GAME)
+    history_ref = game_ref.collection('history').document()
+    ticket_ref = pipeline.new_ticket_ref(game_ref)
+
+    async def apply(game_state):
+        game_state["plays"] += 1
+
+    def stage(writes, game_state, outcome):
+        writes.add_history({"action_type": "pitch", "n": n}, history_ref)
+        writes.set(ticket_ref, pipeline.ticket_document(ticket_ref, "g1", "pitch", datetime.utcnow()))
+
+    await store.update(game_ref, apply, stage)
+    task = pipeline.schedule(game_ref, ticket_ref, history_ref, "pitch", {"n": n}, CONTEXT, "p1")
+    return ticket_ref, history_ref, task
+
+
+def document(db, ref):
+    return db.documents[ref.path][0]
+
+
+def test_ticket_resolves_with_history_and_log(db, events, commentary, store):
+    async def run():
+        pipeline = CommentaryPipeline()
+        queue = events.subscribe("g1")
+        ticket_ref, history_ref, task = await play(store, pipeline, db, 1)
+        await task
+
+        ticket = document(db, ticket_ref)
+        assert ticket["status"] == CommentaryStatus.READY
+        assert ticket["commentary"] == "pitch 1"
+        assert ticket["audio_url"] == "https://audio/pitch-1.mp3"
+        assert ticket["completed_at"] is not None
+        assert document(db, history_ref)["commentary"] == "pitch 1"
+
+        log = [data for path, (data, _) in db.documents.items() if f"/{COMMENTARY_LOG}/" in path]
+        assert [entry["ticket_id"] for entry in log] == [ticket_ref.id]
+
+        published = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert published[-1]["type"] == "commentary"
+        assert published[-1]["ticket_id"] == ticket_ref.id
+    asyncio.run(run())
+
+
+def test_deliveries_keep_submission_order(db, events, commentary, store):
+    async def run():
+        pipeline = CommentaryPipeline()
+        commentary.delays = {1: 0.05}
+        first, _, _ = await play(store, pipeline, db, 1)
+        second, _, _ = await play(store, pipeline, db, 2)
+        queue = events.subscribe("g1")
+        await pipeline.drain()
+
+        delivered = [queue.get_nowait()["ticket_id"] for _ in range(queue.qsize())]
+        assert delivered == [first.id, second.id]
+    asyncio.run(run())
+
+
+def test_generation_failure_fails_the_ticket(db, events, commentary, store):
+    async def run():
+        pipeline = CommentaryPipeline()
+        commentary.fail = {1}
+        ticket_ref, history_ref, task = await play(store, pipeline, db, 1)
+        await task
+
+        ticket = document(db, ticket_ref)
+        assert ticket["status"] == CommentaryStatus.FAILED
+        assert ticket["completed_at"] is not None
+        assert "commentary" not in document(db, history_ref)
+        assert not any(f"/{COMMENTARY_LOG}/" in path for path in db.documents)
+    asyncio.run(run())
+
+
+def test_delivery_failure_fails_the_ticket(db, events, commentary, store):
+    async def run():
+        pipeline = CommentaryPipeline()
+        ticket_ref, _, task = await play(store, pipeline, db, 1)
+        await store.flush("g1")
+        db.fail_commits.append(RuntimeError("commit failed"))
+        await task
+
+        assert document(db, ticket_ref)["status"] == CommentaryStatus.FAILED
+        assert not any(f"/{COMMENTARY_LOG}/" in path for path in db.documents)
+    asyncio.run(run())
+
+
+def test_rejected_action_gets_a_failed_ticket(db):
+    async def run():
+        pipeline = CommentaryPipeline()
+        ticket_ref = pipeline.new_ticket_ref(db.document(GAME))
+        await pipeline.reject(ticket_ref, "g1", "bat", datetime.utcnow())
+
+        ticket = document(db, ticket_ref)
+        assert ticket["status"] == CommentaryStatus.FAILED
+        assert ticket["ticket_id"] == ticket_ref.id
+        assert ticket["action_type"] == "bat"
+    asyncio.run(run())
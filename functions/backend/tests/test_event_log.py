@@ -0,0 +1,65 @@
+import copy
+from datetime import datetime, timezone
+from services.event_log import apply_event, entry_id, fold, new_event
+from services.state_diff import diff_fields
+
+AT = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+START = {
+    "inning": 1,
+    "outs": 2,
+    "bases": {"first": None, "second": "123", "third": None},
+    "team1": {"score": 0, "player_stats": {"42": {"hits": 1}}},
+    "timeouts": {"team1": 1}
+}
+
+
+def event_between(seq, before, after):
+    return new_event(seq, "update", AT, diff_fields(before, after))
+
+
+def test_event_splits_changes_and_removals():
+    after = copy.deepcopy(START)
+    after["outs"] = 0
+    del after["timeouts"]
+    event = new_event(3, "bat", AT, diff_fields(START, after), "u1", {"hit_style": "power"})
+    assert event["seq"] == 3
+    assert event["changes"] == {"outs": 0}
+    assert event["removed"] == ["timeouts"]
+    assert event["user_id"] == "u1"
+    assert event["data"] == {"hit_style": "power"}
+
+
+def test_applying_an_event_reproduces_the_state():
+    after = copy.deepcopy(START)
+    after["bases"]["first"] = "456"
+    after["team1"]["player_stats"]["42"]["hits"] = 2
+    after["team1"]["player_stats"]["7"] = {"hits": 0}
+    del after["timeouts"]
+    state = apply_event(copy.deepcopy(START), event_between(1, START, after))
+    assert state == after
+
+
+def test_fold_replays_events_in_order_without_touching_the_start():
+    states = [START]
+    for outs in (0, 1):
+        state = copy.deepcopy(states[-1])
+        state["outs"] = outs
+        state["inning"] += 1
+        states.append(state)
+    events = [event_between(n + 1, states[n], states[n + 1]) for n in range(2)]
+
+    assert fold(START, events) == states[-1]
+    assert fold(START, events[:1]) == states[1]
+    assert START["outs"] == 2
+
+
+def test_folded_state_does_not_share_values_with_events():
+    event = new_event(1, "created", AT, diff_fields({}, START))
+    state = fold({}, [event])
+    state["bases"]["first"] = "999"
+    assert event["changes"]["bases"]["first"] is None
+
+
+def test_entry_ids_sort_by_seq():
+    assert sorted([entry_id(10), entry_id(9), entry_id(100)]) == [entry_id(9), entry_id(10), entry_id(100)]
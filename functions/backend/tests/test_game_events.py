@@ -0,0 +1,48 @@
+import asyncio
+from services.game_events import GameEventBus
+
+
+def test_events_reach_every_subscriber_of_the_game():
+    async def run():
+        bus = GameEventBus()
+        first, second = bus.subscribe("g1"), bus.subscribe("g1")
+        other = bus.subscribe("g2")
+        bus.publish("g1", {"type": "action"})
+        assert first.get_nowait() == {"type": "action"}
+        assert second.get_nowait() == {"type": "action"}
+        assert other.empty()
+    asyncio.run(run())
+
+
+def test_unsubscribe_removes_the_game_once_empty():
+    async def run():
+        bus = GameEventBus()
+        queue = bus.subscribe("g1")
+        assert bus.has_subscribers("g1")
+        bus.unsubscribe("g1", queue)
+        assert not bus.has_subscribers("g1")
+        bus.publish("g1", {"type": "action"})
+        assert queue.empty()
+    asyncio.run(run())
+
+
+def test_slow_subscriber_is_dropped_and_closed():
+    async def run():
+        bus = GameEventBus(max_queue=2)
+        slow = bus.subscribe("g1")
+        for n in range(3):
+            bus.publish("g1", {"n": n})
+        assert not bus.has_subscribers("g1")
+        assert slow.get_nowait() is None
+    asyncio.run(run())
+
+
+def test_close_ends_all_streams():
+    async def run():
+        bus = GameEventBus()
+        queues = [bus.subscribe("g1"), bus.subscribe("g2")]
+        bus.publish("g1", {"type": "action"})
+        bus.close()
+        assert [queue.get_nowait() for queue in queues] == [None, None]
+        assert not bus.has_subscribers("g1")
+    asyncio.run(run())
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+from api.v1.endpoints import games as games_endpoint
+from models.schemas.user import Deck
+from services import game_store as game_store_module
+from services.game_events import GameEventBus
+from services.game_store import GameStore
+
+GAME = "games/g1"
+USER = {"uid": "u1"}
+
+
+def make_deck(prefix):
+    return Deck(
+        catchers=[f"{prefix}c1"],
+        pitchers=[f"{prefix}p{n}" for n in range(1, 6)],
+        infielders=[f"{prefix}i{n}" for n in range(1, 5)],
+        outfielders=[f"{prefix}o{n}" for n in range(1, 4)],
+        hitters=[f"{prefix}h{n}" for n in range(1, 5)]
+    )
+
+
+def pitch(seq):
+    return {"action_type": "pitch", "timestamp": f"2024-01-01T00:00:{seq:02d}",
+            "player_id": "u2", "pitch_style": "Fastballs", "inning": 1, "seq": seq}
+
+
+@pytest.fixture
+def store(fake_db, monkeypatch):
+    now = datetime.now(timezone.utc)
+    fake_db.put(GAME, {
+        "game_id": "g1",
+        "status": "in_progress",
+        "team1": games_endpoint.new_team_state("u1", make_deck("a")),
+        "team2": games_endpoint.new_team_state("u2", make_deck("b")),
+        "created_at": now,
+        "updated_at": now,
+        "history_seq": 2,
+        "event_seq": 2
+    })
+    for seq in (1, 2):
+        fake_db.put(f"{GAME}/history/h{seq}", pitch(seq))
+
+    store = GameStore(flush_interval=60)
+    monkeypatch.setattr(game_store_module, "db", fake_db)
+    monkeypatch.setattr(game_store_module, "game_events", GameEventBus())
+    monkeypatch.setattr(games_endpoint, "db", fake_db)
+    monkeypatch.setattr(games_endpoint, "game_store", store)
+    return store
+
+
+async def add_pitch(store, db):
+    async def apply(game_state):
+        game_state["updated_at"] = datetime.now(timezone.utc)
+
+    def stage(writes, game_state, outcome):
+        writes.add_history(pitch(0))
+
+    await store.update(db.document(GAME), apply, stage)
+
+
+def seqs(view):
+    return [entry["seq"] for entry in view["history"]]
+
+
+def test_since_returns_only_newer_entries(fake_db, store):
+    async def run():
+        view = await games_endpoint.get_game("g1", None, USER)
+        assert seqs(view) == [1, 2] and view["history_seq"] == 2
+
+        view = await games_endpoint.get_game("g1", 1, USER)
+        assert seqs(view) == [2] and view["history_seq"] == 2
+    asyncio.run(run())
+
+
+def test_polls_without_new_history_do_not_write(fake_db, store):
+    async def run():
+        commits = len(fake_db.commits)
+        view = await games_endpoint.get_game("g1", 2, USER)
+        assert seqs(view) == [] and view["history_seq"] == 2
+        assert len(fake_db.commits) == commits
+    asyncio.run(run())
+
+
+def test_unwritten_history_is_written_for_the_poll_that_wants_it(fake_db, store):
+    async def run():
+        await add_pitch(store, fake_db)
+        view = await games_endpoint.get_game("g1", 2, USER)
+        assert seqs(view) == [3] and view["history_seq"] == 3
+
+        # Already read: no write needed for the next poll
+        commits = len(fake_db.commits)
+        await add_pitch(store, fake_db)
+        view = await games_endpoint.get_game("g1", 4, USER)
+        assert seqs(view) == [] and view["history_seq"] == 4
+        assert len(fake_db.commits) == commits
+        await store.stop()
+    asyncio.run(run())
+
+
+def test_mark_stays_at_the_last_entry_read_when_the_write_fails(fake_db, store):
+    async def run():
+        await add_pitch(store, fake_db)
+        fake_db.fail_commits.append(ServiceUnavailable("down"))
+        view = await games_endpoint.get_game("g1", 2, USER)
+        assert view["state"].history_seq == 3
+        assert seqs(view) == [] and view["history_seq"] == 2
+
+        await store.flush("g1")
+        view = await games_endpoint.get_game("g1", view["history_seq"], USER)
+        assert seqs(view) == [3] and view["history_seq"] == 3
+        await store.stop()
+    asyncio.run(run())
@@ -0,0 +1,254 @@
+import asyncio
+import random
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+from services import game_store as game_store_module
+from services.event_log import EVENT_LOG, entry_id
+from services.game_events import GameEventBus
+from services.game_store import GameStore
+
+GAME = "games/g1"
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    fake_db.put(GAME, {
+        "status": "in_progress",
+        "outs": 0,
+        "score": 0,
+        "updated_at": "start",
+        "history_seq": 0,
+        "event_seq": 0
+    })
+    monkeypatch.setattr(game_store_module, "db", fake_db)
+    return fake_db
+
+
+@pytest.fixture
+def events(monkeypatch):
+    bus = GameEventBus()
+    monkeypatch.setattr(game_store_module, "game_events", bus)
+    return bus
+
+
+def stored(db, path=GAME):
+    return db.documents[path][0]
+
+
+class Bat:
+    """A bat with a random outcome, staging a history entry and a ticket"""
+
+    def __init__(self, db, user_id="u1"):
+        self.user_id = user_id
+        self.game_ref = db.document(GAME)
+        self.history_ref = self.game_ref.collection('history').document()
+        self.ticket_ref = self.game_ref.collection('commentary_tickets').document()
+        self.applied = 0
+        self.committed = []
+        self.rejected = []
+
+    async def apply(self, game_state):
+        self.applied += 1
+        runs = random.randint(0, 1000)
+        game_state["score"] += runs
+        game_state["updated_at"] = f"bat by {self.user_id}"
+        return {"runs": runs}
+
+    def stage(self, writes, game_state, outcome):
+        writes.add_history({"action_type": "bat", "runs": outcome["runs"]}, self.history_ref)
+        writes.set(self.ticket_ref, {"ticket_id": self.ticket_ref.id, "status": "pending"})
+
+    async def on_committed(self, game_state, outcome):
+        self.committed.append((game_state, outcome))
+
+    async def on_rejected(self, outcome):
+        self.rejected.append(outcome)
+
+    def run(self, store):
+        return store.update(
+            self.game_ref, self.apply, self.stage,
+            event={"type": "bat", "user_id": self.user_id},
+            committed=self.on_committed, rejected=self.on_rejected
+        )
+
+
+def test_actions_between_flushes_go_out_in_one_batch(db, events):
+    async def run():
+        store = GameStore(flush_interval=0.05)
+        first, second = Bat(db), Bat(db)
+        await first.run(store)
+        state, _ = await second.run(store)
+        assert db.commits == [[('set', GAME)]]
+
+        await asyncio.sleep(0.1)
+        assert len(db.commits) == 2
+        assert ('update', GAME) in db.commits[1]
+        assert stored(db)["score"] == state["score"]
+        assert stored(db)["event_seq"] == 2
+        assert stored(db)["history_seq"] == 2
+        assert stored(db, f"{GAME}/{EVENT_LOG}/{entry_id(2)}")["user_id"] == "u1"
+        assert [len(bat.committed) for bat in (first, second)] == [1, 1]
+    asyncio.run(run())
+
+
+def test_conflict_keeps_the_outcome_the_client_was_given(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        bat = Bat(db)
+        state, outcome = await bat.run(store)
+        queue = events.subscribe("g1")
+
+        # Another instance writes a field the bat didn't touch
+        db.document(GAME).update({"spectators": 3})
+        assert await store.flush("g1")
+
+        assert bat.applied == 1
+        assert stored(db)["score"] == state["score"] == outcome["runs"]
+        assert stored(db)["spectators"] == 3
+        assert stored(db, bat.history_ref.path)["runs"] == outcome["runs"]
+        assert stored(db, bat.ticket_ref.path)["status"] == "pending"
+        await asyncio.sleep(0)
+        assert bat.rejected == [] and len(bat.committed) == 1
+        snapshot = queue.get_nowait()
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["state"]["spectators"] == 3
+    asyncio.run(run())
+
+
+def test_rebase_renumbers_history_and_events(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        bat = Bat(db)
+        await bat.run(store)
+
+        # Another instance logged an event and a history entry meanwhile
+        db.document(GAME).update({"spectators": 3, "history_seq": 1, "event_seq": 1})
+        assert await store.flush("g1")
+
+        assert stored(db)["history_seq"] == 2
+        assert stored(db)["event_seq"] == 2
+        assert stored(db, bat.history_ref.path)["seq"] == 2
+        assert stored(db, f"{GAME}/{EVENT_LOG}/{entry_id(2)}")["changes"]["score"] == stored(db)["score"]
+    asyncio.run(run())
+
+
+def test_conflicting_action_is_rejected_and_reported(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        bat = Bat(db)
+        _, outcome = await bat.run(store)
+        queue = events.subscribe("g1")
+
+        # Another instance acted first on the same fields
+        db.document(GAME).update({"score": 7, "updated_at": "elsewhere", "event_seq": 1})
+        assert await store.flush("g1")
+
+        assert stored(db)["score"] == 7
+        assert bat.history_ref.path not in db.documents
+        assert bat.ticket_ref.path not in db.documents
+        await asyncio.sleep(0)
+        assert bat.rejected == [outcome] and bat.committed == []
+
+        rejected = queue.get_nowait()
+        assert rejected["type"] == "rejected"
+        assert rejected["event_type"] == "bat" and rejected["user_id"] == "u1"
+        assert queue.get_nowait()["state"]["score"] == 7
+        assert (await store.get(db.document(GAME)))["score"] == 7
+    asyncio.run(run())
+
+
+def test_later_actions_are_kept_on_top_of_a_rejected_one(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        first = Bat(db)
+        await first.run(store)
+
+        async def add_out(game_state):
+            game_state["outs"] += 1
+
+        await store.update(db.document(GAME), add_out)
+        db.document(GAME).update({"score": 7, "updated_at": "elsewhere"})
+        assert await store.flush("g1")
+
+        assert stored(db)["score"] == 7
+        assert stored(db)["outs"] == 1
+        assert stored(db)["event_seq"] == 1
+    asyncio.run(run())
+
+
+def test_failed_flush_is_retried_with_backoff(db, events):
+    async def run():
+        store = GameStore(flush_interval=0.02)
+        bat = Bat(db)
+        state, _ = await bat.run(store)
+        game = store._games["g1"]
+        game.flush_task.cancel()
+        game.flush_task = None
+
+        db.fail_commits.append(ServiceUnavailable("down"))
+        assert not await store.flush("g1")
+        assert game.failures == 1 and game.flush_task is not None
+        assert len(db.commits) == 1
+
+        await asyncio.sleep(0.1)
+        assert stored(db)["score"] == state["score"]
+        assert game.failures == 0 and not game.dirty
+    asyncio.run(run())
+
+
+def test_completed_games_are_evicted_once_written(db, events):
+    async def run():
+        store = GameStore(flush_interval=0.01)
+
+        async def complete(game_state):
+            game_state["status"] = "completed"
+
+        await store.update(db.document(GAME), complete)
+        assert "g1" in store._games
+        await asyncio.sleep(0.05)
+        assert stored(db)["status"] == "completed"
+        assert "g1" not in store._games
+    asyncio.run(run())
+
+
+def test_idle_games_are_evicted(db, events):
+    async def run():
+        store = GameStore(flush_interval=60, idle_seconds=0.04)
+        await Bat(db).run(store)
+        store.start()
+        await asyncio.sleep(0.1)
+        assert "g1" not in store._games
+        assert stored(db)["event_seq"] == 1
+        await store.stop()
+    asyncio.run(run())
+
+
+def test_stop_flushes_every_game(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        bat = Bat(db)
+        state, _ = await bat.run(store)
+        await store.stop()
+        assert stored(db)["score"] == state["score"]
+        assert len(bat.committed) == 1
+    asyncio.run(run())
+
+
+def test_reads_are_served_without_flushing(db, events):
+    async def run():
+        store = GameStore(flush_interval=60)
+        bat = Bat(db)
+        await bat.run(store)
+        commits = len(db.commits)
+
+        assert store.unwritten("g1", bat.ticket_ref)["status"] == "pending"
+        assert store.unwritten("g1", db.document(f"{GAME}/commentary_tickets/other")) is None
+        assert await store.flush_for("g1", "history_seq", after=1)
+        assert await store.flush_for("g1", "event_seq", through=0)
+        assert len(db.commits) == commits
+
+        assert await store.flush_for("g1", "history_seq", after=0)
+        assert len(db.commits) == commits + 1
+        assert store.unwritten("g1", bat.ticket_ref) is None
+        await store.stop()
+    asyncio.run(run())
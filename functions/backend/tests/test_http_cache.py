@@ -0,0 +1,99 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from api.v1.endpoints import players as players_endpoint
+from core.config import settings
+from core.http_cache import etag_matches, version_etag
+from services.player_catalog import CatalogSnapshot
+from player_cards import make_cards
+
+PLAYERS = make_cards(3)
+
+
+def make_request(path="/players/100", query="", if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": path,
+                    "query_string": query.encode(), "headers": headers})
+
+
+class StubCatalog:
+    def __init__(self, version):
+        self.current = CatalogSnapshot(version, PLAYERS)
+
+    def snapshot(self):
+        return self.current
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = StubCatalog("v1")
+    monkeypatch.setattr(players_endpoint, "player_catalog", catalog)
+    return catalog
+
+
+@pytest.fixture
+def client(catalog):
+    app = FastAPI()
+    app.include_router(players_endpoint.router, prefix="/players")
+    return TestClient(app)
+
+
+def test_etag_depends_on_version_path_and_query():
+    etag = version_etag(make_request(query="b=2&a=1"), "v1")
+    assert etag == version_etag(make_request(query="a=1&b=2"), "v1")
+    assert etag != version_etag(make_request(query="a=1&b=2"), "v2")
+    assert etag != version_etag(make_request(path="/players/101", query="a=1&b=2"), "v1")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_no_version_no_etag():
+    assert version_etag(make_request(), None) is None
+    assert not etag_matches(make_request(if_none_match="*"), None)
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", W/"abc"', True),
+    ('"other" ,"more"', False),
+    ('*', True),
+    ('', False),
+    ('"ab"', False),
+])
+def test_if_none_match_parsing(header, matches):
+    assert etag_matches(make_request(if_none_match=header), '"abc"') is matches
+
+
+def test_player_response_carries_etag_and_cache_control(client):
+    response = client.get("/players/100")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == f"public, max-age={settings.PLAYER_CACHE_MAX_AGE}"
+
+
+def test_matching_etag_gets_304_without_body(client):
+    etag = client.get("/players/100").headers["etag"]
+    response = client.get("/players/100", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    weak = client.get("/players/100", headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert weak.status_code == 304
+
+
+def test_new_catalog_version_changes_the_etag(client, catalog):
+    etag = client.get("/players/", params={"limit": 2}).headers["etag"]
+    catalog.current = CatalogSnapshot("v2", PLAYERS)
+    response = client.get("/players/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_each_query_has_its_own_etag(client):
+    first = client.get("/players/", params={"limit": 1}).headers["etag"]
+    second = client.get("/players/", params={"limit": 2}).headers["etag"]
+    assert first != second
+    response = client.get("/players/", params={"limit": 2}, headers={"If-None-Match": first})
+    assert response.status_code == 200
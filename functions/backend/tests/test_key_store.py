@@ -0,0 +1,32 @@
+import pytest
+from core.key_store import LocalKeySet, TokenVerifier
+
+
+@pytest.fixture(scope="module")
+def key_set():
+    return LocalKeySet()
+
+
+def test_minted_token_verifies(key_set):
+    token = key_set.mint("user-1", "test-project", admin=True)
+    claims = TokenVerifier("test-project", key_set).verify(token)
+    assert claims["uid"] == "user-1"
+    assert claims["admin"] is True
+
+
+def test_wrong_audience_is_rejected(key_set):
+    token = key_set.mint("user-1", "other-project")
+    with pytest.raises(ValueError):
+        TokenVerifier("test-project", key_set).verify(token)
+
+
+def test_expired_token_is_rejected(key_set):
+    token = key_set.mint("user-1", "test-project", expires_in=-60)
+    with pytest.raises(ValueError):
+        TokenVerifier("test-project", key_set).verify(token)
+
+
+def test_token_from_another_key_set_is_rejected(key_set):
+    token = LocalKeySet().mint("user-1", "test-project")
+    with pytest.raises(ValueError):
+        TokenVerifier("test-project", key_set).verify(token)
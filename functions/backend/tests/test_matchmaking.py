@@ -0,0 +1,102 @@
+import math
+from services.matchmaking import MatchmakingQueue, deck_strength
+from services.player_matrix import AbilityMatrix
+
+
+def make_player(contact, power, control=50.0):
+    return {
+        "batting_abilities": {"contact": contact, "power": power, "discipline": 50.0, "speed": 50.0},
+        "pitching_abilities": {"control": control, "velocity": 50.0, "stamina": 50.0, "effectiveness": 50.0}
+    }
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(**kwargs):
+    clock = FakeClock()
+    return MatchmakingQueue(bucket_width=10, ttl=60, clock=clock, **kwargs), clock
+
+
+def test_waiting_player_is_paired_with_the_next():
+    queue, _ = make_queue()
+    assert queue.join("a", "deck-a", 55) is None
+    assert queue.join("b", "deck-b", 25) is None
+    opponent = queue.join("c", "deck-c", 58)
+    assert (opponent.user_id, opponent.deck) == ("a", "deck-a")
+    assert len(queue) == 1
+
+
+def test_pairs_within_neighbouring_buckets_only():
+    queue, _ = make_queue()
+    queue.join("weak", None, 21)
+    assert queue.join("strong", None, 75) is None
+    assert queue.join("middle", None, 66).user_id == "strong"
+    assert queue.join("other", None, 35).user_id == "weak"
+
+
+def test_without_bucketing_anyone_is_paired_in_order():
+    queue = MatchmakingQueue(bucket_width=0, ttl=60, clock=FakeClock())
+    queue.join("weak", None, 10)
+    assert queue.join("strong", None, 90).user_id == "weak"
+
+
+def test_joining_twice_keeps_one_ticket():
+    queue, _ = make_queue()
+    queue.join("a", None, 50)
+    assert queue.join("a", None, 50) is None
+    assert len(queue) == 1
+
+
+def test_stale_tickets_are_skipped():
+    queue, clock = make_queue()
+    queue.join("gone", None, 50)
+    clock.now += 30
+    queue.join("polling", None, 80)
+    clock.now += 40
+    assert queue.poll("polling").game_id is None
+    assert queue.join("c", None, 50) is None
+    assert queue.join("d", None, 81).user_id == "polling"
+
+
+def test_paired_ticket_is_handed_over_once():
+    queue, _ = make_queue()
+    queue.join("a", None, 50)
+    opponent = queue.join("b", None, 50)
+    queue.complete(opponent, "game-1")
+    assert queue.poll("a").game_id == "game-1"
+    assert queue.poll("a") is None
+
+
+def test_requeue_after_a_failed_start():
+    queue, _ = make_queue()
+    queue.join("a", None, 50)
+    opponent = queue.join("b", None, 50)
+    queue.requeue(opponent)
+    assert len(queue) == 1
+    assert queue.join("c", None, 50).user_id == "a"
+
+
+def test_leave():
+    queue, _ = make_queue()
+    queue.join("a", None, 50)
+    assert queue.leave("a")
+    assert not queue.leave("a")
+    assert queue.poll("a") is None
+    assert queue.join("b", None, 50) is None
+
+
+def test_deck_strength_uses_pitching_for_pitchers_only():
+    players = {
+        "p1": make_player(contact=10, power=10, control=90),
+        "h1": make_player(contact=80, power=60),
+    }
+    matrix = AbilityMatrix(sorted(players), players)
+    # Pitcher: (90 + 50 * 3) / 4 = 60; hitter: (80 + 60 + 50 + 50) / 4 = 60
+    assert deck_strength(matrix, {"pitchers": ["p1"], "hitters": ["h1"]}) == 60
+    assert math.isnan(deck_strength(matrix, {"pitchers": ["unknown"]}))
@@ -0,0 +1,87 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.v1.endpoints import players as players_endpoint
+from services.player_catalog import CatalogSnapshot
+from player_cards import make_cards, seed_players
+
+PLAYERS = make_cards(5)
+
+
+class StubCatalog:
+    def snapshot(self):
+        return CatalogSnapshot("v1", PLAYERS)
+
+
+class UnavailableCatalog:
+    def snapshot(self):
+        raise RuntimeError("catalog down")
+
+
+def make_client(monkeypatch, catalog):
+    monkeypatch.setattr(players_endpoint, "player_catalog", catalog)
+    app = FastAPI()
+    app.include_router(players_endpoint.router, prefix="/players")
+    return TestClient(app)
+
+
+@pytest.fixture
+def firestore(fake_db, monkeypatch):
+    seed_players(fake_db, PLAYERS)
+    monkeypatch.setattr(players_endpoint, "db", fake_db)
+    return fake_db
+
+
+@pytest.fixture(params=["catalog", "firestore"])
+def client(request, monkeypatch, firestore):
+    catalog = StubCatalog() if request.param == "catalog" else UnavailableCatalog()
+    return make_client(monkeypatch, catalog)
+
+
+def post(client, player_ids, **params):
+    return client.post("/players/batch", json={"player_ids": player_ids}, params=params)
+
+
+def test_players_come_back_in_request_order(client):
+    response = post(client, ["103", "100", "102"])
+    assert response.status_code == 200
+    assert [player["player_id"] for player in response.json()["players"]] == ["103", "100", "102"]
+    assert response.json()["missing"] == []
+
+
+def test_duplicates_are_returned_once(client):
+    response = post(client, ["101", "100", "101", "100"])
+    assert [player["player_id"] for player in response.json()["players"]] == ["101", "100"]
+
+
+def test_unknown_and_metadata_ids_are_missing(client):
+    response = post(client, ["999", "100", "metadata", "999"])
+    assert [player["player_id"] for player in response.json()["players"]] == ["100"]
+    assert response.json()["missing"] == ["999", "metadata"]
+
+
+def test_fields_project_each_player(client):
+    response = post(client, ["100", "999"], fields="basic_info.name")
+    assert response.status_code == 200
+    assert response.json() == {
+        "players": [{"player_id": "100", "basic_info": {"name": "Player 100"}}],
+        "missing": ["999"]
+    }
+
+
+def test_at_most_100_ids(client):
+    assert post(client, [str(i) for i in range(100)]).status_code == 200
+    assert post(client, [str(i) for i in range(101)]).status_code == 422
+    assert post(client, []).status_code == 422
+
+
+def test_fallback_reads_all_players_in_one_call(monkeypatch, firestore):
+    calls = []
+    get_all = firestore.get_all
+    monkeypatch.setattr(firestore, "get_all", lambda refs, **kw: calls.append(list(refs)) or get_all(refs, **kw))
+    client = make_client(monkeypatch, UnavailableCatalog())
+
+    response = post(client, ["102", "100", "102"])
+    assert [player["player_id"] for player in response.json()["players"]] == ["102", "100"]
+    assert len(calls) == 1
+    assert [ref.id for ref in calls[0]] == ["102", "100"]
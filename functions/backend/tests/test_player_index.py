@@ -0,0 +1,51 @@
+from services.player_index import PlayerIndex, popcount
+
+PLAYERS = {
+    "1": {
+        "basic_info": {"team": "NYY", "primary_position": "Pitcher", "bats": "Right", "throws": "Right"},
+        "role_info": {"primary_role": "Pitcher", "pitching_styles": ["Fastballs", "Changeups"]}
+    },
+    "2": {
+        "basic_info": {"team": "BOS", "primary_position": "Pitcher", "bats": "Left", "throws": "Left"},
+        "role_info": {"primary_role": "Pitcher", "pitching_styles": ["Breaking Balls"]}
+    },
+    "3": {
+        "basic_info": {"team": "NYY", "primary_position": "Hitter", "bats": "Switch", "throws": "Right"},
+        "role_info": {"primary_role": "Hitter", "hitting_styles": ["Power Hitter"]}
+    },
+}
+PLAYER_IDS = sorted(PLAYERS)
+
+
+def matching_ids(index, bitmap):
+    return [PLAYER_IDS[i] for i in index.positions(bitmap)]
+
+
+def test_and_across_fields():
+    index = PlayerIndex(PLAYER_IDS, PLAYERS)
+    bitmap = index.match({"role": ["Pitcher"], "team": ["NYY"]})
+    assert matching_ids(index, bitmap) == ["1"]
+
+
+def test_or_within_field():
+    index = PlayerIndex(PLAYER_IDS, PLAYERS)
+    bitmap = index.match({"team": ["NYY", "BOS"], "throws": ["Right"]})
+    assert matching_ids(index, bitmap) == ["1", "3"]
+
+
+def test_list_fields_and_unknown_values():
+    index = PlayerIndex(PLAYER_IDS, PLAYERS)
+    assert matching_ids(index, index.match({"pitching_style": ["Changeups"]})) == ["1"]
+    assert index.match({"team": ["LAD"]}) == 0
+    assert popcount(index.match({})) == 3
+
+
+def test_positions_from_start():
+    index = PlayerIndex(PLAYER_IDS, PLAYERS)
+    assert list(index.positions(index.all, start=1)) == [1, 2]
+
+
+def test_facets():
+    index = PlayerIndex(PLAYER_IDS, PLAYERS)
+    facets = index.facets(index.match({"role": ["Pitcher"]}), ["team", "bats"])
+    assert facets == {"team": {"NYY": 1, "BOS": 1}, "bats": {"Right": 1, "Left": 1}}
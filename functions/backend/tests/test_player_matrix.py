@@ -0,0 +1,50 @@
+import numpy as np
+from services.player_matrix import AbilityMatrix, bitmap_to_mask, mask_to_bitmap
+
+
+def make_player(contact, power, control=50.0):
+    return {
+        "batting_abilities": {"contact": contact, "power": power, "discipline": 50.0, "speed": 50.0},
+        "pitching_abilities": {"control": control, "velocity": 50.0, "stamina": 50.0, "effectiveness": 50.0},
+        "fielding_abilities": {"defense": 50.0, "range": 50.0, "reliability": 50.0}
+    }
+
+
+PLAYERS = {
+    "1": make_player(90, 40),
+    "2": make_player(70, 95),
+    "3": make_player(85, 60),
+    "4": make_player(60, 95),
+}
+PLAYER_IDS = sorted(PLAYERS)
+
+
+def test_range_mask():
+    matrix = AbilityMatrix(PLAYER_IDS, PLAYERS)
+    mask = matrix.mask({"contact": (80, None), "power": (None, 50)})
+    assert mask.tolist() == [True, False, False, False]
+
+
+def test_rank_descending_with_ties_by_position():
+    matrix = AbilityMatrix(PLAYER_IDS, PLAYERS)
+    everyone = np.ones(len(PLAYER_IDS), dtype=bool)
+    assert matrix.rank(everyone, "-power", 4).tolist() == [1, 3, 2, 0]
+    # A shorter ranking is always a prefix of a longer one
+    assert matrix.rank(everyone, "-power", 1).tolist() == [1]
+    assert matrix.rank(everyone, "contact", 2).tolist() == [3, 1]
+
+
+def test_mean_over_players_and_abilities():
+    matrix = AbilityMatrix(PLAYER_IDS, PLAYERS)
+    assert matrix.mean(["1", "3"], ["contact"]) == 87.5
+    assert matrix.mean(["2"], ["contact", "power"]) == 82.5
+    # Unknown players are skipped
+    assert matrix.mean(["1", "missing"], ["power"]) == 40.0
+    assert np.isnan(matrix.mean(["missing"], ["power"]))
+
+
+def test_bitmap_mask_round_trip():
+    bitmap = 0b1011
+    mask = bitmap_to_mask(bitmap, 4)
+    assert mask.tolist() == [True, True, False, True]
+    assert mask_to_bitmap(mask) == bitmap
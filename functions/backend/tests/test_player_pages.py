@@ -0,0 +1,114 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.v1.endpoints import players as players_endpoint
+from api.v1.endpoints.players import catalog_players_page, query_players_page, router
+from services.pagination import decode_cursor
+from services.player_catalog import CatalogSnapshot
+from player_cards import make_card, make_cards, seed_players
+
+PLAYERS = make_cards(7)
+PLAYERS.update({
+    "200": make_card(200, team="BOS", position="Hitter", contact=90.0,
+                     pitching_styles=None, hitting_styles=["Power Hitter"]),
+    "201": make_card(201, team="BOS", position="Hitter", contact=70.0,
+                     pitching_styles=None, hitting_styles=["Switch Hitter"]),
+})
+
+
+def walk(read_page, limit):
+    """Follow next_cursor from the first page to the last"""
+    pages, cursor = [], {}
+    while True:
+        page = read_page(limit, cursor)
+        pages.append(page)
+        if page.next_cursor is None:
+            return pages
+        cursor = decode_cursor(page.next_cursor)
+
+
+def ids(pages):
+    return [player.player_id for page in pages for player in page.players]
+
+
+@pytest.fixture
+def snapshot():
+    return CatalogSnapshot("v1", PLAYERS)
+
+
+@pytest.fixture
+def firestore(fake_db, monkeypatch):
+    seed_players(fake_db, PLAYERS)
+    monkeypatch.setattr(players_endpoint, "db", fake_db)
+    return fake_db
+
+
+def test_catalog_pages_cover_every_player_once(snapshot):
+    pages = walk(lambda limit, cursor: catalog_players_page(snapshot, {}, limit, cursor), 4)
+    assert ids(pages) == sorted(PLAYERS)
+    assert [len(page.players) for page in pages] == [4, 4, 1]
+    assert all(page.total == len(PLAYERS) for page in pages)
+
+
+def test_catalog_last_page_has_no_cursor(snapshot):
+    page = catalog_players_page(snapshot, {}, len(PLAYERS))
+    assert len(page.players) == len(PLAYERS)
+    assert page.next_cursor is None
+
+
+def test_catalog_filtered_pages(snapshot):
+    filters = {"team": ["BOS"]}
+    pages = walk(lambda limit, cursor: catalog_players_page(snapshot, filters, limit, cursor), 1)
+    assert ids(pages) == ["200", "201"]
+    assert all(page.total == 2 for page in pages)
+
+
+def test_catalog_sorted_pages_continue_by_rank(snapshot):
+    pages = walk(lambda limit, cursor: catalog_players_page(
+        snapshot, {}, limit, cursor, sort="-contact", top_k=3), 2)
+    assert ids(pages)[:2] == ["200", "201"]
+    assert len(ids(pages)) == 3
+    assert all(page.total == 3 for page in pages)
+
+
+def test_firestore_pages_skip_metadata_and_end_cleanly(firestore):
+    pages = walk(lambda limit, cursor: query_players_page({}, limit, cursor.get("after")), 3)
+    assert ids(pages) == sorted(PLAYERS)
+    assert [len(page.players) for page in pages] == [3, 3, 3]
+    assert all(page.total == len(PLAYERS) for page in pages)
+
+
+def test_firestore_page_ending_at_the_last_player_has_no_cursor(firestore):
+    page = query_players_page({}, len(PLAYERS))
+    assert len(page.players) == len(PLAYERS)
+    assert page.next_cursor is None
+
+
+def test_firestore_filtered_pages_count_matches(firestore):
+    filters = {"team": ["BOS"], "hitting_style": ["Power Hitter", "Switch Hitter"]}
+    pages = walk(lambda limit, cursor: query_players_page(filters, limit, cursor.get("after")), 1)
+    assert ids(pages) == ["200", "201"]
+    assert all(page.total == 2 for page in pages)
+
+
+def test_firestore_rejects_both_style_filters(firestore):
+    with pytest.raises(ValueError):
+        query_players_page({"pitching_style": ["Fastballs"], "hitting_style": ["Power Hitter"]}, 10)
+
+
+def test_fallback_returns_400_for_filters_it_cannot_query(firestore, monkeypatch):
+    class UnavailableCatalog:
+        def snapshot(self):
+            raise RuntimeError("catalog down")
+
+    monkeypatch.setattr(players_endpoint, "player_catalog", UnavailableCatalog())
+    app = FastAPI()
+    app.include_router(router, prefix="/players")
+    client = TestClient(app)
+
+    response = client.get("/players/", params={"pitching_style": "Fastballs", "hitting_style": "Power Hitter"})
+    assert response.status_code == 400
+
+    response = client.get("/players/", params={"limit": 5})
+    assert response.status_code == 200
+    assert len(response.json()["players"]) == 5
@@ -0,0 +1,106 @@
+import gzip
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.v1.endpoints import players as players_endpoint
+from services import player_catalog as player_catalog_module
+from services import player_payloads
+from services.player_catalog import PlayerCatalog
+from services.player_payloads import PreparedPayload, choose_encoding, serialize_players
+from player_cards import make_cards, seed_players
+
+PLAYERS = make_cards(3)
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(player_payloads, "SUPPORTED_ENCODINGS", ['br', 'gzip', 'identity'])
+
+
+@pytest.fixture
+def without_brotli(monkeypatch):
+    monkeypatch.setattr(player_payloads, "brotli", None)
+    monkeypatch.setattr(player_payloads, "SUPPORTED_ENCODINGS", ['gzip', 'identity'])
+
+
+@pytest.fixture
+def catalog(fake_db, monkeypatch):
+    seed_players(fake_db, PLAYERS)
+    monkeypatch.setattr(player_catalog_module, "db", fake_db)
+    catalog = PlayerCatalog(refresh_seconds=0)
+    monkeypatch.setattr(players_endpoint, "player_catalog", catalog)
+    return catalog
+
+
+@pytest.fixture
+def client(catalog, without_brotli):
+    app = FastAPI()
+    app.include_router(players_endpoint.router, prefix="/players")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", "br"),
+    ("gzip, br;q=0", "gzip"),
+    ("GZIP;q=0.5", "gzip"),
+    ("gzip;q=0, identity", "identity"),
+    ("gzip;q=bogus", "identity"),
+    ("*", "br"),
+    ("*;q=0, gzip", "gzip"),
+    ("gzip, identity;q=0", "gzip"),
+    ("", "identity"),
+    (None, "identity"),
+])
+def test_choose_encoding(with_brotli, header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_without_brotli_gzip_is_preferred(without_brotli):
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") == "identity"
+    assert set(PreparedPayload(b"[]").bodies) == {"identity", "gzip"}
+
+
+def test_every_encoding_holds_the_same_json(without_brotli):
+    payload = serialize_players(list(PLAYERS.values()))
+    body = payload.body("identity")
+    assert gzip.decompress(payload.body("gzip")) == body
+    assert [player["player_id"] for player in json.loads(body)] == sorted(PLAYERS)
+
+
+def test_each_encoding_has_its_own_etag(client):
+    plain = client.get("/players/list/deck-selection", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/players/list/deck-selection", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers.get("content-encoding") is None
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.headers["etag"] == f'{plain.headers["etag"][:-1]}-gzip"'
+    assert zipped.json() == plain.json()
+
+    revalidated = client.get("/players/list/deck-selection", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]})
+    assert revalidated.status_code == 304
+    other_encoding = client.get("/players/list/deck-selection", headers={
+        "Accept-Encoding": "identity", "If-None-Match": zipped.headers["etag"]})
+    assert other_encoding.status_code == 200
+
+
+def test_payloads_are_reused_until_the_data_version_changes(catalog, fake_db, without_brotli):
+    payload = catalog.snapshot().deck_selection_payload()
+    assert catalog.snapshot().deck_selection_payload() is payload
+
+    fake_db.put("players/103", make_cards(4)["103"])
+    assert catalog.snapshot().deck_selection_payload() is payload
+
+    fake_db.put("players/metadata", {"data_version": "v2", "total_players": 4})
+    rebuilt = catalog.snapshot().deck_selection_payload()
+    assert rebuilt is not payload
+    assert len(json.loads(rebuilt.body("identity"))) == 4
+
+
+def test_unknown_positions_are_not_cached(catalog, without_brotli):
+    snapshot = catalog.snapshot()
+    assert json.loads(snapshot.deck_selection_payload("Catcher").body("identity")) == []
+    assert snapshot.deck_selection_payload("Pitcher") is snapshot.deck_selection_payload("Pitcher")
+    assert "Catcher" not in snapshot._deck_payloads
@@ -0,0 +1,36 @@
+import pytest
+from services.player_projection import parse_fields, project, project_players
+
+
+PLAYER = {
+    "player_id": "1",
+    "basic_info": {"name": "Test Player", "team": "NYY", "primary_position": "Pitcher"},
+    "role_info": {"primary_role": "Pitcher", "secondary_roles": []}
+}
+
+
+def test_parse_fields_always_includes_player_id():
+    assert parse_fields("basic_info.team, basic_info.name") == (
+        "basic_info.name", "basic_info.team", "player_id"
+    )
+
+
+def test_parse_fields_whole_block_absorbs_sub_fields():
+    assert parse_fields("basic_info.name,basic_info") == ("basic_info", "player_id")
+
+
+@pytest.mark.parametrize("raw", ["bogus", "basic_info.nope", "player_id.x", "basic_info.name.x"])
+def test_parse_fields_rejects_unknown_fields(raw):
+    with pytest.raises(ValueError):
+        parse_fields(raw)
+
+
+def test_project_players():
+    fields = parse_fields("basic_info.name,basic_info.team")
+    assert project(PLAYER, fields) == {
+        "basic_info": {"name": "Test Player", "team": "NYY"},
+        "player_id": "1"
+    }
+    assert project_players([PLAYER], fields) == [
+        {"basic_info": {"name": "Test Player", "team": "NYY"}, "player_id": "1"}
+    ]
@@ -0,0 +1,30 @@
+from services.player_search import PlayerSearchIndex, normalize_name
+
+PLAYERS = {
+    "1": {"basic_info": {"name": "José Ramírez"}},
+    "2": {"basic_info": {"name": "Jose Siri"}},
+    "3": {"basic_info": {"name": "Aaron Judge"}},
+    "4": {"basic_info": {"name": "Shohei Ohtani"}},
+}
+PLAYER_IDS = sorted(PLAYERS)
+
+
+def names(index, query, limit=10):
+    return [PLAYERS[PLAYER_IDS[position]]["basic_info"]["name"] for position, _ in index.search(query, limit)]
+
+
+def test_normalize_name_folds_accents():
+    assert normalize_name(" José Ramírez* ") == "jose ramirez"
+
+
+def test_prefix_matches_rank_first():
+    index = PlayerSearchIndex(PLAYER_IDS, PLAYERS)
+    assert names(index, "jose r") == ["José Ramírez", "Jose Siri"]
+    assert names(index, "jud") == ["Aaron Judge"]
+
+
+def test_fuzzy_match_and_limit():
+    index = PlayerSearchIndex(PLAYER_IDS, PLAYERS)
+    assert names(index, "ohtanni") == ["Shohei Ohtani"]
+    assert len(index.search("jose", limit=1)) == 1
+    assert index.search("   ") == []
@@ -0,0 +1,52 @@
+from google.cloud.firestore import DELETE_FIELD
+from services.state_diff import diff_fields
+
+
+BEFORE = {
+    "inning": 1,
+    "outs": 2,
+    "bases": {"first": None, "second": "123", "third": None},
+    "team1": {"score": 0, "lineup": {"batting_order": ["1", "2"], "current_batter_index": 0}},
+    "last_action": {"action_type": "pitch"}
+}
+
+
+def test_only_changed_paths_are_written():
+    after = {
+        "inning": 1,
+        "outs": 0,
+        "bases": {"first": "456", "second": "123", "third": None},
+        "team1": {"score": 1, "lineup": {"batting_order": ["1", "2"], "current_batter_index": 1}},
+        "last_action": {"action_type": "pitch"}
+    }
+    assert diff_fields(BEFORE, after) == {
+        "outs": 0,
+        "bases.first": "456",
+        "team1.score": 1,
+        "team1.lineup.current_batter_index": 1
+    }
+
+
+def test_lists_and_emptied_maps_are_replaced_whole():
+    after = {**BEFORE, "team1": {"score": 0, "lineup": {"batting_order": ["2", "1"], "current_batter_index": 0}},
+             "last_action": {}}
+    assert diff_fields(BEFORE, after) == {
+        "team1.lineup.batting_order": ["2", "1"],
+        "last_action": {}
+    }
+
+
+def test_added_and_removed_keys():
+    after = {key: value for key, value in BEFORE.items() if key != "last_action"}
+    after["winner"] = "user-1"
+    assert diff_fields(BEFORE, after) == {"winner": "user-1", "last_action": DELETE_FIELD}
+
+
+def test_numeric_keys_are_quoted():
+    before = {"team1": {"player_stats": {}}}
+    after = {"team1": {"player_stats": {"660271": {"hits": 1}}}}
+    assert diff_fields(before, after) == {"team1.player_stats.`660271`": {"hits": 1}}
+
+
+def test_bool_replacing_int_is_written():
+    assert diff_fields({"flag": 1}, {"flag": True}) == {"flag": True}
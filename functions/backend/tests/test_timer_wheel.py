@@ -0,0 +1,50 @@
+from core.timer_wheel import TimerWheel
+
+
+def test_expires_at_the_deadline_tick():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule("g1", 102.5)
+    assert wheel.advance(102.0) == []
+    assert wheel.advance(103.0) == [("g1", 102.5)]
+    assert "g1" not in wheel
+    assert wheel.advance(104.0) == []
+
+
+def test_rescheduling_replaces_the_deadline():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule("g1", 102.0)
+    wheel.schedule("g1", 105.0)
+    assert wheel.advance(104.0) == []
+    assert wheel.advance(105.0) == [("g1", 105.0)]
+
+
+def test_cancel():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule("g1", 102.0)
+    wheel.cancel("g1")
+    assert len(wheel) == 0
+    assert wheel.advance(110.0) == []
+
+
+def test_deadlines_beyond_one_turn_wait_for_their_tick():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule("far", 120.0)
+    wheel.schedule("near", 104.0)
+    assert wheel.advance(112.0) == [("near", 104.0)]
+    assert wheel.advance(119.0) == []
+    assert wheel.advance(120.0) == [("far", 120.0)]
+
+
+def test_past_deadlines_fire_on_the_next_tick():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule("late", 50.0)
+    assert wheel.advance(101.0) == [("late", 50.0)]
+
+
+def test_long_gap_expires_everything_due_in_order():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    for n, when in enumerate([130.0, 103.0, 117.0]):
+        wheel.schedule(n, when)
+    wheel.schedule("later", 200.0)
+    assert wheel.advance(150.0) == [(1, 103.0), (2, 117.0), (0, 130.0)]
+    assert len(wheel) == 1
@@ -0,0 +1,48 @@
+from core.token_cache import TokenCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_until_exp():
+    clock = FakeClock()
+    cache = TokenCache(max_size=10, max_ttl=300, clock=clock)
+    assert cache.get("token") is None
+    cache.put("token", {"uid": "a", "exp": 1060})
+    assert cache.get("token") == {"uid": "a", "exp": 1060}
+    clock.now = 1060
+    assert cache.get("token") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_max_ttl_caps_long_lived_tokens():
+    clock = FakeClock()
+    cache = TokenCache(max_size=10, max_ttl=30, clock=clock)
+    cache.put("token", {"uid": "a", "exp": 5000})
+    clock.now = 1029
+    assert cache.get("token") is not None
+    clock.now = 1030
+    assert cache.get("token") is None
+
+
+def test_expired_tokens_are_not_cached():
+    cache = TokenCache(max_size=10, max_ttl=300, clock=FakeClock())
+    cache.put("token", {"uid": "a", "exp": 999})
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = TokenCache(max_size=2, max_ttl=300, clock=FakeClock())
+    cache.put("a", {"uid": "a"})
+    cache.put("b", {"uid": "b"})
+    cache.get("a")
+    cache.put("c", {"uid": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
@@ -197,7 +197,8 @@ def main():
             meta_ref.set({
                 'total_players': len(player_cards),
                 'last_updated': firestore.SERVER_TIMESTAMP,
-                'data_version': '2.0'
+                # Unique per upload: API caches and ETags are keyed on it
+                'data_version': f"2.0-{datetime.utcnow():%Y%m%d%H%M%S}"
             })
             print("Metadata updated successfully")
         except Exception as e: